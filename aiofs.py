@@ -0,0 +1,208 @@
+'''
+Asyncio versions of the `fs` file system functions.
+
+Every function runs its `fs` counterpart on a shared, bounded thread pool so file operations
+never block the event loop.  Arguments, return values and exceptions are the same as in `fs`.
+The module is also available as `fs.aio`.
+
+## Usage
+
+```python
+import aiofs
+
+async def main():
+  aiofs.set_concurrency(32)
+  text = await aiofs.read_file(path, to_string=True)
+  await aiofs.write_file(path + '.bak', text)
+  async for file in aiofs.get_files(top, r'\\.py$'):
+    print(file)
+  sizes = await asyncio.gather(*(aiofs.get_size(f) for f in files))
+```
+
+'''
+
+import os, asyncio, functools, threading
+from concurrent.futures import ThreadPoolExecutor
+import fs
+
+_executor = None
+_concurrency = min(32, (os.cpu_count() or 1) * 4)
+_lock = threading.Lock()
+
+def set_concurrency(workers):
+  '''
+    ## Description
+    Set the number of threads running file operations.  The current pool is shut down once its
+    queued operations finish.
+
+    ## Usage
+
+    ```python
+    aiofs.set_concurrency(64)
+    ```
+
+    ## Arguments
+    - `workers`: maximum number of concurrent file operations (default = `os.cpu_count() * 4`,
+    max 32)
+
+    ## Returns
+    nothing
+  '''
+  global _executor, _concurrency
+  if workers < 1: raise Exception(f'Invalid concurrency {workers}; must be at least 1.')
+  with _lock:
+    _concurrency = workers
+    old, _executor = _executor, None
+  if old is not None: old.shutdown(wait=False)
+
+def get_executor():
+  '''
+    ## Description
+    Get the thread pool used for file operations, creating it on first use.
+
+    ## Returns
+    `concurrent.futures.ThreadPoolExecutor`
+  '''
+  global _executor
+  with _lock:
+    if _executor is None:
+      _executor = ThreadPoolExecutor(max_workers=_concurrency, thread_name_prefix='aiofs')
+    return _executor
+
+async def run(func, *args, **kwargs):
+  '''
+    ## Description
+    Run any blocking function on the file operation thread pool.
+
+    ## Usage
+
+    ```python
+    lines = await aiofs.run(fs.read_file, path)
+    ```
+
+    ## Returns
+    The function's return value.
+  '''
+  loop = asyncio.get_running_loop()
+  return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+def _wrap(name):
+  func = getattr(fs, name)
+  async def wrapper(*args, **kwargs):
+    return await run(func, *args, **kwargs)
+  wrapper.__name__ = wrapper.__qualname__ = name
+  wrapper.__doc__ = f'Async version of `fs.{name}()`.\n' + (func.__doc__ or '')
+  return wrapper
+
+read_file = _wrap('read_file')
+reads = _wrap('reads')
+write_file = _wrap('write_file')
+write_file_if_changed = _wrap('write_file_if_changed')
+write_files_if_changed = _wrap('write_files_if_changed')
+copy_file = _wrap('copy_file')
+copy_file_if_changed = _wrap('copy_file_if_changed')
+copy_dir_if_changed = _wrap('copy_dir_if_changed')
+delete_file = _wrap('delete_file')
+delete_dir = _wrap('delete_dir')
+rename_file = _wrap('rename_file')
+create_dir = _wrap('create_dir')
+files_are_identical = _wrap('files_are_identical')
+hash_file = _wrap('hash_file')
+get_size = _wrap('get_size')
+last_modified = _wrap('last_modified')
+file_exists = _wrap('file_exists')
+dir_exists = _wrap('dir_exists')
+
+async def stat(path, follow_symlinks=True):
+  '''
+    ## Description
+    Async version of `os.stat()`.
+
+    ## Returns
+    `os.stat_result`
+  '''
+  return await run(os.stat, path, follow_symlinks=follow_symlinks)
+
+async def get_dirs(paths, regx=r'.*', stat=False):
+  '''
+    ## Description
+    Async version of `fs.get_dirs()`.
+
+    ## Returns
+    A list of matching directories (or `fs.FileInfo` records if `stat` is True).
+  '''
+  return await run(lambda: list(fs.get_dirs(paths, regx, stat=stat)))
+
+async def get_files(paths, regx=r'.*', rec=True, must_exist=True, func=None, batch=256, **kwargs):
+  '''
+    ## Description
+    Async generator version of `fs.get_files()`.  The walk runs on its own thread and hands files
+    to the event loop in batches; it pauses while the consumer is a few batches behind and stops
+    if the consumer stops iterating.
+
+    ## Usage
+
+    ```python
+    async for file in aiofs.get_files(paths, regx, rec): print(file)
+    ```
+
+    ## Arguments
+    Same as `fs.get_files()` (including `parallel`, `stat`, `prune`, ...), plus:
+    - `batch`: number of files passed to the event loop at a time (default = 256)
+
+    ## Returns
+    An async generator yielding full file names of type str (or `fs.FileInfo` if `stat` is True).
+  '''
+  loop = asyncio.get_running_loop()
+  # The queue is bounded by `space` rather than maxsize, so the walk never leaves a put 
+  # coroutine pending on the event loop: it waits on the semaphore in its own thread and hands 
+  # over batches with call_soon_threadsafe().
+  queue = asyncio.Queue()
+  space = threading.Semaphore(4)
+  stop = threading.Event()
+  done = object()
+
+  def put(item):
+    # Wait for queue space in short steps, so the walk ends (and closes its directory scans) if 
+    # the consumer goes away or the event loop is closed without finalizing this generator.
+    while not space.acquire(timeout=0.5):
+      if stop.is_set() or loop.is_closed():
+        stop.set()
+        return
+    if stop.is_set() or loop.is_closed():
+      stop.set()
+      return
+    try: loop.call_soon_threadsafe(queue.put_nowait, item)
+    except RuntimeError: stop.set()  # The event loop closed meanwhile.
+
+  def produce():
+    try:
+      items = []
+      for file in fs.get_files(paths, regx, rec, must_exist, func, **kwargs):
+        if stop.is_set(): return
+        items.append(file)
+        if len(items) >= batch:
+          put(items)
+          items = []
+      if items and not stop.is_set(): put(items)
+    except Exception as err:
+      if not stop.is_set(): put(err)
+    finally:
+      if not stop.is_set(): put(done)
+
+  # The walk gets its own thread rather than a pool worker, so a consumer awaiting other aiofs
+  # calls inside the loop cannot starve the pool while the walk waits for queue space.
+  threading.Thread(target=produce, name='aiofs-get-files', daemon=True).start()
+  try:
+    while True:
+      items = await queue.get()
+      space.release()
+      if items is done: return
+      if isinstance(items, Exception): raise items
+      for file in items: yield file
+  finally:
+    # Unblock a producer waiting for queue space so it can see the stop flag.
+    stop.set()
+    space.release()
+    if not loop.is_closed():
+      while not queue.empty(): queue.get_nowait()
@@ -0,0 +1,75 @@
+r"""
+Benchmark the batch path functions in `fs` against calling the scalar versions in a loop.
+
+Each case processes a list of generated paths (1,000 small or 100,000 large) once per call, either 
+with a list comprehension over the scalar function or with the batch function.
+
+## Usage
+
+```text
+python bench/bench_fs_paths.py                      # print table
+python bench/bench_fs_paths.py --json results.json  # also write JSON results
+python bench/bench_fs_paths.py --quick --filter ext # fast run, only cases containing "ext"
+```
+"""
+
+import os
+import argparse
+from common import measure, print_results, write_results
+import fs
+
+def make_paths(count):
+    r'''
+    Return `count` paths mixing absolute and relative paths, nesting depths and extensions.
+    '''
+    exts = ['py', 'TXT', 'tar.gz', 'yml', '']
+    paths = []
+    for i in range(count):
+        ext = exts[i % len(exts)]
+        name = f'file{i}.{ext}' if ext else f'file{i}'
+        parts = [f'dir{i % 7}', f'sub{i % 13}'][:i % 3]
+        base = os.sep + 'work' if i % 2 else 'rel'
+        paths.append(os.path.join(base, *parts, name))
+    return paths
+
+def cases():
+    r'''
+    Return a list of (name, size, func) benchmark cases.
+    '''
+    items = []
+    base = os.sep + 'work'
+    for size, paths in (('small', make_paths(1000)), ('large', make_paths(100000))):
+        items += [
+            ('file_name/scalar', size, lambda paths=paths: [fs.get_file_name(p) for p in paths]),
+            ('file_name/batch', size, lambda paths=paths: fs.get_file_names(paths)),
+            ('root_name/scalar', size, lambda paths=paths: [fs.get_root_name(p) for p in paths]),
+            ('root_name/batch', size, lambda paths=paths: fs.get_root_names(paths)),
+            ('ext/scalar', size, lambda paths=paths: [fs.get_ext(p) for p in paths]),
+            ('ext/batch', size, lambda paths=paths: fs.get_exts(paths)),
+            ('dir_name/scalar', size, lambda paths=paths: [fs.get_dir_name(p) for p in paths]),
+            ('dir_name/batch', size, lambda paths=paths: fs.get_dir_names(paths)),
+            ('rel_path/scalar', size, lambda paths=paths: [fs.get_rel_path(p, base) for p in paths]),
+            ('rel_path/batch', size, lambda paths=paths: fs.get_rel_paths(paths, base)),
+            ('fix_path/scalar', size, lambda paths=paths: [fs.fix_path_name(p) for p in paths]),
+            ('fix_path/batch', size, lambda paths=paths: fs.fix_path_names(paths)),
+            ('split/batch', size, lambda paths=paths: fs.split_paths(paths)),
+        ]
+    return items
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch fs path functions against the scalar versions.')
+    parser.add_argument('--json', dest='json', default=None, help='Write JSON results to this file ("-" for STDOUT).')
+    parser.add_argument('--filter', dest='filter', default=None, help='Only run cases whose name contains this text.')
+    parser.add_argument('--quick', dest='quick', action='store_true', default=False, help='Shorter timing runs.')
+    args = parser.parse_args()
+    min_time = 0.02 if args.quick else 0.2
+    results = []
+    for name, size, func in cases():
+        name = f'{name}/{size}'
+        if args.filter is not None and args.filter not in name: continue
+        results.append(measure(name, func, min_time=min_time, size=size))
+    if args.json != '-': print_results(results)
+    if args.json is not None: write_results(results, args.json, suite='fs-paths')
+
+if __name__ == '__main__':
+    main()
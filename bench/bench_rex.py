@@ -0,0 +1,86 @@
+r"""
+Benchmark `Rex` and `Regx` against direct use of the native `re` module.
+
+Each case is run three ways where applicable: through a `Rex` object, through a `Regx` object and 
+with the equivalent `re` calls.  Results report calls per second, time per call and memory per call 
+for small (one line) and large (10,000 line) inputs.
+
+## Usage
+
+```text
+python bench/bench_rex.py                      # print table
+python bench/bench_rex.py --json results.json  # also write JSON results
+python bench/bench_rex.py --quick --filter sub # fast run, only cases containing "sub"
+```
+"""
+
+import re
+import argparse
+from common import measure, print_results, write_results
+from rex import Rex
+from regx import Regx
+
+SMALL = 'My favorite color is blue.  My favorite number is 7.'
+LARGE = '\n'.join(f'{i:05d} My favorite color is blue.  My favorite number is {i}.' for i in range(10000))
+QUOTED = ' "This is a test."   '
+SPACED = '   This is a test.   '
+
+def cases():
+    r'''
+    Return a list of (name, size, func) benchmark cases.
+    '''
+    rex = Rex()
+    regx = Regx()
+    items = []
+    find = r'(favorite\s+(\w+)\s+is\s+(\w+))'
+    compiled = re.compile(find)
+    pattern = Rex.compile(find, 'g')
+    def double(dollar): return dollar[3] * 2
+    def re_double(m): return m.group(3) * 2
+    for size, text in (('small', SMALL), ('large', LARGE)):
+        items += [
+            ('m/rex', size, lambda text=text: rex.m(text, find)),
+            ('m/regx', size, lambda text=text: regx.m(text, find)),
+            ('m/re', size, lambda text=text: re.search(find, text)),
+            ('m-g/rex', size, lambda text=text: rex.m(text, find, 'g')),
+            ('m-g/rex-lazy', size, lambda text=text: rex.m(text, find, 'g', lazy=True)),
+            ('m-g/rex-compiled', size, lambda text=text: pattern.m(text)),
+            ('m-g/regx', size, lambda text=text: regx.m(text, find, 'g')),
+            ('m-g/re', size, lambda text=text: [m.groups() for m in compiled.finditer(text)]),
+            ('s-str/rex', size, lambda text=text: rex.s(text, find, r'\3', 'g=')),
+            ('s-str/regx', size, lambda text=text: regx.s(text, find, r'\3', 'g=')),
+            ('s-str/re', size, lambda text=text: re.sub(find, r'\3', text)),
+            ('s-func/rex', size, lambda text=text: rex.s(text, find, double, 'g=')),
+            ('s-func/re', size, lambda text=text: re.sub(find, re_double, text)),
+            ('split/rex', size, lambda text=text: rex.split(text, r'\s+')),
+            ('split/regx', size, lambda text=text: regx.split(text, r'\s+')),
+            ('split/re', size, lambda text=text: re.split(r'\s+', text)),
+        ]
+    items += [
+        ('trim/rex', 'small', lambda: rex.trim(SPACED)),
+        ('trim/regx', 'small', lambda: regx.trim(SPACED)),
+        ('trim/re', 'small', lambda: re.sub(r'^\s*(.*?)\s*$', r'\1', SPACED, count=1, flags=re.S)),
+        ('trim/str', 'small', lambda: SPACED.strip()),
+        ('unquote/rex', 'small', lambda: rex.unquote(QUOTED)),
+        ('unquote/regx', 'small', lambda: regx.unquote(QUOTED)),
+        ('unquote/re', 'small', lambda: re.sub(r'^\s*(\'|\")(.*?)\1\s*', r'\2', QUOTED, count=1, flags=re.S)),
+    ]
+    return items
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark rex and regx against raw re.')
+    parser.add_argument('--json', dest='json', default=None, help='Write JSON results to this file ("-" for STDOUT).')
+    parser.add_argument('--filter', dest='filter', default=None, help='Only run cases whose name contains this text.')
+    parser.add_argument('--quick', dest='quick', action='store_true', default=False, help='Shorter timing runs.')
+    args = parser.parse_args()
+    min_time = 0.02 if args.quick else 0.2
+    results = []
+    for name, size, func in cases():
+        name = f'{name}/{size}'
+        if args.filter is not None and args.filter not in name: continue
+        results.append(measure(name, func, min_time=min_time, size=size))
+    if args.json != '-': print_results(results)
+    if args.json is not None: write_results(results, args.json, suite='rex')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+r"""
+Benchmark `DataManager.validate()` on the `test/data-schema` demos, scaled up.
+
+The sitcoms demo (demo2, a list at the root) is replicated into a large document; the other demos 
+are validated as is; demo2 is also validated with `parallel=True` (process pool per call).  A synthetic tree document (`--depth` levels of `--width` records each) measures 
+allocation on deep node paths; the `peak B/op` column is the `tracemalloc` high water mark of one 
+validation.  With `--baseline REV`, the same cases are also run against `data/schema.py` 
+as of git revision `REV` so the two implementations can be compared side by side.
+
+## Usage
+
+```text
+python bench/bench_schema.py                           # print table
+python bench/bench_schema.py --baseline HEAD~1         # compare with an earlier data/schema.py
+python bench/bench_schema.py --scale 20000 --json -    # bigger document, JSON to STDOUT
+python bench/bench_schema.py --filter tree --depth 400 # allocation on a deeper tree
+```
+"""
+
+import os
+import sys
+import copy
+import inspect
+import argparse
+import subprocess
+import importlib.util
+from common import measure, print_results, write_results
+import yaml
+import fs
+import data.schema
+
+TOP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEMO_DIR = os.path.join(TOP, 'test', 'data-schema')
+
+def load_demo(name):
+    r'''
+    Return (schema, data, schema module file) for demo `name`.
+    '''
+    schema = yaml.load(fs.read_file(os.path.join(DEMO_DIR, f'{name}-schema.yml'), True), Loader=yaml.FullLoader)
+    data = yaml.load(fs.read_file(os.path.join(DEMO_DIR, f'{name}-data.yml'), True), Loader=yaml.FullLoader)
+    return schema, data, os.path.join(DEMO_DIR, f'{name}-schema.py')
+
+def make_tree(depth, width):
+    r'''
+    Return (schema, data) for a tree document `depth` levels deep.  Each level holds `width` leaf 
+    records and the next level; schemas cannot be recursive, so each level has its own rule.
+    '''
+    schema = {
+        'Items': {'class': 'list', 'rule': 'Leaf'},
+        'Leaf': {'class': 'dict', 'keys': [{'name': 'name', 'rule': 'Name', 'required': True}, {'name': 'value', 'rule': 'Value'}]},
+        'Name': {'class': 'str', 'matches': r'^n\d+$'},
+        'Value': {'class': 'int', 'min-value': 0},
+    }
+    node = None
+    for level in range(depth, 0, -1):
+        keys = [{'name': 'name', 'rule': 'Name', 'required': True}, {'name': 'value', 'rule': 'Value'}, {'name': 'items', 'rule': 'Items'}]
+        if node is not None: keys.append({'name': 'next', 'rule': f'Level{level + 1}'})
+        schema[f'Level{level}'] = {'class': 'dict', 'keys': keys}
+        record = {'name': f'n{level}', 'value': level, 'items': [{'name': f'n{level}{i}', 'value': i} for i in range(width)]}
+        if node is not None: record['next'] = node
+        node = record
+    return schema, node
+
+def load_baseline(rev):
+    r'''
+    Import `data/schema.py` as of git revision `rev` as a separate module.
+    '''
+    source = subprocess.run(['git', 'show', f'{rev}:data/schema.py'], cwd=TOP, check=True, capture_output=True, text=True).stdout
+    spec = importlib.util.spec_from_loader(f'schema_{rev}', loader=None)
+    module = importlib.util.module_from_spec(spec)
+    exec(compile(source, f'{rev}:data/schema.py', 'exec'), module.__dict__)
+    return module
+
+def cases(scale, depth, width, modules):
+    r'''
+    Return a list of (name, size, func) benchmark cases for each (label, module) in `modules`.
+    '''
+    items = []
+    for label, module in modules:
+        module.DataManager.print_warnings = False
+        schema, data, module_file = load_demo('demo2')
+        # Validate once so defaults and casts are applied; later runs see stable data.
+        big = [copy.deepcopy(data[i % len(data)]) for i in range(scale)]
+        dm = module.DataManager(copy.deepcopy(schema), module_file)
+        dm.validate(big)
+        items.append((f'validate/demo2/{label}', f'{scale} records', lambda dm=dm, big=big: dm.validate(big)))
+        if 'parallel' in inspect.signature(dm.validate).parameters:
+            items.append((f'validate/demo2-parallel/{label}', f'{scale} records', lambda dm=dm, big=big: dm.validate(big, parallel=True)))
+        for demo in ('demo1', 'demo3', 'demo4'):
+            schema, data, module_file = load_demo(demo)
+            dm = module.DataManager(copy.deepcopy(schema), module_file)
+            dm.validate(data)
+            items.append((f'validate/{demo}/{label}', 'small', lambda dm=dm, data=data: dm.validate(data)))
+        schema, tree = make_tree(depth, width)
+        dm = module.DataManager(schema, root_rule_name='Level1')
+        dm.validate(tree)
+        items.append((f'validate/tree/{label}', f'{depth}x{width} records', lambda dm=dm, tree=tree: dm.validate(tree)))
+    return items
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DataManager.validate() on scaled-up demos.')
+    parser.add_argument('--json', dest='json', default=None, help='Write JSON results to this file ("-" for STDOUT).')
+    parser.add_argument('--filter', dest='filter', default=None, help='Only run cases whose name contains this text.')
+    parser.add_argument('--quick', dest='quick', action='store_true', default=False, help='Shorter timing runs.')
+    parser.add_argument('--scale', dest='scale', type=int, default=5000, help='Number of records in the large sitcoms document.')
+    parser.add_argument('--depth', dest='depth', type=int, default=200, help='Number of levels in the tree document.')
+    parser.add_argument('--width', dest='width', type=int, default=20, help='Number of leaf records per tree level.')
+    parser.add_argument('--baseline', dest='baseline', default=None, help='Also benchmark data/schema.py from this git revision.')
+    args = parser.parse_args()
+    min_time = 0.02 if args.quick else 0.2
+    modules = [('current', data.schema)]
+    if args.baseline is not None: modules.append((args.baseline, load_baseline(args.baseline)))
+    results = []
+    for name, size, func in cases(args.scale, args.depth, args.width, modules):
+        if args.filter is not None and args.filter not in name: continue
+        results.append(measure(name, func, min_time=min_time, size=size))
+    if args.json != '-': print_results(results)
+    if args.json is not None: write_results(results, args.json, suite='schema')
+
+if __name__ == '__main__':
+    main()
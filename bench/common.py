@@ -0,0 +1,99 @@
+r"""
+Shared helpers for the benchmark scripts in this directory.
+
+## Usage
+
+```python
+from common import measure, write_results
+result = measure('rex.m', lambda: rex.m(text, r'\d+'))
+write_results([result], 'bench-rex.json')
+```
+"""
+
+import os
+import sys
+import time
+import json
+import platform
+import tracemalloc
+
+# Make the library modules in the parent directory importable when a benchmark is run as a script.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def measure(name, func, min_time=0.2, repeat=3, **info):
+    r'''
+    Time `func` and measure its memory allocation.
+
+    ## Arguments
+    - `name`: Benchmark name.
+    - `func`: Callable taking no arguments.
+    - `min_time`: Minimum time in seconds for each timing run (default = 0.2).
+    - `repeat`: Number of timing runs; the best one is reported (default = 3).
+    - `info`: Additional key/value pairs copied into the result (e.g. `size='large'`).
+
+    ## Returns
+    Result dict with keys `name`, `ops_per_sec`, `usec_per_op`, `peak_bytes_per_op` (high water 
+    mark of memory allocated during one call) and `retained_blocks_per_op` (net change in live 
+    memory blocks after the call, e.g. its result) plus any `info` items.
+    '''
+    # Calibrate the number of calls so each timing run lasts at least min_time.
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number): func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10 or number >= 1 << 24: break
+        number *= 2
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number): func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best: best = elapsed
+    # Memory is measured separately because tracing slows calls down considerably.  The calls above 
+    # already warmed any caches.  Objects kept from earlier calls (e.g. `rex.matrix`) were allocated 
+    # before tracing started, so freeing them does not hide the memory used by this call.
+    tracemalloc.start()
+    base_blocks = sys.getallocatedblocks()
+    keep = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    blocks = sys.getallocatedblocks() - base_blocks
+    del keep
+    tracemalloc.stop()
+    result = {
+        'name': name,
+        'ops_per_sec': number / best,
+        'usec_per_op': best / number * 1e6,
+        'peak_bytes_per_op': peak,
+        'retained_blocks_per_op': max(blocks, 0),
+    }
+    result.update(info)
+    return result
+
+def print_results(results):
+    r'''
+    Print results as a table.
+    '''
+    width = max(len(r['name']) for r in results)
+    print(f'{"benchmark":<{width}}  {"ops/sec":>14}  {"usec/op":>12}  {"peak B/op":>12}  {"blocks/op":>9}')
+    for r in results:
+        print(f'{r["name"]:<{width}}  {r["ops_per_sec"]:>14,.0f}  {r["usec_per_op"]:>12.3f}  {r["peak_bytes_per_op"]:>12,}  {r["retained_blocks_per_op"]:>9}')
+
+def write_results(results, path, suite=None):
+    r'''
+    Write results as JSON to `path` (use "-" for STDOUT).  Environment information is included so 
+    runs from different machines or releases can be told apart.
+    '''
+    doc = {
+        'suite': suite,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    text = json.dumps(doc, indent=2)
+    if path == '-':
+        print(text)
+    else:
+        with open(path, 'w', encoding='utf-8') as f: f.write(text + '\n')
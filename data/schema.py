@@ -28,6 +28,9 @@ from rex import Rex
 import importlib.util as importer
 import textwrap
 import inspect
+import os
+import pickle
+from collections.abc import MutableMapping
 
 VERSION = '1.2.0'
 
@@ -36,6 +39,36 @@ TEST = []
 class DataManagerFunctionError(Exception):
     pass
 
+class DataManagerErrorLimit(Exception):
+    # Raised internally to stop validation once `max_errors` errors have been collected.
+    pass
+
+class DataManagerValidationError():
+    r"""
+    One failure found by `DataManager.validate(data, collect_errors=True)`: the printable `node` 
+    path, the name of the schema `rule` applied there and the error `message`.  Unpacks as a 
+    `(node, rule, message)` tuple.
+    """
+
+    __slots__ = ('node', 'rule', 'message')
+
+    def __init__(self, node, rule, message):
+        self.node = node
+        self.rule = rule
+        self.message = message
+
+    def __iter__(self):
+        return iter((self.node, self.rule, self.message))
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return 'DataManagerValidationError({!r}, {!r}, {!r})'.format(self.node, self.rule, self.message)
+
+    def __str__(self):
+        return self.message
+
 class DataManagerRenderYAMLOptions():
     def __init__(self):
         self.number_indent_spaces = 2
@@ -49,6 +82,261 @@ class DataManagerRenderOptions():
     def __init__(self):
         self.yaml = DataManagerRenderYAMLOptions()
 
+class DataManagerCompiledRule():
+    r"""
+    Validation plan for one schema rule.  `DataManager` builds these once so that validating a data 
+    node does not re-interpret the raw rule dict: the cast function is bound, value constraints are 
+    an ordered list of checks (with `matches` precompiled and `in` as a frozenset) and dict key 
+    specs are pre-parsed.
+    """
+
+    CASTS = {'str': str, 'int': int, 'float': float, 'bool': bool}
+
+    def __init__(self, rule_name, schema_rule, schema, get_matcher):
+        if not 'class' in schema_rule: raise Exception('Required attribute "class" not defined for schema rule "{}".'.format(rule_name))
+        self.name = rule_name
+        self.rule_class = str(schema_rule['class']).lower()
+        self.cast = self.CASTS.get(self.rule_class)
+        self.allow_null = 'allow-null' in schema_rule and bool(schema_rule['allow-null'])
+        self.has_default = 'default' in schema_rule
+        self.default = schema_rule.get('default')
+        self.validation_func = schema_rule.get('validation-func')
+        self.pre_validation_func = schema_rule.get('pre-validation-func')
+        self.post_validation_func = schema_rule.get('post-validation-func')
+        self.min_count = schema_rule.get('min-count')
+        self.max_count = schema_rule.get('max-count')
+        # A list rule without 'rule' accepts any elements (rendering relies on the attribute too).
+        if self.rule_class == 'list' and not 'rule' in schema_rule: schema_rule['rule'] = '__undefined__'
+        self.child_rule = schema_rule.get('rule', '__undefined__')
+        self.checks = self.__compile_checks(schema_rule, get_matcher) if self.cast is not None else []
+        self.keys = None
+        if 'keys' in schema_rule:
+            self.keys = [DataManagerKeySpec(spec, schema) for spec in schema_rule['keys']]
+            self.required = [spec.name for spec in self.keys if spec.required]
+            # Key lookup: literal names are hashed, `regx` names share one ordered pattern set.  
+            # Both remember the spec's position so the first matching spec still wins.
+            self.key_index = {}
+            self.key_regx_specs = []
+            for index, spec in enumerate(self.keys):
+                if spec.is_regx: self.key_regx_specs.append((index, spec))
+                elif not spec.name in self.key_index: self.key_index[spec.name] = (index, spec)
+            self.key_regx = None
+            if len(self.key_regx_specs) > 0:
+                self.key_regx = Rex.compile_set([spec.name for index, spec in self.key_regx_specs], ordered=True)
+
+    def find_key(self, data_key):
+        r'''
+            Return the first key spec matching `data_key`, or None if there is none.
+        '''
+        found = self.key_index.get(data_key)
+        if self.key_regx is None or (found is not None and found[0] < self.key_regx_specs[0][0]): 
+            return None if found is None else found[1]
+        if self.key_regx.m(data_key):
+            index, spec = self.key_regx_specs[self.key_regx.index]
+            if found is None or index < found[0]: return spec
+        return None if found is None else found[1]
+
+    @staticmethod
+    def fingerprint(value, depth=3):
+        r'''
+            Return a snapshot of a schema rule that compares equal to a later snapshot only if no 
+            value was replaced, added or removed down to `depth` levels of dicts and lists (so edits 
+            to `in` lists and `keys` entries count).  Leaves are compared by identity, which is 
+            cheap and notices a new function even if it looks the same.
+        '''
+        value_type = type(value)
+        if depth > 0 and value_type is dict: 
+            return (len(value), tuple((key, DataManagerCompiledRule.fingerprint(item, depth - 1)) for key, item in value.items()))
+        if depth > 0 and value_type is list: 
+            return (len(value), tuple(DataManagerCompiledRule.fingerprint(item, depth - 1) for item in value))
+        # Holding the value keeps its id from being reused by another object.
+        return (id(value), value)
+
+    @staticmethod
+    def __compile_checks(schema_rule, get_matcher):
+        # Each check is called as check(data, node, data_type) and raises on failure.  The order is 
+        # the order in which the constraints have always been applied.
+        checks = []
+        def object_type(data_type): return data_type.__name__.capitalize()
+        if 'min-value' in schema_rule:
+            min_value = float(schema_rule['min-value'])
+            def check(data, node, data_type):
+                if data < min_value: 
+                    raise Exception('{} object "{}" = {} must be greater than or equal to {}.'.format(object_type(data_type), node, data, min_value))
+            checks.append(check)
+        if 'max-value' in schema_rule:
+            max_value = float(schema_rule['max-value'])
+            def check(data, node, data_type):
+                if data > max_value: 
+                    raise Exception('{} object "{}" = {} must be less than or equal to {}.'.format(object_type(data_type), node, data, max_value))
+            checks.append(check)
+        if 'matches' in schema_rule:
+            matches = str(schema_rule['matches'])
+            matcher = get_matcher(matches)
+            def check(data, node, data_type):
+                if not matcher.m(data):
+                    raise Exception('{} object {} = "{}" does not match {}.'.format(object_type(data_type), node, data, matches))
+            checks.append(check)
+        if 'in' in schema_rule:
+            choices = schema_rule['in']
+            try: valid = frozenset(choices)
+            except TypeError: valid = choices
+            def check(data, node, data_type):
+                if data not in valid:
+                    raise Exception('{} object {} = "{}" not in [{}].'.format(object_type(data_type), node, data, '"' + '", "'.join(choices) + '"'))
+            checks.append(check)
+        if 'non-empty' in schema_rule and bool(schema_rule['non-empty']):
+            def check(data, node, data_type):
+                if len(data) == 0:
+                    raise Exception(f'{object_type(data_type)} object {node} = "{data}" invalid.  Empty value not allowed.')
+            checks.append(check)
+        if 'min-length' in schema_rule:
+            min_length = schema_rule['min-length']
+            def check(data, node, data_type):
+                if len(data) < min_length:
+                    raise Exception(f'{object_type(data_type)} object {node} = "{data}" invalid.  Min length is {min_length}.')
+            checks.append(check)
+        if 'max-length' in schema_rule:
+            max_length = schema_rule['max-length']
+            def check(data, node, data_type):
+                if len(data) < max_length:
+                    raise Exception(f'{object_type(data_type)} object {node} = "{data}" invalid.  Max length is {max_length}.')
+            checks.append(check)
+        if 'equals' in schema_rule:
+            equals = schema_rule['equals']
+            def check(data, node, data_type):
+                if not data == equals:
+                    raise Exception('{} object {} = "{}" does not equal "{}".'.format(object_type(data_type), node, data, equals))
+            checks.append(check)
+        return checks
+
+class DataManagerKeySpec():
+    r"""
+    Pre-parsed entry of a dict rule's `keys` list.
+    """
+
+    def __init__(self, spec, schema):
+        self.name = spec['name']
+        self.is_regx = 'regx' in spec and bool(spec['regx'])
+        # If regx is specified, the name cannot be required.  
+        self.required = 'required' in spec and bool(spec['required']) and not self.is_regx
+        self.rule = spec.get('rule')
+        self.has_default = 'default' in spec
+        self.default = spec.get('default')
+        # Default taken from the child rule when a required key is missing and the spec has none.
+        self.has_rule_default = self.rule in schema and 'default' in schema[self.rule]
+        self.rule_default = schema[self.rule]['default'] if self.has_rule_default else None
+
+class DataManagerNode():
+    r"""
+    Position of a data node during validation, e.g. `Root["a"][3]["b"]`.  Each node only keeps its 
+    parent and its own key, so descending costs one small object; the printable path and the list of 
+    keys are built when an error message or interposer function asks for them.
+    """
+
+    __slots__ = ('parent', 'key', 'is_index')
+
+    def __init__(self, parent, key, is_index=False):
+        self.parent = parent
+        self.key = key
+        self.is_index = is_index
+
+    def keys(self):
+        r'''
+            Return the list of keys (dict keys and list indices) from the root to this node.
+        '''
+        keys = []
+        node = self
+        while node.parent is not None:
+            keys.append(node.key)
+            node = node.parent
+        keys.reverse()
+        return keys
+
+    def __str__(self):
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append('[{}]'.format(node.key) if node.is_index else '["{}"]'.format(node.key))
+            node = node.parent
+        parts.append(str(node.key))
+        parts.reverse()
+        return ''.join(parts)
+
+    def __repr__(self):
+        return str(self)
+
+class DataManagerInterposerArg(MutableMapping):
+    r"""
+    Argument passed to interposer (validation) functions.  Behaves like the dict it replaces, with 
+    keys `object`, `data`, `rule`, `node`, `nodes`, `depth`, `parent` and `parent_class`; `node` and 
+    `nodes` are only rendered from the `DataManagerNode` when read.
+    """
+
+    KEYS = ('object', 'data', 'rule', 'node', 'nodes', 'depth', 'parent', 'parent_class')
+
+    __slots__ = ('manager', 'rule', 'node', 'parent', 'parent_class', 'items_dict')
+
+    def __init__(self, manager, rule_name, node, parent, parent_class):
+        self.manager = manager
+        self.rule = rule_name
+        self.node = node
+        self.parent = parent
+        self.parent_class = parent_class
+        # Plain dict holding all items, created once the interposer assigns or deletes a key.
+        self.items_dict = None
+
+    def __getitem__(self, key):
+        if self.items_dict is not None: return self.items_dict[key]
+        if key == 'object': return self.manager
+        if key == 'data': return self.manager.data_object
+        # 'depth' has always held the rule name.
+        if key == 'rule' or key == 'depth': return self.rule
+        if key == 'node': return str(self.node)
+        if key == 'nodes': return self.node.keys()
+        if key == 'parent': return self.parent
+        if key == 'parent_class': return self.parent_class
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        self.to_dict()[key] = value
+
+    def __delitem__(self, key):
+        del self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(self.KEYS if self.items_dict is None else self.items_dict)
+
+    def __len__(self):
+        return len(self.KEYS if self.items_dict is None else self.items_dict)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def to_dict(self):
+        r'''
+            Return the items as a plain dict (the same dict on each call once created).
+        '''
+        if self.items_dict is None: self.items_dict = {key: self[key] for key in self.KEYS}
+        return self.items_dict
+
+    def copy(self):
+        return dict(self)
+
+# DataManager used by each parallel validation worker process, built once by _init_worker().
+_worker_manager = None
+
+def _init_worker(state):
+    global _worker_manager
+    schema, func_rules, module_file, root_rule_name = state
+    DataManager.print_warnings = False
+    schema = dict(schema)
+    schema.update(func_rules)
+    _worker_manager = DataManager(schema, module_file, root_rule_name)
+
+def _validate_chunk(*args):
+    return _worker_manager._validate_chunk(*args)
+
 class DataManager():
     r"""
     Validate and render data object (as YAML).
@@ -111,6 +399,7 @@ class DataManager():
 
     debug_mode = False
     print_warnings = True
+    parallel_min_items = 1000  # Smallest list validated across processes with validate(parallel=True).
     coverage_testing = False  # Turned on for coverage tests.  Suppresses some prints.
     
     ##########
@@ -119,6 +408,11 @@ class DataManager():
         self.schema = None
         self.root_rule_name = None
         self.module_spec = None
+        self.module_file = None
+        self.errors = None
+        self.max_errors = None
+        self.parallel_workers = None
+        self.pool = None
         self.render = DataManagerRenderOptions()
         self.initialize(schema, module_file, root_rule_name, verbosity)
     
@@ -135,6 +429,7 @@ class DataManager():
             module_file = fs.join_names(fs.get_script_dir(), module_file)
         if not fs.file_exists(module_file): 
             raise Exception('File "{}" does not exist.'.format(orig_module_file))
+        self.module_file = module_file
         spec = importer.spec_from_file_location(name="", location=module_file)
         self.module_spec = importer.module_from_spec(spec)
         spec.loader.exec_module(self.module_spec)
@@ -149,6 +444,8 @@ class DataManager():
         self.data_object = None
         self.schema = schema         # schema object
         self.validated_rules = {}    # hash of validated rule names
+        self.matchers = {}           # hash of compiled 'matches' patterns
+        self.plan = {}               # hash of DataManagerCompiledRule objects by rule name
         self.debug_index = 0
         # self.render = DataManagerRenderOptions()
 
@@ -157,6 +454,7 @@ class DataManager():
         if len(schema) == 0: raise Exception('Parameter schema cannot be an empty dict.')
 
         self.f = {}
+        self.func_rules = {}         # hash of 'func' rules (removed from schema), for parallel workers
 
         # Identify the root schema rule (will have 'root' attribute set to True).
         delete_rule_names = []
@@ -171,6 +469,7 @@ class DataManager():
                 code.append(f'self.f["{rule_name}"] = {rule_name}')
                 code = '\n'.join(code)
                 exec(code)
+                self.func_rules[rule_name] = schema_rule
                 delete_rule_names.append(rule_name)
                 continue
             if 'class' in schema_rule and schema_rule['class'] == 'meta':
@@ -206,6 +505,9 @@ class DataManager():
         # Load module if one is defined.
         if module is not None:
             self.__load_module(module)
+
+        # Compile the validated rules into a validation plan.
+        self.__compile_plan()
     
     ##########
 
@@ -313,7 +615,7 @@ class DataManager():
     
     ##########
 
-    def validate(self, data):
+    def validate(self, data, collect_errors=False, max_errors=None, parallel=False, workers=None):
         '''
             ### Description
             Validate data using the pre-defined schema.
@@ -322,30 +624,138 @@ class DataManager():
             
             ```python 
             self.validate(data)
+            errors = self.validate(data, collect_errors=True)
+            for node, rule, message in errors: print(message)
+            self.validate(rows, parallel=True)
             ```
 
             ### Arguments
             - `data`: data object to be validated
+            - `collect_errors`: if True, continue after a failure and report every failure found in 
+            one pass (default = False)
+            - `max_errors`: with `collect_errors`, stop once this many errors have been found 
+            (default = None, no limit)
+            - `parallel`: if True, lists with at least `parallel_min_items` elements are split into 
+            chunks validated on a process pool; validated elements and errors are merged back in 
+            order (default = False).  Each worker loads the schema once.  Elements are replaced by 
+            the validated copies returned by the workers, and interposer functions running there 
+            see the chunk as `info['data']` and `info['parent']`.  Validation stays serial if the 
+            schema (e.g. an interposer lambda) cannot be pickled.
+            - `workers`: number of processes when `parallel` is True (default = `os.cpu_count()`); 
+            with one, validation is serial
             
             ### Returns
-            Nothing, raises Exception on failure.
+            The data object, raises Exception on failure.  With `collect_errors`, a list of 
+            `DataManagerValidationError` (node, rule, message) items instead; the list is empty if 
+            the data is valid.  It is also kept in `self.errors`.
         '''
         # Begin validating data from the root rule, recursively thereafter.
         rule_name = self.root_rule_name
         self.data_object = data
-        self.__validate_data_recursively(data, rule_name, rule_name, [], 0, None, '')
-        return data
+        # Rule attributes replaced since the plan was compiled are picked up here.
+        if not self.__plan_is_current(): self.__compile_plan()
+        node = DataManagerNode(None, rule_name)
+        # A single worker cannot beat serial validation.
+        self.parallel_workers = (workers or os.cpu_count() or 1) if parallel else None
+        if self.parallel_workers == 1: self.parallel_workers = None
+        try:
+            if not collect_errors:
+                self.errors = None
+                self.__validate_data_recursively(data, rule_name, node, 0, None, '')
+                return data
+            self.errors = []
+            self.max_errors = max_errors
+            try:
+                self.__validate_child(data, rule_name, node, 0, None, '')
+            except DataManagerErrorLimit:
+                pass
+            return self.errors
+        finally:
+            self.__stop_pool()
     
     ##########
 
-    def __validate_data_recursively(self, data, rule_name, node, nodes, depth, parent, parent_class, default_value=None):
+    def __compile_plan(self):
         '''
-            Private, recursive workhorse of the validate() method.
+            Compile every validated schema rule into a `DataManagerCompiledRule`.  Other rules are 
+            compiled on first use.
+        '''
+        self.plan = {}
+        for rule_name in self.validated_rules:
+            if rule_name in self.schema: self.__compile_rule(rule_name)
+    
+    ##########
+
+    def recompile(self):
+        '''
+            ### Description
+            Rebuild the validation plan.  `validate()` already does this when a compiled rule was 
+            edited (including its `in` list or `keys` entries); call it after changing values nested 
+            deeper than that, e.g. inside a `default` structure.
+            
+            ### Usage
+            
+            ```python 
+            schema['Config']['default']['paths'].append('/opt')
+            dm.recompile()
+            ```
+
+            ### Returns
+            Nothing.
+        '''
+        self.__compile_plan()
+    
+    ##########
+
+    def __compile_rule(self, rule_name):
+        if not rule_name in self.schema: raise Exception('Rule name "{}" not defined in schema.'.format(rule_name))
+        schema_rule = self.schema[rule_name]
+        plan = DataManagerCompiledRule(rule_name, schema_rule, self.schema, self.__get_matcher)
+        plan.source = DataManagerCompiledRule.fingerprint(schema_rule)
+        self.plan[rule_name] = plan
+        return plan
+
+    ##########
+
+    def __plan_is_current(self):
+        # True unless a compiled rule was edited since it was compiled (see fingerprint()).
+        for rule_name, plan in self.plan.items():
+            schema_rule = self.schema.get(rule_name)
+            if schema_rule is None or DataManagerCompiledRule.fingerprint(schema_rule) != plan.source: return False
+        return True
+    
+    ##########
+
+    def __add_error(self, node, rule_name, message):
+        # Record an error in collect mode, or raise it.
+        if self.errors is None: raise Exception(message)
+        self.errors.append(DataManagerValidationError(str(node), rule_name, str(message)))
+        if self.max_errors is not None and len(self.errors) >= self.max_errors: raise DataManagerErrorLimit()
+
+    ##########
+
+    def __validate_child(self, data, rule_name, node, depth, parent, parent_class, default_value=None):
+        # Validate a child node.  In collect mode, an error that stops the child's validation is 
+        # recorded and None is returned so the caller moves on to the next sibling.
+        if self.errors is None:
+            return self.__validate_data_recursively(data, rule_name, node, depth, parent, parent_class, default_value)
+        try:
+            return self.__validate_data_recursively(data, rule_name, node, depth, parent, parent_class, default_value)
+        except DataManagerErrorLimit:
+            raise
+        except Exception as err:
+            self.__add_error(node, rule_name, err)
+            return None
+
+    ##########
+
+    def __validate_data_recursively(self, data, rule_name, node, depth, parent, parent_class, default_value=None):
+        '''
+            Private, recursive workhorse of the validate() method.  Runs the compiled plan of the rule.
             # Arguments
             - data: data object to be validated
             - rule_name: rule name used for data validation
-            - node: printable node depth indicator
-            - nodes: list of nodes to current depth
+            - node: DataManagerNode of the data (its printable path is rendered on demand)
             - depth: depth of nodes
             - parent: parent object
             - parent_class: class of parent object
@@ -355,124 +765,42 @@ class DataManager():
         # Get the rule.
         if rule_name is None: return(data)
         if rule_name == '__undefined__': return(data)
-        if not rule_name in self.schema: raise Exception('Rule name "{}" not defined in schema.'.format(rule_name))
-        schema_rule = self.schema[rule_name]
-
-        # if node == 'Root.["Data"]["File Types"]["Excel"]':
-        #     stop = True
-
-        # Get the rule class.
-        if not 'class' in schema_rule: raise Exception('Required attribute "class" not defined for schema rule "{}".'.format(rule_name))
-        rule_class = str(schema_rule['class']).lower()
+        plan = self.plan.get(rule_name)
+        if plan is None: plan = self.__compile_rule(rule_name)
+        rule_class = plan.rule_class
         
         # Get data type.
         data_type = type(data)
-        object_type = data_type.__name__.capitalize()
-        # object_type = ru.stype(data)
 
         ###
 
         # Data is base type (str, float, int, or bool)
-        if rule_class == 'str' or rule_class == 'float' or rule_class == 'int' or rule_class == 'bool':
-
-            cast_type = str
-            if rule_class == 'float':
-                cast_type = float
-            elif rule_class == 'int':
-                cast_type = int
-            elif rule_class == 'bool':
-                cast_type = bool
-            elif rule_class == 'str':
-                cast_type = str
+        cast_type = plan.cast
+        if cast_type is not None:
 
             # Handle type casting, null assignment, default values, interposer functions etc.
             if data is None:
-                allow_null = True if 'allow-null' in schema_rule and bool(schema_rule['allow-null']) else False
                 # If data is None and there is a default specified, use the default value ...
-                if 'default' in schema_rule:
-                    data = cast_type(schema_rule['default'])
-                # elif not default_value is None:
-                #     data = default_value
+                if plan.has_default:
+                    data = cast_type(plan.default)
                 # If allow_null is True, simply return and allow the null value.
-                elif allow_null:
+                elif plan.allow_null:
                     return(None)
                 # Otherwise, raise an exception.
                 else:
                     raise Exception('Required {} value {} is not defined. (To fix this in the schema rule, specify allow-null = True or supply a default value.)'.format(cast_type.__name__, node))
-            
-            # The data_type may have changed, so update it.
-            data_type = type(data)
 
-            # If data_type doesn't match the desired type, re-cast it.
-            if not data_type == cast_type:
+            # If data's type doesn't match the desired type, re-cast it.
+            if not type(data) == cast_type:
                 data = cast_type(data)
 
             # If an interposer function is specified, call it.  
-            if 'validation-func' in schema_rule:
-                func = schema_rule['validation-func']
-                arg = \
-                {
-                    'object': self,
-                    'data': self.data_object,
-                    'rule': rule_name,
-                    'node': node,
-                    'nodes': nodes.copy(),
-                    'depth': rule_name,
-                    'parent': parent,
-                    'parent_class': parent_class,
-                }
-                data = self.call(func, data, arg)
-
-            # If 'min-value' attribute is defined, ensure that the value is greater than or equal
-            # to the value indicated.
-            if 'min-value' in schema_rule:
-                min_value = float(schema_rule['min-value'])
-                if data < min_value: 
-                    raise Exception('{} object "{}" = {} must be greater than or equal to {}.'.format(object_type, node, data, min_value))
+            if plan.validation_func is not None:
+                data = self.call(plan.validation_func, data, DataManagerInterposerArg(self, rule_name, node, parent, parent_class))
 
-            # If 'max-value' attribute is defined, ensure that the value is less than or equal
-            # to the value indicated.
-            if 'max-value' in schema_rule:
-                max_value = float(schema_rule['max-value'])
-                if data > max_value: 
-                    raise Exception('{} object "{}" = {} must be less than or equal to {}.'.format(object_type, node, data, max_value))
-
-            # If 'matches' attribute is defined, ensure that the value matches the expression.
-            if 'matches' in schema_rule:
-                matches = str(schema_rule['matches'])
-                rex = Rex()
-                if rex.m(matches, r'^\s*\/(.*?)\/(.*?)\s*$'):
-                    expression = rex.d(1)
-                    flags = rex.d(2)
-                    if not rex.m(data, expression, flags):
-                        raise Exception('{} object {} = "{}" does not match {}.'.format(object_type, node, data, matches))
-                elif not rex.m(data, matches, ''):
-                    raise Exception('{} object {} = "{}" does not match {}.'.format(object_type, node, data, matches))
-
-            # If 'in' attribute is defined, ensure that the value is in the designated list.
-            if 'in' in schema_rule:
-                if data not in schema_rule['in']:
-                    raise Exception('{} object {} = "{}" not in [{}].'.format(object_type, node, data, '"' + '", "'.join(schema_rule['in']) + '"'))
-
-            # If 'non-empty' attribute is defined, ensure that the value is not empty.
-            if 'non-empty' in schema_rule:
-                if bool(schema_rule['non-empty']) and len(data) == 0:
-                    raise Exception(f'{object_type} object {node} = "{data}" invalid.  Empty value not allowed.')
-
-            # If 'min-length' attribute is defined, ensure that the value has length >= specified value.
-            if 'min-length' in schema_rule:
-                if len(data) < schema_rule['min-length']:
-                    raise Exception(f'{object_type} object {node} = "{data}" invalid.  Min length is {schema_rule["min-length"]}.')
-
-            # If 'max-length' attribute is defined, ensure that the value has length <= specified value.
-            if 'max-length' in schema_rule:
-                if len(data) < schema_rule['max-length']:
-                    raise Exception(f'{object_type} object {node} = "{data}" invalid.  Max length is {schema_rule["max-length"]}.')
-
-            # If 'equals' attribute is defined, ensure that the value equals the value specified.
-            if 'equals' in schema_rule:
-                if not data == schema_rule['equals']:
-                    raise Exception('{} object {} = "{}" does not equal "{}".'.format(object_type, node, data, schema_rule['equals']))
+            # Apply 'min-value', 'max-value', 'matches', 'in', 'non-empty', 'min-length', 
+            # 'max-length' and 'equals' constraints.
+            for check in plan.checks: check(data, node, data_type)
 
             return(data)
 
@@ -480,177 +808,223 @@ class DataManager():
         
         # Process list and dict nodes.
         if data_type == list  or data_type == dict:
+            object_type = data_type.__name__.capitalize()
+            # In collect mode, errors below this node skip its post-validation function, just as 
+            # raising would.
+            error_count = 0 if self.errors is None else len(self.errors)
+
             # Get number of data elements.
             num_elements = len(data)
 
             # If an interposer function is specified, call it.  
-            if 'pre-validation-func' in schema_rule:
-                func = schema_rule['pre-validation-func']
-                arg = \
-                {
-                    'object': self,
-                    'data': self.data_object,
-                    'rule': rule_name,
-                    'node': node,
-                    'nodes': nodes.copy(),
-                    'depth': rule_name,
-                    'parent': parent,
-                    'parent_class': parent_class,
-                }
-                data = self.call(func, data, arg)
+            if plan.pre_validation_func is not None:
+                data = self.call(plan.pre_validation_func, data, DataManagerInterposerArg(self, rule_name, node, parent, parent_class))
                 
             # If 'min-count' attribute is defined, ensure that number of elements is greater than or
             # equal to the value indicated.
-            if 'min-count' in schema_rule:
-                min_count = schema_rule['min-count']
+            if plan.min_count is not None:
+                min_count = plan.min_count
                 text = '' if num_elements == 1 else 's'
                 if num_elements < min_count: 
-                    raise Exception('{} object "{}" has {} element{}. Minimum of {} required.'.format(object_type, node, num_elements, text, min_count))
+                    self.__add_error(node, rule_name, '{} object "{}" has {} element{}. Minimum of {} required.'.format(object_type, node, num_elements, text, min_count))
             
             # If 'max-count' attribute is defined, ensure that number of elements is less than or
             # equal to the value indicated.
-            if 'max-count' in schema_rule:
-                max_count = schema_rule['max-count']
+            if plan.max_count is not None:
+                max_count = plan.max_count
                 text = '' if num_elements == 1 else 's'
                 if num_elements > max_count: 
-                    raise Exception('{} object "{}" has {} element{}. Maximum of {} allowed.'.format(object_type, node, num_elements, text, max_count))
+                    self.__add_error(node, rule_name, '{} object "{}" has {} element{}. Maximum of {} allowed.'.format(object_type, node, num_elements, text, max_count))
 
             # Data is a list.
             if data_type == list and rule_class == 'list':
                 
                 # Recursively validate all list data elements.  
-                i = 0
-                for i, element in enumerate(data):
-                    # for element in data:
-                    child_node = '{}[{}]'.format(node, i)
-                    child_nodes = nodes.copy()
-                    child_nodes.append(i)
-                    if self.debug_mode: print('Processing {} ...'.format(child_node))
-                    if not 'rule' in schema_rule: schema_rule['rule'] = '__undefined__' 
-                    rval = self.__validate_data_recursively(element, schema_rule['rule'], child_node, child_nodes, depth + 1, data, rule_class)
-                    if not rval is None: data[i] = rval
-                    i += 1
+                child_rule = plan.child_rule
+                if self.parallel_workers is not None and len(data) >= self.parallel_min_items and child_rule != '__undefined__':
+                    self.__validate_elements_parallel(data, child_rule, node, depth)
+                else:
+                    self.__validate_elements(data, child_rule, node, depth, 0)
 
                 # If an interposer function is specified, call it.  
-                if 'post-validation-func' in schema_rule:
-                    func = schema_rule['post-validation-func']
-                    arg = \
-                    {
-                        'object': self,
-                        'data': self.data_object,
-                        'rule': rule_name,
-                        'node': node,
-                        'nodes': nodes.copy(),
-                        'depth': rule_name,
-                        'parent': parent,
-                        'parent_class': parent_class,
-                    }
-                    data = self.call(func, data, arg)
+                if plan.post_validation_func is not None and (self.errors is None or len(self.errors) == error_count):
+                    data = self.call(plan.post_validation_func, data, DataManagerInterposerArg(self, rule_name, node, parent, parent_class))
                 return(None)
 
-            if data_type == list:
-                i = 0
-
             # Data is a dict.
             if (data_type == dict and rule_class == 'dict'):                
                 # Identify all required keys.  Stuff into required_key_not_yet_processed hash.  Once
                 # the required key is processed, delete it from the list.  In the end, any required
                 # keys still in the required_key_not_yet_processed hash will trigger exceptions.
                 required_key_not_yet_processed = {}
-                if 'keys' in schema_rule:
+                if plan.keys is not None:
                     
-                    for dict_valid_key_hash in schema_rule['keys']:
-                        name = dict_valid_key_hash['name']
-                        required = True if 'required' in dict_valid_key_hash and bool(dict_valid_key_hash['required']) else False
-                        is_regx = True if 'regx' in dict_valid_key_hash and bool(dict_valid_key_hash['regx']) else False
-                        # If regx is specified, the name cannot be required.  
-                        if required and is_regx: required = False
-                        if required: required_key_not_yet_processed[name] = True
+                    for spec in plan.keys:
+                        if not spec.required: continue
+                        name = spec.name
+                        required_key_not_yet_processed[name] = True
                         # If required and the name is not in data, but a default value is specified
                         # in the rule, use it.
-                        if required and not name in data:
-                            if 'default' in dict_valid_key_hash:
-                                data[name] = dict_valid_key_hash['default']
-                            elif 'rule' in dict_valid_key_hash and dict_valid_key_hash['rule'] in self.schema:
-                                child_rule = self.schema[dict_valid_key_hash['rule']]
-                                if 'default' in child_rule:
-                                    default_value = child_rule['default']
-                                    default_value_type = ru.stype(default_value)
-                                    # If not a base type, get a copy of the default value.
-                                    if default_value_type == 'list' or default_value_type == 'dict':
-                                        default_value = default_value.copy()
-                                    data[name] = default_value
+                        if not name in data:
+                            if spec.has_default:
+                                data[name] = spec.default
+                            elif spec.has_rule_default:
+                                default_value = spec.rule_default
+                                default_value_type = ru.stype(default_value)
+                                # If not a base type, get a copy of the default value.
+                                if default_value_type == 'list' or default_value_type == 'dict':
+                                    default_value = default_value.copy()
+                                data[name] = default_value
 
                     # Recursively validate all list data key-value pairs.  
                     for data_key in sorted(data.keys()):
-                        match_found = False
-                        # Cycle through all valid_keys_hashes and try to find a match for data_key.
-                        all_rule_keys = []
-                        word_rule_keys = []
-                        for dict_valid_key_hash in schema_rule['keys']:
-                            rule_key = dict_valid_key_hash['name']
-                            is_regx = False 
-                            if 'regx' in dict_valid_key_hash and bool(dict_valid_key_hash['regx']):
-                                is_regx = True
-                            if is_regx:
-                                all_rule_keys.append(f'/{rule_key}/')
-                            else:
-                                word_rule_keys.append(rule_key)
-                                all_rule_keys.append(ru.dquote(rule_key))
-                            if (not is_regx and data_key == rule_key) or (is_regx and re.search(rule_key, data_key)):
-                                if not is_regx and data_key in required_key_not_yet_processed: del required_key_not_yet_processed[data_key]
-                                child_node = '{}'.format(node)
-                                child_node += '["{}"]'.format(data_key)
-                                if self.debug_mode: print('Processing {} ...'.format(child_node))
-                                child_nodes = nodes.copy()
-                                child_nodes.append(data_key)
-                                if 'rule' in dict_valid_key_hash:
-                                    rule_default_value = dict_valid_key_hash['default'] if 'default' in dict_valid_key_hash else None
-                                    rval = self.__validate_data_recursively(data[data_key], dict_valid_key_hash['rule'], child_node, child_nodes, depth + 1, data, rule_class, default_value=rule_default_value)
-                                    if not rval is None: data[data_key] = rval
-                                match_found = True
-                                break
-                        if not match_found:  
-                            msg = f'Invalid entry "{data_key}" found at node {node}.'
-                            if len(all_rule_keys) > 1:
-                                msg += f' Must be one of: {ru.join_items(all_rule_keys, last_join=" or ")}.'
-                            if len(word_rule_keys) > 0:
-                                msg += ' Did you mean ' + ru.join_items(ru.similar_words(data_key, word_rule_keys), last_join=' or ', quote_items=True) + '?'
-                            raise Exception(msg)
+                        # Find the first key spec matching data_key.
+                        spec = plan.find_key(data_key)
+                        if spec is None:  
+                            self.__add_error(node, rule_name, self.__invalid_key_message(plan, data_key, node))
+                            continue
+                        if not spec.is_regx and data_key in required_key_not_yet_processed: del required_key_not_yet_processed[data_key]
+                        child_node = DataManagerNode(node, data_key)
+                        if self.debug_mode: print('Processing {} ...'.format(child_node))
+                        if spec.rule is not None:
+                            rval = self.__validate_child(data[data_key], spec.rule, child_node, depth + 1, data, rule_class, default_value=spec.default)
+                            if not rval is None: data[data_key] = rval
 
                 # Are there any required_key_not_yet_processed entries?  If so, flag them as exceptions.
                 required_keys = list(required_key_not_yet_processed.keys())
 
                 if len(required_keys) == 1:
-                    raise Exception('Required key "{}" at node {} not defined.'.format(required_keys[0], node))
+                    self.__add_error(node, rule_name, 'Required key "{}" at node {} not defined.'.format(required_keys[0], node))
                 elif len(required_keys) > 1:
-                    raise Exception('Required keys "{}" at node {} not defined.'.format('", "'.join(required_keys), node))            
+                    self.__add_error(node, rule_name, 'Required keys "{}" at node {} not defined.'.format('", "'.join(required_keys), node))            
 
                 # If an interposer function is specified, call it.  
-                if 'post-validation-func' in schema_rule:
-                    func = schema_rule['post-validation-func']
-                    arg = \
-                    {
-                        'object': self,
-                        'data': self.data_object,
-                        'rule': rule_name,
-                        'node': node,
-                        'nodes': nodes.copy(),
-                        'depth': rule_name,
-                        'parent': parent,
-                        'parent_class': parent_class,
-                    }
-                    data = self.call(func, data, arg)
+                if plan.post_validation_func is not None and (self.errors is None or len(self.errors) == error_count):
+                    data = self.call(plan.post_validation_func, data, DataManagerInterposerArg(self, rule_name, node, parent, parent_class))
                 return(None)
 
-            if data_type == dict:
-                i = 0
-
         # If we get here it means that there is an invalid data_type / rule_class combination.
         raise Exception('Data node {} is of type {}. This cannot be reconciled with {}.'.format(node, data_type, rule_class))
 
     ##########
 
+    def __validate_elements(self, data, child_rule, node, depth, start):
+        # Validate list elements data[start:] one at a time.
+        for i in range(start, len(data)):
+            child_node = DataManagerNode(node, i, True)
+            if self.debug_mode: print('Processing {} ...'.format(child_node))
+            rval = self.__validate_child(data[i], child_rule, child_node, depth + 1, data, 'list')
+            if not rval is None: data[i] = rval
+
+    ##########
+
+    def __validate_elements_parallel(self, data, child_rule, node, depth):
+        # Validate list elements in chunks on the process pool, merging results back in order.  If 
+        # the pool cannot be used, the remaining elements are validated serially.
+        pool = self.__get_pool()
+        if pool is None: return self.__validate_elements(data, child_rule, node, depth, 0)
+        size = max(1, -(-len(data) // (self.parallel_workers * 4)))
+        collect_errors = self.errors is not None
+        futures = []
+        for start in range(0, len(data), size):
+            futures.append((start, pool.submit(_validate_chunk, child_rule, node, start, data[start:start + size], depth + 1, collect_errors, self.max_errors)))
+        for start, future in futures:
+            try:
+                elements, errors, error = future.result()
+            except Exception:
+                # The pool broke or a chunk could not be pickled; fall back to serial validation.
+                self.__stop_pool()
+                self.parallel_workers = None
+                return self.__validate_elements(data, child_rule, node, depth, start)
+            data[start:start + len(elements)] = elements
+            if collect_errors:
+                for err in errors:
+                    self.errors.append(err)
+                    if self.max_errors is not None and len(self.errors) >= self.max_errors: raise DataManagerErrorLimit()
+            if error is not None: raise error
+
+    ##########
+
+    def _validate_chunk(self, child_rule, node, start, elements, depth, collect_errors, max_errors):
+        r'''
+            Validate `elements`, a chunk of the list at `node` starting at index `start`, in a 
+            parallel validation worker.  Returns (validated elements, errors, exception or None); 
+            elements after a raised exception are not returned.
+        '''
+        self.data_object = elements
+        self.errors = [] if collect_errors else None
+        self.max_errors = max_errors
+        done = []
+        error = None
+        try:
+            for i, element in enumerate(elements):
+                rval = self.__validate_child(element, child_rule, DataManagerNode(node, start + i, True), depth, elements, 'list')
+                done.append(element if rval is None else rval)
+        except DataManagerErrorLimit:
+            pass
+        except Exception as err:
+            error = err
+        return done, self.errors, error
+
+    ##########
+
+    def __get_pool(self):
+        # Start the process pool on first use.  Returns None if the schema cannot be sent to workers.
+        if self.pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            state = (self.schema, self.func_rules, self.module_file, self.root_rule_name)
+            try:
+                pickle.dumps(state)
+            except Exception:
+                self.parallel_workers = None
+                return None
+            self.pool = ProcessPoolExecutor(max_workers=self.parallel_workers, initializer=_init_worker, initargs=(state,))
+        return self.pool
+
+    ##########
+
+    def __stop_pool(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    ##########
+
+    def __invalid_key_message(self, plan, data_key, node):
+        # Error message for a dict key that matches no key spec, with suggestions.
+        all_rule_keys = [f'/{spec.name}/' if spec.is_regx else ru.dquote(spec.name) for spec in plan.keys]
+        word_rule_keys = [spec.name for spec in plan.keys if not spec.is_regx]
+        msg = f'Invalid entry "{data_key}" found at node {node}.'
+        if len(all_rule_keys) > 1:
+            msg += f' Must be one of: {ru.join_items(all_rule_keys, last_join=" or ")}.'
+        if len(word_rule_keys) > 0:
+            msg += ' Did you mean ' + ru.join_items(ru.similar_words(data_key, word_rule_keys), last_join=' or ', quote_items=True) + '?'
+        return msg
+
+    ##########
+
+    def __get_matcher(self, matches):
+        '''
+            Get the compiled `RexPattern` for a 'matches' attribute value.  Values of the form
+            "/expression/flags" are split into expression and flags, anything else is used as the
+            expression as is.  Compiled patterns are kept in self.matchers keyed on the value.
+            # Arguments
+            - matches: 'matches' attribute value as str
+            # Returns
+            RexPattern object
+        '''
+        matcher = self.matchers.get(matches)
+        if matcher is None:
+            rex = Rex()
+            if rex.m(matches, r'^\s*\/(.*?)\/(.*?)\s*$'):
+                matcher = Rex.compile(rex.d(1), rex.d(2))
+            else:
+                matcher = Rex.compile(matches, '')
+            self.matchers[matches] = matcher
+        return matcher
+
+    ##########
+
     def to_yaml(self, data, file=None):
         '''
             Render data in YML format.
@@ -1054,11 +1428,12 @@ class DataManager():
         return(value)
 
     def call(self, func, data, arg=None):
-        node = ''
-        try:
-            node = f" at node {arg['node']}" 
-        except:
-            pass
+        def at_node():
+            # The node path is only rendered for error messages.
+            try:
+                return f" at node {arg['node']}" 
+            except:
+                return ''
         inst = """You must do one of the following: (1) Pass the function itself and NOT the function's string name. (2) Pass the file name containing the function to DataManager() using the module_file attribute. (3) Specify the function string name + " in " + the file name containing the function (e.g. "my_func in some_script.py")."""
         try:
             if inspect.isfunction(func):
@@ -1095,11 +1470,11 @@ class DataManager():
                     spec.loader.exec_module(foo)
                     return getattr(foo, func)(data, arg)
                 if self.module_spec is None:
-                    raise DataManagerFunctionError(f"""Could not run validation function {func}{node}.  {inst}""")
+                    raise DataManagerFunctionError(f"""Could not run validation function {func}{at_node()}.  {inst}""")
                 return self.module_spec.__dict__[func](data, arg)
         except DataManagerFunctionError as err:
-            raise Exception(f"""Could not run validation function {func}{node}.  {err}  {inst}""")
+            raise Exception(f"""Could not run validation function {func}{at_node()}.  {err}  {inst}""")
         except Exception as err:
-            raise Exception(f"""Error in {func}{node}: {err}""")
+            raise Exception(f"""Error in {func}{at_node()}: {err}""")
         return data
 
@@ -285,22 +285,30 @@ class DSSC():
         ls_out = rex.s(ls_out, r'\r', '\n', 'g=')
         ls_out = rex.s(ls_out, r'\r\n', '\n', 'g=')
         ls_lines = rex.split(ls_out, r'\n')
+        # Compile the per-line expressions once; they are applied to every line of the listing.
+        dir_line = Rex.compile(r'^Directory\s+of:\s+file:///(\w)\|(.*)\s*')
+        header_line = Rex.compile(r'^Time\s+Stamp')
+        ignore_files = Rex.compile_set(ignore_files, 'i')
+        ignore_dirs = Rex.compile_set(ignore_dirs, 'i')
         abs_dir_path = None
         rel_dir_path = None
         base_dir_name = None
         dir_list = None
+        dir_ignored = False
         loc = {}
         all = {}
         for line in ls_lines:
-            if rex.s(line, r'^Directory\s+of:\s+file:///(\w)\|(.*)\s*', '', ''):
-                abs_dir_path = fs.fix(rex.d(1) + ":" + rex.d(2))
+            if dir_line.m(line):
+                abs_dir_path = fs.fix(dir_line.d(1) + ":" + dir_line.d(2))
                 rel_dir_path = fs.unix(fs.rel(abs_dir_path, cwd))
                 base_dir_name = fs.filename(abs_dir_path)
                 dir_list = rel_dir_path.split('/')
+                # The ignore_dirs test only depends on the directory, so do it once per directory.
+                dir_ignored = any(ignore_dirs.m(dir) for dir in dir_list)
                 continue
             if abs_dir_path is None:
                 continue
-            if rex.m(line, r'^Time\s+Stamp'):
+            if header_line.m(line):
                 loc['modified'] = [0, 17]
                 loc['status'] = [18, line.find('WS Status') + len('WS Status') + 1]
                 loc['version'] = [line.find('Version'), line.find('Type') - 1]
@@ -315,16 +323,7 @@ class DSSC():
                 name = data['name']
                 if name == 'mtr_fuse_converter.cpython-39.pyc':
                     stop = True
-                keep = True
-                for r in ignore_files: 
-                    if rex.m(name, r, 'i'):
-                        keep = False
-                        break
-                for dir in dir_list:
-                    for r in ignore_dirs:
-                        if rex.m(dir, r, 'i'):
-                            keep = False
-                            break
+                keep = not dir_ignored and not ignore_files.m(name)
                 if keep == True:
                     data['path'] = rel_dir_path
                     if data['version'] == 'Unmanaged':
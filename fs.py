@@ -9,7 +9,15 @@ import fs
 
 '''
 
-import os, sys, re, filecmp, shutil, time, io
+import os, sys, re, filecmp, shutil, time, io, hashlib, json
+from rex import Rex
+
+def __getattr__(name):
+  # `fs.aio` is the asyncio companion module, imported on first use.
+  if name == 'aio':
+    import aiofs
+    return aiofs
+  raise AttributeError(f'''module "{__name__}" has no attribute "{name}"''')
 
 def open_file(path, mode='r', encoding='utf-8', errors='ignore'):
   '''
@@ -42,7 +50,14 @@ def open_file(path, mode='r', encoding='utf-8', errors='ignore'):
 
 fopen = open_file
 
-def read_file(path, to_string=False, to_iter=False, encoding='utf-8', errors='ignore'):
+class _EmptyMap(bytes):
+  # Stand-in for the mmap of an empty file (which cannot be mapped): empty bytes that can also 
+  # be closed and used in a `with` block.
+  def close(self): pass
+  def __enter__(self): return self
+  def __exit__(self, *args): return False
+
+def read_file(path, to_string=False, to_iter=False, encoding='utf-8', errors='ignore', to_mmap=False, to_chunks=None):
   '''
     ## Description
     Read file and return a list of lines.
@@ -51,6 +66,12 @@ def read_file(path, to_string=False, to_iter=False, encoding='utf-8', errors='ig
     
     ```python
     my_lines = fs.read_file(path)
+
+    # Scan a large file without building a list of lines.
+    with fs.read_file(path, to_mmap=True) as buf: 
+      count = buf[:].count(b'ERROR')
+    for chunk in fs.read_file(path, to_chunks=1 << 20):
+      ...
     ```
     
     ## Arguments
@@ -58,6 +79,12 @@ def read_file(path, to_string=False, to_iter=False, encoding='utf-8', errors='ig
     - `to_string`: optional bool; if True return content as a string
     - `to_iter`: optional bool; if True return content is an iterator
     - `encoding`: encoding
+    - `to_mmap`: optional bool; if True return a read-only `mmap.mmap` of the file (a zero-copy, 
+    bytes-like buffer that supports slicing, `find()` and bytes regular expressions; use `close()` 
+    or a `with` block when done).  An empty file returns an empty bytes object that supports the 
+    same `close()` and `with` usage.
+    - `to_chunks`: optional int; if specified return a generator of str chunks of up to this many 
+    characters
     
     ## Aliases
     `read_file`, `fread`, `read`
@@ -66,11 +93,19 @@ def read_file(path, to_string=False, to_iter=False, encoding='utf-8', errors='ig
     list of lines each of typ str (or a single string if to_string is True)
   '''
   try:
+    if to_mmap:
+      import mmap
+      with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0: return(_EmptyMap())
+        return(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    if to_chunks is not None:
+      if to_chunks <= 0: raise Exception(f'Invalid chunk size {to_chunks}; must be greater than 0.')
+      return(_read_chunks(open(path, 'r', encoding=encoding, errors=errors), path, to_chunks))
     f = open(path, 'r', encoding=encoding, errors=errors)
     if to_iter:
       return(f)
     if to_string:
-      text = "".join(f.readlines())
+      text = f.read()
       f.close()
       return(text)
     else:
@@ -90,6 +125,15 @@ def read_file(path, to_string=False, to_iter=False, encoding='utf-8', errors='ig
     if path is None: raise Exception(f'''Required path variable not defined: {err}''')
     raise Exception(f'''Could not read file "{path}": {err}''')
 
+def _read_chunks(f, path, size):
+  # Generator behind read_file(to_chunks=...); the file is closed when the generator finishes.
+  with f:
+    while True:
+      try: chunk = f.read(size)
+      except Exception as err: raise Exception(f'''Could not read file "{path}": {err}''')
+      if not chunk: return
+      yield chunk
+
 fread = read_file
 read = read_file
 fread = read_file
@@ -116,7 +160,7 @@ def reads(path, encoding='utf-8', errors='ignore'):
   '''
   return read(path, to_string=True, encoding=encoding, errors=errors)
 
-def write_file(path, content, encoding='utf-8', errors='ignore'):
+def write_file(path, content, encoding='utf-8', errors='ignore', buffer_size=None, append=False, atomic=False, fsync=False):
   '''
     ## Description
     Write content to file.
@@ -125,11 +169,21 @@ def write_file(path, content, encoding='utf-8', errors='ignore'):
     
     ```python
     fs.write_file(path, content)
+
+    # Stream generated lines straight to disk, replacing the file only once complete.
+    fs.write_file(path, (f'{row}\\n' for row in rows), buffer_size=1 << 20, atomic=True)
     ```
 
     ## Arguments
     - `path`: file as str
-    - `content`: str or list data to write to file
+    - `content`: str, bytes, list or any other iterable (e.g. a generator) of str or bytes items 
+    to write to file; items are written as they are produced
+    - `encoding`: encoding used for str items
+    - `buffer_size`: write buffer size in bytes (default = None, system default)
+    - `append`: append to the file instead of overwriting it (default = False)
+    - `atomic`: write to a temp file in the same directory and rename it over `path` when done, so 
+    readers never see a partial file (default = False)
+    - `fsync`: flush the data to disk before returning (default = False)
     
     ## Aliases
     `write_file`, `fwrite`, `write`
@@ -137,20 +191,48 @@ def write_file(path, content, encoding='utf-8', errors='ignore'):
     ## Returns
     nothing
   '''  
+  temp_file = None
   try:
-    with io.open(path, 'w', encoding=encoding, errors=errors) as f:
-      if type(content) == str:
-        f.write(content)
-        f.close()
-      elif type(content) == list:
-        f.writelines(content)
-        f.close()
-      else:
-        raise Exception('Invalid content of type "{}"; must be "str" or "list".'.format(type(content).__name__))
+    if type(content) in (str, bytes, bytearray): content = [content]
+    elif isinstance(content, dict) or not hasattr(content, '__iter__'):
+      raise Exception('Invalid content of type "{}"; must be "str", "bytes" or an iterable of them.'.format(type(content).__name__))
+    target = path
+    if atomic:
+      target, temp_file = _create_temp_file(path)
+    import codecs
+    encoder = codecs.getincrementalencoder(encoding)(errors)
+    translate = os.linesep != '\n'
+    with open(target, 'wb' if atomic else 'ab' if append else 'wb', buffering=buffer_size if buffer_size is not None else -1) as f:
+      if atomic and append and os.path.exists(path):
+        with open(path, 'rb') as src: shutil.copyfileobj(src, f)
+      for item in content:
+        if type(item) == str:
+          # Text is encoded the way a text mode file would write it.
+          if translate: item = item.replace('\n', os.linesep)
+          item = encoder.encode(item)
+        elif type(item) not in (bytes, bytearray, memoryview):
+          raise Exception('Invalid content item of type "{}"; must be "str" or "bytes".'.format(type(item).__name__))
+        f.write(item)
+      f.write(encoder.encode('', final=True))
+      if fsync:
+        f.flush()
+        os.fsync(f.fileno())
+    if atomic:
+      try: 
+        if os.path.exists(path): shutil.copymode(path, temp_file)
+      except OSError: pass
+      os.replace(temp_file, path)
+      temp_file = None
+      if fsync and os.name == 'posix':
+        # Make the rename itself durable.
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try: os.fsync(fd)
+        finally: os.close(fd)
   except Exception as err:
-    # Close file connection if open.
-    try: f.close()
-    except: pass
+    # Remove a partial temp file.
+    if temp_file is not None:
+      try: os.remove(temp_file)
+      except OSError: pass
     # # Default encoding is "utf-8".  If this fails, try to read with encoding None.  I have oddly 
     # # found that "utf-8" is the safest thing to do but that this sometimes fails and encoding None
     # # will often work.  It takes a combination of both unfortunately.  
@@ -160,6 +242,17 @@ def write_file(path, content, encoding='utf-8', errors='ignore'):
     if path is None: raise Exception(f'''Required path variable not defined: {err}''')
     raise Exception(f'''Could not write file "{path}": {err}''')
 
+def _create_temp_file(path):
+  # Create a uniquely named temp file next to path and return (fd, name).  Like mkstemp, every 
+  # writer (thread or process) gets its own file (O_EXCL), but the file is created with mode 0666 
+  # so the kernel applies the umask as it does for any new file.
+  flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+  for _ in range(10000):
+    name = os.path.join(os.path.dirname(path) or '.', '.' + os.path.basename(path) + '.' + os.urandom(6).hex() + '.tmp')
+    try: return os.open(name, flags, 0o666), name
+    except FileExistsError: continue
+  raise FileExistsError(f'''No unused temp file name for "{path}"''')
+
 fwrite = write_file
 write = write_file
 
@@ -193,36 +286,136 @@ unlink = delete_file
 fdelete = delete_file
 fdel = delete_file
 
-def delete_dir(path):
+def delete_dir(path, regx=None, older_than=None, parallel=False, workers=None, dry_run=False, keep_root=False, ignore_errors=False):
   '''
     ## Description
-    Delete a directory.
+    Delete a directory.  With no options besides `path` this is `shutil.rmtree()`.  Any other 
+    option selects the pruning engine: the tree is walked with `os.scandir()`, files are unlinked 
+    (across a thread pool if `parallel` is True) and directories left empty are removed bottom-up.
     
     ## Usage
     
     ```python
     fs.delete_dir(path)
+
+    # Delete log files older than 30 days, then any directories left empty.
+    info = fs.delete_dir(path, regx=r'\\.log$', older_than=30, parallel=True, keep_root=True)
+
+    # Report what would be removed.
+    info = fs.delete_dir(path, older_than=30, dry_run=True)
     ```
 
     ## Arguments
     - `path`: directory as str
+    - `regx`: only delete files whose name matches this regular expression (default = None, all 
+    files)
+    - `older_than`: only delete files last modified more than this many days ago (default = None, 
+    any age)
+    - `parallel`: walk and unlink on a thread pool (default = False)
+    - `workers`: number of threads when `parallel` is True (default = `os.cpu_count() * 4`, max 32)
+    - `dry_run`: delete nothing; report what would be deleted (default = False)
+    - `keep_root`: never remove `path` itself (default = False)
+    - `ignore_errors`: count files or directories that cannot be removed instead of raising 
+    (default = False)
     
     ## Aliases
     `delete_dir`, `rmdir`
 
     ## Returns
-    nothing
+    nothing for a plain `shutil.rmtree()`; otherwise a dict of counts: `files` and `dirs` removed, 
+    `bytes` freed, files `kept` by the filters and `errors` (plus `paths`, the list of files and 
+    directories that would be removed, for a dry run).
   '''  
   try:
-    shutil.rmtree(path)
+    if regx is None and older_than is None and not parallel and not dry_run and not keep_root and not ignore_errors:
+      shutil.rmtree(path)
+      return
+    if not dir_exists(path): raise Exception('Path "{}" does not exist'.format(path))
+    return(_prune_tree(path, regx, older_than, workers if parallel else 1, dry_run, keep_root, ignore_errors))
   except Exception as err:
     raise Exception(f'''Could not delete directory "{path}": {err}''')
 
+def _prune_tree(path, regx, older_than, workers, dry_run, keep_root, ignore_errors):
+  # Pruning engine behind delete_dir().
+  from concurrent.futures import ThreadPoolExecutor
+  search = re.compile(regx).search if regx is not None else None
+  cutoff = time.time() - older_than * 86400 if older_than is not None else None
+  info = {'files': 0, 'dirs': 0, 'bytes': 0, 'kept': 0, 'errors': 0}
+  errors = []
+  doomed = []
+  # Directory -> [True if something in it stays, child directories]
+  tree = {}
+  for root, files, dirs in _walk_entries(path, workers):
+    kept = False
+    # Symbolic links to directories are removed as links, never followed.
+    for entry in files + [d for d in dirs if d.is_symlink()]:
+      try:
+        st = entry.stat(follow_symlinks=False)
+      except OSError as err:
+        errors.append(err)
+        kept = True
+        continue
+      if (search is not None and not search(entry.name)) or (cutoff is not None and st.st_mtime >= cutoff):
+        info['kept'] += 1
+        kept = True
+        continue
+      doomed.append((entry.path, root, st.st_size))
+    tree[root] = [kept, [fix(d.path) for d in dirs if not d.is_symlink()]]
+
+  def unlink(batch):
+    done = []
+    for file, root, size in batch:
+      try:
+        os.unlink(file)
+        done.append((file, root, size, None))
+      except OSError as err:
+        done.append((file, root, size, err))
+    return done
+
+  batches = [doomed[i:i + 256] for i in range(0, len(doomed), 256)]
+  if dry_run: results = [[(file, root, size, None) for file, root, size in batch] for batch in batches]
+  elif workers == 1 or len(batches) < 2: results = map(unlink, batches)
+  else:
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as pool: 
+      results = list(pool.map(unlink, batches))
+  removed = []
+  for batch in results:
+    for file, root, size, err in batch:
+      if err is not None:
+        errors.append(err)
+        tree[root][0] = True
+        continue
+      info['files'] += 1
+      info['bytes'] += size
+      if dry_run: removed.append(file)
+
+  # Remove directories bottom-up; a directory goes only if everything below it went.
+  top = fix(path)
+  gone = set()
+  for root in sorted(tree, key=lambda d: d.count(os.sep), reverse=True):
+    kept, children = tree[root]
+    if kept or any(child not in gone for child in children): continue
+    if keep_root and root == top: continue
+    if not dry_run:
+      try:
+        os.rmdir(root)
+      except OSError as err:
+        errors.append(err)
+        continue
+    gone.add(root)
+    info['dirs'] += 1
+    if dry_run: removed.append(root)
+  info['errors'] = len(errors)
+  if errors and not ignore_errors:
+    raise Exception(f'{len(errors)} item(s) could not be removed; first error: {errors[0]}')
+  if dry_run: info['paths'] = removed
+  return(info)
+
 rmdir = delete_dir
 # ddelete = delete_dir
 # ddel = delete_dir
 
-def write_file_if_changed(path, content, name=None, create_dir=True, simple=False, mode=None, encoding='utf-8'):
+def write_file_if_changed(path, content, name=None, create_dir=True, simple=False, mode=None, encoding='utf-8', in_memory=True):
   '''
     ## Description
     Write a file only if it results in a change.
@@ -241,6 +434,9 @@ def write_file_if_changed(path, content, name=None, create_dir=True, simple=Fals
     - `simple`: if True, return simple status string (e.g. "created", "identical", or "updated"); if False, return bool (True if copied, False otherwise)
     - `mode`: assert file mode (default = None)  
     - `encoding`: file encoding (default = 'utf-8')
+    - `in_memory`: if True, compare the encoded content with the existing file in memory (size 
+    first, then chunk by chunk) and only write when it differs, replacing the file atomically; if 
+    False, write a temp file and compare the two files on disk (default = True)
     
     ## Aliases
     `write_file_if_changed`, `fwriteif`, `writeif`
@@ -256,6 +452,8 @@ def write_file_if_changed(path, content, name=None, create_dir=True, simple=Fals
       os.makedirs(dir_name, dir_mode)
     if not dir_exists(dir_name): 
       raise Exception('Cannot write file "{}"; base directory "{}" does not exist.'.format(path, dir_name))
+    if in_memory:
+      return _write_if_changed(path, content, name, simple, mode, encoding)
     if not file_exists(path):
       write_file(path, content, encoding=encoding)
       if mode is not None: os.chmod(path, mode)
@@ -276,7 +474,95 @@ def write_file_if_changed(path, content, name=None, create_dir=True, simple=Fals
     if path is None: raise Exception(f'''Required path variables not defined: {err}''')
     raise Exception(f'''Could not write file "{path}": {err}''')
 
+def _encode_content(content, encoding='utf-8', errors='ignore'):
+  # Encode str or list content to the exact bytes `write_file` would produce (text mode 
+  # translates "\n" to the platform line separator).
+  if type(content) == list: content = ''.join(content)
+  elif type(content) != str:
+    raise Exception('Invalid content of type "{}"; must be "str" or "list".'.format(type(content).__name__))
+  if os.linesep != '\n': content = content.replace('\n', os.linesep)
+  return content.encode(encoding, errors)
+
+def _same_content(path, data, chunk_size=1 << 16):
+  # Compare bytes with a file: size first, then chunk by chunk so a difference stops the read early.
+  try:
+    if os.stat(path).st_size != len(data): return False
+  except FileNotFoundError:
+    return None
+  view = memoryview(data)
+  with open(path, 'rb') as f:
+    pos = 0
+    while True:
+      chunk = f.read(chunk_size)
+      if not chunk: return pos == len(data)
+      if view[pos:pos + len(chunk)] != chunk: return False
+      pos += len(chunk)
+
+def _write_if_changed(path, content, name, simple, mode, encoding):
+  # In-memory compare and atomic write for `write_file_if_changed` (base directory already checked).
+  data = _encode_content(content, encoding=encoding)
+  same = _same_content(path, data)
+  if same:
+    if simple: return('identical')
+    else: return('No change to file "{}".'.format(name))
+  write_file(path, data, atomic=True)
+  if same is None:
+    if mode is not None: os.chmod(path, mode)
+    if simple: return('created')
+    else: return('Created new file "{}".'.format(name))
+  if simple: return('updated')
+  else: return('Updated file "{}".'.format(name))
+
 fwriteif = write_file_if_changed
+
+def write_files_if_changed(items, create_dir=True, simple=False, mode=None, encoding='utf-8'):
+  '''
+    ## Description
+    Write many files, each only if it results in a change.  Same as calling 
+    `write_file_if_changed` for every file with in memory comparison, but each base directory is 
+    checked (and created) once.
+    
+    ## Usage
+    
+    ```python
+    results = fs.write_files_if_changed([(path1, content1), (path2, content2)])
+    results = fs.write_files_if_changed({path1: content1, path2: content2}, simple=True)
+    ```
+
+    ## Arguments
+    - `items`: iterable of (path, content) pairs or dict of path to content
+    - `create_dir`: create base dirs if they do not already exist (default = True)
+    - `simple`: if True, return simple status strings (e.g. "created", "identical", or "updated")
+    - `mode`: assert file mode (default = None)  
+    - `encoding`: file encoding (default = 'utf-8')
+    
+    ## Aliases
+    `write_files_if_changed`, `fwriteifs`, `writeifs`
+
+    ## Returns
+    A list of strings indicating the action performed for each file, in order.
+  '''  
+  if type(items) == dict: items = items.items()
+  results = []
+  checked = set()
+  path = None
+  try:
+    for path, content in items:
+      dir_name = get_dir_name(path)
+      if dir_name not in checked:
+        if create_dir == True and not dir_exists(dir_name): 
+          dir_mode = mode if mode is not None else 0x755
+          os.makedirs(dir_name, dir_mode, exist_ok=True)
+        if not dir_exists(dir_name): 
+          raise Exception('Cannot write file "{}"; base directory "{}" does not exist.'.format(path, dir_name))
+        checked.add(dir_name)
+      results.append(_write_if_changed(path, content, path, simple, mode, encoding))
+    return results
+  except Exception as err:
+    raise Exception(f'''Could not write file "{path}": {err}''')
+
+fwriteifs = write_files_if_changed
+writeifs = write_files_if_changed
 writeif = write_file_if_changed
 
 def rename_file(orig_file, new_file):
@@ -631,6 +917,223 @@ def get_unix_path(path):
 
 unix = get_unix_path
 
+_EXT_REGX = re.compile(r'\.(\w+)$')
+
+def get_file_names(paths):
+  '''
+    ## Description
+    Batch version of `fs.get_file_name()`.
+    
+    ## Usage
+    
+    ```python
+    names = fs.get_file_names(paths)
+    ```
+
+    ## Arguments
+    - `paths`: list or other iterable of paths as str
+
+    ## Aliases
+    `get_file_names`, `fnames`
+    
+    ## Returns
+    List of base file names as str.
+  '''
+  try:
+    basename = os.path.basename
+    return([basename(path) for path in paths])
+  except Exception as err:
+    raise Exception(f'''Could not get file names: {err}''')
+
+fnames = get_file_names
+
+def get_root_names(paths):
+  '''
+    ## Description
+    Batch version of `fs.get_root_name()`.
+    
+    ## Usage
+    
+    ```python
+    roots = fs.get_root_names(paths)
+    ```
+
+    ## Arguments
+    - `paths`: list or other iterable of paths as str
+
+    ## Aliases
+    `get_root_names`, `froots`
+    
+    ## Returns
+    List of root file names as str.
+  '''
+  try:
+    basename = os.path.basename
+    splitext = os.path.splitext
+    return([splitext(basename(path))[0] for path in paths])
+  except Exception as err:
+    raise Exception(f'''Could not get root names: {err}''')
+
+froots = get_root_names
+
+def get_exts(paths):
+  '''
+    ## Description
+    Batch version of `fs.get_ext()`.
+    
+    ## Usage
+    
+    ```python
+    exts = fs.get_exts(paths)
+    ```
+
+    ## Arguments
+    - `paths`: list or other iterable of paths as str
+
+    ## Aliases
+    `get_exts`, `exts`
+    
+    ## Returns
+    List of file extensions as str in lower case ("" if none).
+  '''
+  try:
+    search = _EXT_REGX.search
+    rval = []
+    for path in paths:
+      m = search(path)
+      rval.append(m.group(1).lower() if m else '')
+    return(rval)
+  except Exception as err:
+    raise Exception(f'''Could not get extensions: {err}''')
+
+exts = get_exts
+
+def get_dir_names(paths, count=1):
+  '''
+    ## Description
+    Batch version of `fs.get_dir_name()`.  Relative paths are resolved against the current 
+    working directory, which is read once.
+    
+    ## Usage
+    
+    ```python
+    dirs = fs.get_dir_names(paths)
+    ```
+
+    ## Arguments
+    - `paths`: list or other iterable of paths as str
+    - `count`: depth (default = 1)
+
+    ## Aliases
+    `get_dir_names`, `dirnames`
+    
+    ## Returns
+    List of dir names as str.
+  '''
+  try:
+    cwd = os.getcwd()
+    isabs, join, normpath, dirname = os.path.isabs, os.path.join, os.path.normpath, os.path.dirname
+    rval = []
+    for path in paths:
+      path = normpath(path if isabs(path) else join(cwd, path))
+      for _ in range(count): path = dirname(path)
+      rval.append(path)
+    return(rval)
+  except Exception as err:
+    raise Exception(f'''Could not get directory names: {err}''')
+
+dirnames = get_dir_names
+
+def get_rel_paths(paths, base_path=None):
+  '''
+    ## Description
+    Batch version of `fs.get_rel_path()`.  The base path is resolved once.
+    
+    ## Usage
+    
+    ```python
+    rel_paths = fs.get_rel_paths(paths, base_path)
+    ```
+
+    ## Arguments
+    - `paths`: list or other iterable of paths as str
+    - `base_path`: base path from which the relative paths begin (default = current directory)
+
+    ## Aliases
+    `get_rel_paths`, `rels`
+    
+    ## Returns
+    List of relative paths as str.
+  '''
+  try:
+    if base_path is None: base_path = get_cwd()
+    if is_file(base_path): base_path = get_dir_name(base_path)
+    base_path = os.path.abspath(base_path)
+    relpath = os.path.relpath
+    return([relpath(path, base_path) for path in paths])
+  except Exception as err:
+    raise Exception(f'''Could not get relative paths given base path "{base_path}": {err}''')
+
+rels = get_rel_paths
+
+def fix_path_names(paths):
+  '''
+    ## Description
+    Batch version of `fs.fix_path_name()` (one path per item).
+    
+    ## Usage
+    
+    ```python
+    fixed = fs.fix_path_names(paths)
+    ```
+
+    ## Arguments
+    - `paths`: list or other iterable of paths as str
+
+    ## Aliases
+    `fix_path_names`, `fixes`
+    
+    ## Returns
+    List of platform style paths as str.
+  '''
+  try:
+    old, new = ('/', '\\') if sys.platform == 'win32' else ('\\', '/')
+    normpath = os.path.normpath
+    return([normpath(path.replace(old, new)) for path in paths])
+  except Exception as err:
+    raise Exception(f'''Could not fix path names: {err}''')
+
+fixes = fix_path_names
+
+def split_paths(paths):
+  '''
+    ## Description
+    Split many paths at once into columns: base name, root name, extension and dir name (same 
+    values as the scalar functions).
+    
+    ## Usage
+    
+    ```python
+    cols = fs.split_paths(paths)
+    for name, ext in zip(cols['name'], cols['ext']): ...
+    ```
+
+    ## Arguments
+    - `paths`: list or other iterable of paths as str
+
+    ## Returns
+    Dict of equal length lists: {'path': ..., 'dir': ..., 'name': ..., 'root': ..., 'ext': ...}.
+  '''
+  paths = list(paths)
+  names = get_file_names(paths)
+  return({
+    'path': paths, 
+    'dir': get_dir_names(paths), 
+    'name': names, 
+    'root': [os.path.splitext(name)[0] for name in names], 
+    'ext': get_exts(paths),
+  })
+
 def file_exists(path):
   '''
     ## Description
@@ -988,7 +1491,50 @@ def get_abs_path(path, basepath=None):
 
 abs = get_abs_path
 
-def get_files(paths, regx=r'.*', rec=True, must_exist=True, func=None):
+class FileInfo():
+  '''
+    ## Description
+    Lightweight file record yielded by `fs.get_files()` and `fs.get_dirs()` when `stat=True`.  
+    The values are captured from the `os.scandir()` entry during the walk, so no further `stat` 
+    calls (e.g. `fs.get_size()` or `fs.last_modified()`) are needed.
+
+    ## Attributes
+    - `path`: full path as str (same form as `fs.get_files()` yields by default)
+    - `name`: base name
+    - `size`: size in bytes
+    - `mtime`: last modified time stamp in seconds (as `fs.last_modified()`)
+    - `mtime_ns`: last modified time stamp in nanoseconds
+    - `inode`: inode number (file index on Windows)
+    - `is_symlink`: True if the entry is a symbolic link (size and times are those of the target, 
+    or of the link itself if the target does not exist)
+  '''
+  __slots__ = ('path', 'name', 'size', 'mtime', 'mtime_ns', 'inode', 'is_symlink')
+
+  def __init__(self, path, name, size, mtime, mtime_ns, inode, is_symlink):
+    self.path = path
+    self.name = name
+    self.size = size
+    self.mtime = mtime
+    self.mtime_ns = mtime_ns
+    self.inode = inode
+    self.is_symlink = is_symlink
+
+  def __repr__(self):
+    return f'<FileInfo "{self.path}" size={self.size} mtime={self.mtime}>'
+
+  def __fspath__(self):
+    return self.path
+
+def _file_info(path, entry):
+  # Build a FileInfo from a DirEntry.  Dangling symbolic links fall back to the link's own stat.
+  is_symlink = entry.is_symlink()
+  try:
+    st = entry.stat()
+  except OSError:
+    st = entry.stat(follow_symlinks=False)
+  return FileInfo(path, entry.name, st.st_size, st.st_mtime, st.st_mtime_ns, st.st_ino, is_symlink)
+
+def get_files(paths, regx=r'.*', rec=True, must_exist=True, func=None, parallel=False, workers=None, ordered=False, max_depth=None, prune=None, stat=False):
   '''
     ## Description
     Yield matching files in specified path(s) as generator object.
@@ -1001,6 +1547,9 @@ def get_files(paths, regx=r'.*', rec=True, must_exist=True, func=None):
       
     # List form
     files = list(get_files(paths,regx,rec))
+
+    # Parallel walk of a large tree, skipping .git directories
+    for file in get_files(path, r'\\.py$', parallel=True, prune=lambda d: d.endswith('.git')): print(file)
     ```
 
     ## Arguments
@@ -1008,34 +1557,153 @@ def get_files(paths, regx=r'.*', rec=True, must_exist=True, func=None):
     - `regx`: regular expression matching file name (default = '.*')
     - `rec`: recursive files search if True (default = True).
     - `func`: function called on each matching file (can be used to modify the file name)
+    - `parallel`: if True, scan directories concurrently on a thread pool (default = False); files 
+    are yielded as directory scans complete
+    - `workers`: number of threads used when `parallel` is True (default = `os.cpu_count() * 4`, 
+    max 32; directory scans mostly wait on the file system)
+    - `ordered`: if True, yield files in deterministic order (sorted by name, each directory's files 
+    before its subdirectories) (default = False)
+    - `max_depth`: maximum depth to descend below each path; 0 is the path itself (default = None, 
+    no limit)
+    - `prune`: function called with each subdirectory path; return True to skip it (default = None)
+    - `stat`: if True, yield `fs.FileInfo` records (path, size, mtime, ...) captured during the walk 
+    instead of path strings (default = False); `func` is then called with the record
 
     ## Aliases
     `get_files`, `files`
     
     ## Returns
-    A generator object yielding full file names of type str.
+    A generator object yielding full file names of type str (or `fs.FileInfo` if `stat` is True).
   '''
   try:
     if not type(paths).__name__ == 'list': paths = [paths]
+    if not rec: max_depth = 0
+    regex = re.compile(regx)
     for path in paths:
       if not dir_exists(path):
         if must_exist: raise Exception('Path \"{}\" does not exist'.format(path))
         else: continue
-      for root, dirs, files in os.walk(path):
-        dirs # Not used, included on line to remove lint error.
-        for file in files:
-          if not re.search(regx, file): continue
-          file = fix(os.path.join(root,file))
-          if func is not None:
-            file = func(file)
-          yield(file)
-        if not rec: break
+      if parallel or ordered or stat or prune is not None or max_depth not in (None, 0):
+        walk = _walk_files(path, regex, workers if parallel else 1, ordered, max_depth, prune, stat)
+      else:
+        walk = _walk_files_serial(path, regex, max_depth)
+      for file in walk:
+        if func is not None:
+          file = func(file)
+        yield(file)
   except Exception as err:
     raise Exception(f'''Could not get files for specified path(s): {paths}. {err}''')
+
+def _walk_files_serial(path, regex, max_depth):
+  # Plain os.walk() traversal used by get_files() when no walker options are given.
+  search = regex.search
+  for root, dirs, files in os.walk(path):
+    dirs # Not used, included on line to remove lint error.
+    fixed_root = fix(root)
+    for file in files:
+      if not search(file): continue
+      yield(_join_fixed(fixed_root, file))
+    if max_depth == 0: break
+
+def _join_fixed(fixed_root, name):
+  # Equivalent to fix(os.path.join(root, name)) given fixed_root = fix(root), without re-running 
+  # fix() on every entry.
+  if sys.platform != 'win32' and '\\' in name: return fix(os.path.join(fixed_root, name))
+  if fixed_root == '.': return name
+  return os.path.join(fixed_root, name)
+
+def _scan_dir(path, ordered=False, prefetch=False):
+  # Return ([file entries], [subdirectory entries]) of a directory using a single os.scandir() 
+  # pass.  Like os.walk(), unreadable directories are silently skipped and symbolic links to 
+  # directories are listed as directories but never descended into.  With prefetch=True, the 
+  # lstat() of every file is fetched here (and cached by the entry), so on a thread pool it 
+  # runs in parallel too.
+  files = []
+  dirs = []
+  try:
+    with os.scandir(path) as it:
+      for entry in it:
+        try:
+          is_dir = entry.is_dir()
+        except OSError:
+          is_dir = False
+        if is_dir: dirs.append(entry)
+        else: files.append(entry)
+  except OSError:
+    pass
+  if prefetch:
+    for entry in files:
+      try: entry.stat(follow_symlinks=False)
+      except OSError: pass
+  if ordered:
+    files.sort(key=lambda e: e.name)
+    dirs.sort(key=lambda e: e.name)
+  return files, dirs
+
+def _walk_entries(path, workers=None, ordered=False, max_depth=None, prune=None, prefetch=False):
+  # Generator yielding (fixed directory path, file entries, subdirectory entries) for every 
+  # directory in the tree below path.  Directory scans run on a thread pool, with at most 
+  # workers * 4 scans queued or running so memory stays flat on wide trees.  With ordered=True, 
+  # results are yielded in depth-first order and the scans of the directories yielded next run 
+  # ahead in the background.
+  from collections import deque
+  from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+  if workers is None: workers = min(32, (os.cpu_count() or 1) * 4)
+  workers = max(1, workers)
+  limit = workers * 4
+  pool = ThreadPoolExecutor(max_workers=workers)
+  try:
+    def subdirs(dirs, depth):
+      if max_depth is not None and depth > max_depth: return []
+      return [entry.path for entry in dirs if not entry.is_symlink() and (prune is None or not prune(entry.path))]
+    def scan(root):
+      return pool.submit(_scan_dir, root, ordered, prefetch)
+    if ordered:
+      # Stack of [future or None, root, depth]; the end of the list is popped next.
+      stack = [[scan(path), path, 0]]
+      inflight = 1
+      while len(stack) > 0:
+        future, root, depth = stack.pop()
+        if future is None: future = scan(root)
+        else: inflight -= 1
+        files, dirs = future.result()
+        yield fix(root), files, dirs
+        stack.extend([None, child, depth + 1] for child in reversed(subdirs(dirs, depth + 1)))
+        # Start the scans popped next, up to the in-flight limit.
+        i = len(stack) - 1
+        while inflight < limit and i >= 0 and i >= len(stack) - limit:
+          if stack[i][0] is None:
+            stack[i][0] = scan(stack[i][1])
+            inflight += 1
+          i -= 1
+    else:
+      waiting = deque([(path, 0)])
+      pending = {}
+      while len(pending) > 0 or len(waiting) > 0:
+        while len(waiting) > 0 and len(pending) < limit:
+          root, depth = waiting.pop()
+          pending[scan(root)] = (root, depth)
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+          root, depth = pending.pop(future)
+          files, dirs = future.result()
+          waiting.extend((child, depth + 1) for child in subdirs(dirs, depth + 1))
+          yield fix(root), files, dirs
+  finally:
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _walk_files(path, regex, workers=None, ordered=False, max_depth=None, prune=None, stat=False):
+  # File name (or FileInfo) generator on top of _walk_entries() used by get_files().
+  search = regex.search
+  for fixed_root, files, dirs in _walk_entries(path, workers, ordered, max_depth, prune):
+    for entry in files:
+      if not search(entry.name): continue
+      if stat: yield(_file_info(_join_fixed(fixed_root, entry.name), entry))
+      else: yield(_join_fixed(fixed_root, entry.name))
   
 files = get_files
 
-def get_dirs(paths, regx=r'.*'):
+def get_dirs(paths, regx=r'.*', stat=False):
   '''
     ## Description
     Yield matching directories in specified path(s) as generator object.
@@ -1053,14 +1721,23 @@ def get_dirs(paths, regx=r'.*'):
     ## Arguments
     - `path`: a single path of type str -OR- a list of paths each of type str
     - `regx`: regular expression matching dir name (default = '.*')
+    - `stat`: if True, yield `fs.FileInfo` records captured while listing (default = False)
 
     ## Aliases
     `get_dirs`, `getdirs`, `dirs`
     
     ## Returns
-    A generator object yielding full file names of type str.
+    A generator object yielding full file names of type str (or `fs.FileInfo` if `stat` is True).
   '''
   if not type(paths).__name__ == 'list': paths = [paths]
+  if stat:
+    search = re.compile(regx).search
+    for path in paths:
+      files, dirs = _scan_dir(path)
+      for entry in dirs:
+        if not search(entry.name): continue
+        yield(_file_info(os.path.join(path, entry.name), entry))
+    return
   for path in paths:
     for root, dirs, files in os.walk(path):
       files # Not used, included on line to remove lint error.
@@ -1072,6 +1749,187 @@ def get_dirs(paths, regx=r'.*'):
 getdirs = get_dirs
 dirs = get_dirs
 
+class DirSnapshot():
+  '''
+    ## Description
+    Recorded (size, mtime_ns, inode) of every file in a tree, kept in a compact snapshot file so 
+    the next run can report what changed without a full rescan.  Directories whose mtime is 
+    unchanged since the snapshot have the same entries, so they are not listed again: their 
+    known files are only re-stated (or, with `trust_dirs=True`, reused as recorded).  Only 
+    directories whose mtime changed are rescanned.
+    
+    ## Usage
+    
+    ```python
+    snap = fs.DirSnapshot(top, 'top.snapshot.json')
+    changes = snap.update()
+    for path in changes['added'] | changes['modified']: rebuild(path)
+    snap.save()
+    ```
+
+    ## Arguments
+    - `path`: top directory
+    - `snapshot_file`: snapshot location (default = None, memory only)
+    - `prune`: function called with each subdirectory path; return True to skip it (default = None)
+  '''
+  VERSION = 1
+
+  def __init__(self, path, snapshot_file=None, prune=None):
+    self.path = path
+    self.snapshot_file = snapshot_file
+    self.prune = prune
+    # Relative directory -> [dir mtime_ns, [subdir names], {file name: [size, mtime_ns, inode]}]
+    self.dirs = {}
+    if snapshot_file is not None and file_exists(snapshot_file):
+      try:
+        with open(snapshot_file, 'r', encoding='utf-8') as f: data = json.load(f)
+        if data.get('version') == self.VERSION and data.get('path') == os.path.abspath(path): 
+          self.dirs = data.get('dirs', {})
+      except (OSError, ValueError):
+        # A corrupt snapshot is not an error; the next update simply reports every file as added.
+        self.dirs = {}
+
+  def update(self, trust_dirs=False):
+    '''
+      Walk the tree, replace the recorded state and return the changes since the previous state 
+      as a dict of sets of full paths: {'added': ..., 'removed': ..., 'modified': ...}.  If 
+      `trust_dirs` is True, files in directories with an unchanged mtime are assumed unchanged 
+      (fastest, but misses files rewritten in place rather than replaced).  Like `os.walk()`, 
+      entries that cannot be read are skipped: a directory that cannot be listed keeps its 
+      recorded state (or is left out if it has none) and a file that cannot be stated keeps its 
+      recorded state (or is left out).
+    '''
+    try:
+      old_dirs = self.dirs
+      new_dirs = {}
+      stack = ['']
+      while stack:
+        rel = stack.pop()
+        full = os.path.join(self.path, rel) if rel else self.path
+        old = old_dirs.get(rel)
+        try:
+          mtime_ns = os.stat(full).st_mtime_ns
+          if old is not None and old[0] == mtime_ns:
+            subdirs = old[1]
+            files = old[2] if trust_dirs else self._stat_files(full, old[2])
+          else:
+            subdirs, files = self._scan(full)
+        except FileNotFoundError:
+          continue
+        except OSError:
+          # Unreadable (e.g. permission denied): keep what was recorded, so it is rescanned once 
+          # readable again.
+          if old is None: continue
+          new_dirs[rel] = old
+          subdirs = old[1]
+        else:
+          new_dirs[rel] = [mtime_ns, subdirs, files]
+        for name in subdirs:
+          if self.prune is not None and self.prune(os.path.join(full, name)): continue
+          stack.append(os.path.join(rel, name))
+      self.dirs = new_dirs
+      return self._diff(old_dirs, new_dirs)
+    except Exception as err:
+      raise Exception(f'''Could not update snapshot of "{self.path}": {err}''')
+
+  @staticmethod
+  def _scan(full):
+    subdirs = []
+    files = {}
+    with os.scandir(full) as it:
+      for entry in it:
+        try:
+          if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.name)
+            continue
+          try: st = entry.stat()
+          except OSError: st = entry.stat(follow_symlinks=False)
+        except OSError:
+          continue
+        files[entry.name] = [st.st_size, st.st_mtime_ns, st.st_ino]
+    return subdirs, files
+
+  @staticmethod
+  def _stat_files(full, known):
+    files = {}
+    for name in known:
+      path = os.path.join(full, name)
+      try: st = os.stat(path)
+      except OSError:
+        try: st = os.lstat(path)
+        except FileNotFoundError: continue
+        except OSError:
+          files[name] = known[name]
+          continue
+      files[name] = [st.st_size, st.st_mtime_ns, st.st_ino]
+    return files
+
+  def _diff(self, old_dirs, new_dirs):
+    old = self._flatten(old_dirs)
+    new = self._flatten(new_dirs)
+    return {
+      'added': set(p for p in new if p not in old),
+      'removed': set(p for p in old if p not in new),
+      'modified': set(p for p, rec in new.items() if p in old and old[p] != rec),
+    }
+
+  def _flatten(self, dirs):
+    flat = {}
+    for rel, (_, _, files) in dirs.items():
+      base = os.path.join(self.path, rel) if rel else self.path
+      for name, rec in files.items(): flat[os.path.join(base, name)] = rec
+    return flat
+
+  def files(self):
+    '''
+      Return the recorded files as a dict of full path -> (size, mtime_ns, inode).
+    '''
+    return {p: tuple(rec) for p, rec in self._flatten(self.dirs).items()}
+
+  def save(self):
+    '''
+      Write the snapshot file.
+    '''
+    if self.snapshot_file is None: return
+    temp = self.snapshot_file + '.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+      json.dump({'version': self.VERSION, 'path': os.path.abspath(self.path), 'dirs': self.dirs}, f, separators=(',', ':'))
+    os.replace(temp, self.snapshot_file)
+
+def get_changes(path, snapshot_file, prune=None, trust_dirs=False):
+  '''
+    ## Description
+    Report files added, removed or modified in a tree since the last call with the same snapshot 
+    file, and update the snapshot.  The first call reports every file as added.  See 
+    `fs.DirSnapshot`.
+    
+    ## Usage
+    
+    ```python
+    changes = fs.get_changes(top, 'top.snapshot.json')
+    ```
+
+    ## Arguments
+    - `path`: top directory
+    - `snapshot_file`: snapshot location
+    - `prune`: function called with each subdirectory path; return True to skip it (default = None)
+    - `trust_dirs`: assume files in directories with an unchanged mtime are unchanged (default = 
+    False)
+
+    ## Aliases
+    `get_changes`, `changes`
+    
+    ## Returns
+    A dict of sets of full paths: {'added': ..., 'removed': ..., 'modified': ...}.
+  '''
+  if not dir_exists(path): raise Exception(f'''Could not get changes: path "{path}" does not exist''')
+  snap = DirSnapshot(path, snapshot_file, prune=prune)
+  changes = snap.update(trust_dirs=trust_dirs)
+  snap.save()
+  return changes
+
+changes = get_changes
+
 def create_dir(path, mode=0x775):
   '''
     ## Description
@@ -1105,7 +1963,7 @@ def create_dir(path, mode=0x775):
 
 mkdir = create_dir
 
-def files_are_identical(file1, file2, rstrip=False):
+def files_are_identical(file1, file2, rstrip=False, cache=None):
   '''
     ## Description
     Compare two files returning True if identical, false otherwise.
@@ -1114,12 +1972,19 @@ def files_are_identical(file1, file2, rstrip=False):
     
     ```python
     if fs.files_are_identical(file1, file2)
+
+    # Repeated comparisons of unchanged files only cost a stat() per file.
+    cache = fs.FileHashCache('hashes.json')
+    if fs.files_are_identical(file1, file2, cache=cache)
     ```
 
     ## Arguments
     - `file1`: first file
     - `file2`: second file
     - `rstrip`: strip spaces at the end of each line
+    - `cache`: `FileHashCache` object or cache file path; if specified, files are compared by 
+    content digest and digests are reused while a file's size, mtime and inode are unchanged 
+    (default = None, compare content directly)
 
     ## Aliases
     `files_are_identical`, `fsame`, `same`
@@ -1128,6 +1993,13 @@ def files_are_identical(file1, file2, rstrip=False):
     True if identical, False otherwise.
   '''  
   try:
+    if cache is not None:
+      if not isinstance(cache, FileHashCache): cache = FileHashCache.open(cache)
+      # Files of different sizes differ without reading either.
+      if not rstrip and os.stat(file1).st_size != os.stat(file2).st_size: return False
+      if cache.digest(file1) == cache.digest(file2): return True
+      if not rstrip: return False
+      return cache.digest(file1, rstrip=True) == cache.digest(file2, rstrip=True)
     if rstrip:
       if filecmp.cmp(file1, file2, shallow=False): return True
       lines1 = read_file(file1, to_string=True).rstrip().splitlines()
@@ -1144,7 +2016,244 @@ fsame = files_are_identical
 same = files_are_identical
 identical = files_are_identical
 
-def copy_file(src, tar, create_dirs=False, meta=False):
+def hash_file(path, algorithm='blake2b', chunk_size=1 << 20):
+  '''
+    ## Description
+    Get a content hash (hex digest) of a file, reading it in chunks.
+    
+    ## Usage
+    
+    ```python
+    digest = fs.hash_file(path)
+    ```
+
+    ## Arguments
+    - `path`: file path
+    - `algorithm`: any `hashlib` algorithm name (default = 'blake2b', which is fast and 
+    collision resistant)
+    - `chunk_size`: read size in bytes (default = 1 MiB)
+
+    ## Aliases
+    `hash_file`, `fhash`
+    
+    ## Returns
+    Hex digest as str.
+  '''
+  try:
+    h = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+      while True:
+        chunk = f.read(chunk_size)
+        if not chunk: break
+        h.update(chunk)
+    return h.hexdigest()
+  except Exception as err:
+    raise Exception(f'''Could not hash file "{path}": {err}''')
+
+fhash = hash_file
+
+class FileHashCache():
+  '''
+    ## Description
+    Bounded, optionally persistent cache of file content digests keyed on (path, size, mtime_ns, 
+    inode).  A cached digest is reused as long as the file's `stat()` still matches, so repeated 
+    comparisons of unchanged files never read them.  A whitespace normalized digest (trailing 
+    spaces and blank lines removed, as `files_are_identical(rstrip=True)` compares) is kept too.
+    
+    ## Usage
+    
+    ```python
+    cache = fs.FileHashCache('hashes.json', max_entries=50000)
+    digest = cache.digest(path)
+    cache.invalidate(path)
+    cache.save()
+    ```
+
+    ## Arguments
+    - `path`: JSON cache file (default = None, memory only).  The cache is loaded on creation and 
+    saved by `save()`, and at interpreter exit if changed and still in use (call `save()` before 
+    dropping a cache that is not shared through `FileHashCache.open()`).
+    - `max_entries`: least recently used entries beyond this are dropped (default = 100000)
+    - `algorithm`: `hashlib` algorithm name (default = 'blake2b')
+  '''
+  VERSION = 1
+  caches = {}
+  # Persistent caches still in use, saved by one exit hook without keeping them alive.
+  live = None
+
+  def __init__(self, path=None, max_entries=100000, algorithm='blake2b'):
+    from collections import OrderedDict
+    import threading
+    self.path = path
+    self.max_entries = max_entries
+    self.algorithm = algorithm
+    self.entries = OrderedDict()
+    self.lock = threading.Lock()
+    self.dirty = False
+    self.hits = 0
+    self.misses = 0
+    if path is not None:
+      if file_exists(path):
+        try:
+          with open(path, 'r', encoding='utf-8') as f: data = json.load(f)
+          if data.get('version') == self.VERSION and data.get('algorithm') == algorithm:
+            self.entries.update(data.get('files', {}))
+        except (OSError, ValueError):
+          # A corrupt cache is not an error; files are simply hashed again.
+          self.entries.clear()
+      self.trim()
+      if FileHashCache.live is None:
+        import atexit, weakref
+        FileHashCache.live = weakref.WeakSet()
+        atexit.register(FileHashCache.save_all_at_exit)
+      FileHashCache.live.add(self)
+
+  @classmethod
+  def open(cls, path):
+    # Return the shared cache for a cache file path, creating it on first use.
+    path = os.path.abspath(path)
+    if path not in cls.caches: cls.caches[path] = cls(path)
+    return cls.caches[path]
+
+  def digest(self, path, rstrip=False):
+    '''
+      Return the content digest of `path` (the whitespace normalized digest if `rstrip` is True), 
+      hashing the file only if it changed since it was cached.
+    '''
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    with self.lock:
+      entry = self.entries.get(key)
+      if entry is not None and (entry[0], entry[1], entry[2]) != (st.st_size, st.st_mtime_ns, st.st_ino): 
+        entry = None
+      if entry is not None:
+        self.entries.move_to_end(key)
+        value = entry[4] if rstrip else entry[3]
+        if value is not None:
+          self.hits += 1
+          return value
+      self.misses += 1
+    if rstrip:
+      text = read_file(key, to_string=True).rstrip().splitlines()
+      value = hashlib.new(self.algorithm, '\n'.join(line.rstrip() for line in text).encode('utf-8')).hexdigest()
+    else:
+      value = hash_file(key, algorithm=self.algorithm)
+    with self.lock:
+      if entry is None: entry = [st.st_size, st.st_mtime_ns, st.st_ino, None, None]
+      entry[4 if rstrip else 3] = value
+      self.entries[key] = entry
+      self.entries.move_to_end(key)
+      self.dirty = True
+      self.trim()
+    return value
+
+  def invalidate(self, path=None):
+    '''
+      Drop the entry for `path`, every entry under `path` if it is a directory, or everything if 
+      `path` is None.  Returns the number of entries dropped.
+    '''
+    with self.lock:
+      if path is None:
+        count = len(self.entries)
+        self.entries.clear()
+      else:
+        key = os.path.abspath(path)
+        prefix = os.path.join(key, '')
+        drop = [k for k in self.entries if k == key or k.startswith(prefix)]
+        for k in drop: del self.entries[k]
+        count = len(drop)
+      if count > 0: self.dirty = True
+      return count
+
+  clear = invalidate
+
+  def trim(self):
+    # Drop least recently used entries beyond `max_entries`.
+    while len(self.entries) > self.max_entries: 
+      self.entries.popitem(last=False)
+      self.dirty = True
+
+  def save(self, only_if_dirty=False):
+    '''
+      Write the cache file (no-op for memory only caches).
+    '''
+    if self.path is None or (only_if_dirty and not self.dirty): return
+    with self.lock:
+      temp = self.path + '.tmp'
+      with open(temp, 'w', encoding='utf-8') as f:
+        json.dump({'version': self.VERSION, 'algorithm': self.algorithm, 'files': self.entries}, f, separators=(',', ':'))
+      os.replace(temp, self.path)
+      self.dirty = False
+
+  @classmethod
+  def save_all_at_exit(cls):
+    for cache in list(cls.live): cache.save_at_exit()
+
+  def save_at_exit(self):
+    # A cache file whose directory has gone away by exit is silently dropped.
+    try: self.save(only_if_dirty=True)
+    except OSError: pass
+
+  def __len__(self):
+    return len(self.entries)
+
+class _CopyManifest():
+  # Persistent record of the files synced by copy_dir_if_changed().  For each path relative to the 
+  # target directory it keeps [source size, source mtime_ns, target size, target mtime_ns, content 
+  # hash or None].  A file whose source and target metadata both match its record was not touched 
+  # since the last sync and can be skipped without reading it.
+  VERSION = 1
+
+  def __init__(self, path, mode):
+    if mode not in ('trust', 'verify'):
+      raise Exception(f'Invalid manifest mode "{mode}"; must be "trust" or "verify".')
+    self.path = path
+    self.mode = mode
+    self.old = {}
+    self.new = {}
+    if file_exists(path):
+      try:
+        with open(path, 'r', encoding='utf-8') as f: data = json.load(f)
+        if data.get('version') == self.VERSION: self.old = data.get('files', {})
+      except (OSError, ValueError):
+        # A corrupt manifest is not an error; every file is simply treated as suspicious.
+        self.old = {}
+
+  def identical(self, rel, source, target):
+    # Return True if source and target have identical content, using the record to avoid reads.
+    src_stat = os.stat(source)
+    tar_stat = os.stat(target)
+    if src_stat.st_size != tar_stat.st_size: return False
+    record = self.old.get(rel)
+    src_same = record is not None and record[0] == src_stat.st_size and record[1] == src_stat.st_mtime_ns
+    tar_same = record is not None and record[2] == tar_stat.st_size and record[3] == tar_stat.st_mtime_ns
+    digest = record[4] if record is not None else None
+    if self.mode == 'trust' and src_same and tar_same:
+      self.record(rel, src_stat, tar_stat, digest)
+      return True
+    # Suspicious: hash the source, and the target too unless trusting its unchanged record. Verify 
+    # mode always reads both, so in-place edits that keep size and mtime are caught.
+    src_digest = hash_file(source)
+    if self.mode == 'trust' and tar_same and digest is not None: tar_digest = digest
+    else: tar_digest = hash_file(target)
+    if src_digest != tar_digest: return False
+    self.record(rel, src_stat, tar_stat, src_digest)
+    return True
+
+  def copied(self, rel, source, target):
+    # Record a freshly copied file.  The hash is left for a later verify run to fill in.
+    self.record(rel, os.stat(source), os.stat(target), None)
+
+  def record(self, rel, src_stat, tar_stat, digest):
+    self.new[rel] = [src_stat.st_size, src_stat.st_mtime_ns, tar_stat.st_size, tar_stat.st_mtime_ns, digest]
+
+  def save(self):
+    temp = self.path + '.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+      json.dump({'version': self.VERSION, 'files': self.new}, f, separators=(',', ':'))
+    os.replace(temp, self.path)
+
+def copy_file(src, tar, create_dirs=False, meta=False, strategy=None):
   '''
     ## Description
     Copy a file.
@@ -1153,6 +2262,9 @@ def copy_file(src, tar, create_dirs=False, meta=False):
     
     ```python
     fs.copy_file(src, tar)
+
+    # Clone, sparse copy or in-kernel copy where the file system allows it.
+    fs.copy_file(src, tar, strategy='auto')
     ```
 
     ## Arguments
@@ -1160,6 +2272,8 @@ def copy_file(src, tar, create_dirs=False, meta=False):
     - `tar`: target file
     - `create_dirs`: create directory
     - `meta`: copy meta data and permissions
+    - `strategy`: how to copy the file data (default = None, plain `shutil` copy); see 
+    `fs.copy_file_data()`.  If specified, the strategy used is included in the returned string.
 
     ## Aliases
     `copy_file`, `fcopy`
@@ -1170,6 +2284,9 @@ def copy_file(src, tar, create_dirs=False, meta=False):
   try:
     dir = get_dir_name(tar)
     if create_dirs and not dir_exists(dir): create_dir(dir)
+    if strategy is not None:
+      used = _copy_with_strategy(src, tar, meta, strategy)
+      return("Copied file \"{}\" to \"{}\" ({}).".format(src, tar, used))
     if meta:
       shutil.copy(src, tar)
     else:
@@ -1178,9 +2295,143 @@ def copy_file(src, tar, create_dirs=False, meta=False):
   except Exception as err:
     raise Exception(f'''Error trying to copy "{src}" to "{tar}": {err}''')
 
+COPY_STRATEGIES = ('reflink', 'sparse', 'copy_file_range', 'copyfile')
+
+def copy_file_data(src, tar, strategy='auto'):
+  '''
+    ## Description
+    Copy file content (not metadata) using the first strategy that works on this platform and 
+    file system, falling back to `shutil.copyfile()` (which uses `os.sendfile()` where it can).
+    
+    - 'reflink': copy-on-write clone (Linux FICLONE ioctl; btrfs, XFS, ...); no data is copied
+    - 'sparse': copy only the data regions of a sparse source (SEEK_DATA/SEEK_HOLE), keeping 
+    holes; only used for sources with unallocated blocks
+    - 'copy_file_range': in-kernel copy with `os.copy_file_range()` (may be offloaded by NFS, 
+    SMB, ...)
+    - 'copyfile': `shutil.copyfile()`
+    
+    ## Usage
+    
+    ```python
+    used = fs.copy_file_data(src, tar)
+    ```
+
+    ## Arguments
+    - `src`: source file
+    - `tar`: target file (overwritten)
+    - `strategy`: 'auto' (all of the above, in order), a strategy name or a list of names to try 
+    in order (default = 'auto')
+
+    ## Returns
+    The name of the strategy used.
+  '''  
+  try:
+    if strategy == 'auto': strategies = COPY_STRATEGIES
+    elif type(strategy) == str: strategies = (strategy,)
+    else: strategies = tuple(strategy)
+    for name in strategies:
+      if name not in COPY_STRATEGIES: 
+        raise Exception(f'Invalid copy strategy "{name}"; must be one of {", ".join(COPY_STRATEGIES)} or "auto".')
+    if os.path.exists(tar) and os.path.samefile(src, tar): raise Exception('Source and target are the same file.')
+    for name in strategies:
+      if name == 'copyfile': break
+      if _COPY_FUNCS[name](src, tar): return(name)
+    shutil.copyfile(src, tar)
+    return('copyfile')
+  except Exception as err:
+    raise Exception(f'''Error trying to copy "{src}" to "{tar}": {err}''')
+
+def _copy_with_strategy(src, tar, meta, strategy):
+  # Copy data with copy_file_data(), then metadata as shutil.copy() (meta=True) or shutil.copy2() would.
+  if os.path.isdir(tar): tar = os.path.join(tar, os.path.basename(src))
+  used = copy_file_data(src, tar, strategy)
+  if meta: shutil.copymode(src, tar)
+  else: shutil.copystat(src, tar)
+  return(used)
+
+def _open_copy_pair(src, tar):
+  fsrc = open(src, 'rb')
+  try:
+    return(fsrc, open(tar, 'wb'))
+  except:
+    fsrc.close()
+    raise
+
+def _copy_reflink(src, tar):
+  # Clone the whole file.  Returns False if cloning is not supported here.
+  try: import fcntl
+  except ImportError: return(False)
+  if not sys.platform.startswith('linux'): return(False)
+  FICLONE = 0x40049409
+  fsrc, ftar = _open_copy_pair(src, tar)
+  with fsrc, ftar:
+    try:
+      fcntl.ioctl(ftar.fileno(), FICLONE, fsrc.fileno())
+      return(True)
+    except OSError:
+      return(False)
+
+def _copy_sparse(src, tar):
+  # Copy only the data regions of a sparse file.  Returns False if the source has no holes or the 
+  # file system cannot report them.
+  if not hasattr(os, 'SEEK_DATA'): return(False)
+  st = os.stat(src)
+  if not hasattr(st, 'st_blocks') or st.st_blocks * 512 >= st.st_size: return(False)
+  fsrc, ftar = _open_copy_pair(src, tar)
+  with fsrc, ftar:
+    sfd, tfd = fsrc.fileno(), ftar.fileno()
+    size = st.st_size
+    pos = 0
+    try:
+      while pos < size:
+        try: start = os.lseek(sfd, pos, os.SEEK_DATA)
+        except OSError as err:
+          import errno
+          if err.errno == errno.ENXIO: break  # Only a hole remains.
+          raise
+        end = os.lseek(sfd, start, os.SEEK_HOLE)
+        _copy_range(sfd, tfd, start, end - start)
+        pos = end
+    except OSError:
+      return(False)
+    os.ftruncate(tfd, size)
+  return(True)
+
+def _copy_range(sfd, tfd, offset, count, chunk_size=1 << 20):
+  # Copy `count` bytes at `offset` between file descriptors, in-kernel when possible.
+  end = offset + count
+  while offset < end:
+    n = min(chunk_size, end - offset)
+    if hasattr(os, 'copy_file_range'):
+      try:
+        done = os.copy_file_range(sfd, tfd, n, offset, offset)
+        if done == 0: raise OSError('unexpected end of file')
+        offset += done
+        continue
+      except OSError:
+        pass
+    data = os.pread(sfd, n, offset)
+    if not data: raise OSError('unexpected end of file')
+    os.pwrite(tfd, data, offset)
+    offset += len(data)
+
+def _copy_file_range(src, tar):
+  # Whole file in-kernel copy.  Returns False if os.copy_file_range() is unavailable or refused.
+  if not hasattr(os, 'copy_file_range'): return(False)
+  fsrc, ftar = _open_copy_pair(src, tar)
+  with fsrc, ftar:
+    sfd, tfd = fsrc.fileno(), ftar.fileno()
+    try:
+      while os.copy_file_range(sfd, tfd, 1 << 30) > 0: pass
+    except OSError:
+      return(False)
+  return(True)
+
+_COPY_FUNCS = {'reflink': _copy_reflink, 'sparse': _copy_sparse, 'copy_file_range': _copy_file_range}
+
 fcopy = copy_file
 
-def copy_dir_if_changed(src, tar, omit=None, verbose=0, meta=False):
+def copy_dir_if_changed(src, tar, omit=None, verbose=0, meta=False, manifest=None, manifest_file=None, workers=None, max_inflight_bytes=256 << 20, progress=None):
   '''
     ## Description
     Copy a dir.  Files are only copied if new or changed.
@@ -1189,6 +2440,10 @@ def copy_dir_if_changed(src, tar, omit=None, verbose=0, meta=False):
     
     ```python
     fs.copy_dir_if_changed(src, tar)
+
+    # Compare and copy 8 files at a time, reporting progress as files complete.
+    def show(kind, status, rel_path, info): print(status, rel_path)
+    fs.copy_dir_if_changed(src, tar, workers=8, progress=show)
     ```
     
     ## Arguments
@@ -1197,24 +2452,102 @@ def copy_dir_if_changed(src, tar, omit=None, verbose=0, meta=False):
     - `omit`: will not copy file or dir mathing regular expression
     - `verbose`: verbose setting for printing (0=minimal to 3=maximum)
     - `meta`: copy meta data and permissions
+    - `manifest`: keep a manifest of size, mtime and content hash for every synced file so later 
+    runs can skip unchanged files without reading them (default = None, compare every file in 
+    full); one of:
+      - 'trust': a file whose source and target size and mtime match the manifest is identical; 
+      only other files are hashed
+      - 'verify': rehash every source and target file; the manifest only records the results
+    - `manifest_file`: manifest location (default = ".<target dir name>.manifest.json" next to 
+    the target directory)
+    - `workers`: number of threads comparing and copying files concurrently (default = None, 
+    files are processed one at a time); directories are always created in walk order first
+    - `max_inflight_bytes`: when `workers` is used, limit on the total size of files being 
+    compared or copied at once (default = 256 MiB; a larger file runs on its own)
+    - `progress`: function called as `progress(kind, status, rel_path, info)` for every directory 
+    and file processed, where `kind` is 'dirs' or 'files', `status` is the `info` counter name 
+    (e.g. 'created', 'identical') and `info` is the running counter dict.  If specified, status 
+    messages are not accumulated.
     
     ## Aliases
     `copy_dir_if_changed`, `dcopy`
 
     ## Returns
-    A printable string indicating status.
+    A printable string indicating status (the per item messages, or the counter summary if 
+    `progress` is specified).
 
   '''
+  pool = None
   try:
     if omit is None: omit = []
     if not type(omit) == list: omit = [omit]
+    omit_set = Rex.compile_set(omit)
     if not is_abs_path(src): src = os.path.join(get_script_dir(), src)
     if not is_abs_path(tar): tar = os.path.join(get_script_dir(), tar)
+    tracker = None
+    if manifest:
+      if manifest_file is None:
+        tar_norm = os.path.normpath(tar)
+        manifest_file = os.path.join(os.path.dirname(tar_norm), '.' + os.path.basename(tar_norm) + '.manifest.json')
+      tracker = _CopyManifest(manifest_file, manifest)
     info = {}
     info['files'] = {'omitted': 0, 'created': 0, 'updated': 0, 'identical': 0}
     info['dirs'] = {'omitted': 0, 'created': 0, 'exists': 0}
     target_base = get_dir_name(tar)
     results = []
+    messages = {
+      ('dirs', 'omitted'): 'Source directory "{}" not copied (matched omit pattern).',
+      ('dirs', 'exists'): 'Target directory "{}" already exists.',
+      ('dirs', 'created'): 'Created target directory "{}".',
+      ('files', 'omitted'): 'Source file "{}" not copied (matched omit pattern).',
+      ('files', 'parent'): 'Source file "{}" not copied (parent directory was omitted).',
+      ('files', 'identical'): 'No change to target file "{}".',
+      ('files', 'updated'): 'Updated target file "{}".',
+      ('files', 'created'): 'Created target file "{}".',
+    }
+
+    def report(kind, status, rel_path):
+      # Count, print and record (or pass to the progress callback) one processed item.
+      counter = 'omitted' if status == 'parent' else status
+      info[kind][counter] += 1
+      if progress is not None:
+        progress(kind, counter, rel_path, info)
+        if verbose <= 1: return
+      msg = messages[(kind, status)].format(rel_path)
+      if verbose > 1: print(msg)
+      if progress is None: results.append(msg)
+
+    def sync_file(source, target, rel_source):
+      # Compare and, if necessary, copy one file.  Returns the status.  May run on a worker thread.
+      if file_exists(target):
+        # If the target file exists and is identical to the source file, don't copy.
+        if tracker.identical(rel_source, source, target) if tracker is not None else files_are_identical(source, target):
+          return 'identical'
+        # If the target file exists and is not identical to the source file, copy it.  (The copy 
+        # goes through shutil, which uses os.sendfile() or other OS fast paths where available.)
+        status = 'updated'
+      # If the target file does not exist, copy it.  
+      else:
+        status = 'created'
+      copy_file(source, target)
+      if tracker is not None: tracker.copied(rel_source, source, target)
+      return status
+
+    if workers is not None and workers > 1:
+      from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+      pool = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+    inflight = [0]
+
+    def drain(limit_bytes, limit_count):
+      # Collect finished workers until the in-flight totals are within the limits.
+      while len(pending) > 0 and (inflight[0] > limit_bytes or len(pending) > limit_count):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+          size, rel_target = pending.pop(future)
+          inflight[0] -= size
+          report('files', future.result(), rel_target)
+
     for root, dirs, files in os.walk(src):
       for isa, lst in zip(('dirs', 'files'), (dirs, files)):
         for name in lst:
@@ -1222,86 +2555,56 @@ def copy_dir_if_changed(src, tar, omit=None, verbose=0, meta=False):
           rel_source = get_rel_path(source, src)
           target = os.path.join(tar, rel_source)
           rel_target = get_rel_path(target, target_base)
-          omitted = False
-          for pattern in omit:
-            if re.search(pattern, name): 
-              omitted = True
-              break
+          omitted = omit_set.m(name)
           if isa == 'dirs':
             # If the source directory matched item in omit list, don't create.
             if omitted: 
-              msg = "Source directory \"{}\" not copied (matched omit pattern).".format(rel_source)
-              if verbose > 1: print(msg)
-              results.append(msg)
-              info['dirs']['omitted'] += 1
+              report('dirs', 'omitted', rel_source)
               continue
             # If the target directory already exists, no need for additional action.
             if dir_exists(target):
-              msg = "Target directory \"{}\" already exists.".format(rel_target)
-              if verbose > 1: print(msg)
-              results.append(msg)
-              info['dirs']['exists'] += 1
+              report('dirs', 'exists', rel_target)
               continue
             # All else, create the directory.
             else:
               create_dir(target)
-              msg = "Created target directory \"{}\".".format(rel_target)
-              if verbose > 1: print(msg)
-              results.append(msg)
-              info['dirs']['created'] += 1
+              report('dirs', 'created', rel_target)
               continue
           elif isa == 'files':
             # If the source file matched a pattern in the omit list, don't copy it. 
             if omitted: 
-              msg = "Source file \"{}\" not copied (matched omit pattern).".format(rel_source)
-              if verbose > 1: print(msg)
-              results.append(msg)
-              info['files']['omitted'] += 1
+              report('files', 'omitted', rel_source)
               continue
             # If the directory of the target file does not exit, the source directory matched a 
             # pattern in the omit list.  Don't copy the source file.
             if not dir_exists(get_dir_name(target)):
-              msg = "Source file \"{}\" not copied (parent directory was omitted).".format(rel_source)
-              if verbose > 1: print(msg)
-              results.append(msg)
-              info['files']['omitted'] += 1
+              report('files', 'parent', rel_source)
               continue
-            # If the file exists, check to see if update is necessary.
-            if file_exists(target):
-              # If the target file exists and is identical to the source file, don't copy.
-              if files_are_identical(source, target):
-                msg = "No change to target file \"{}\".".format(rel_target)
-                if verbose > 1: print(msg)
-                results.append(msg)
-                info['files']['identical'] += 1
-                continue
-              # If the target file exists and is not identical to the source file, copy it.
-              else:
-                copy_file(source, target)
-                msg = "Updated target file \"{}\".".format(rel_target)
-                if verbose > 1: print(msg)
-                results.append(msg)
-                info['files']['updated'] += 1
-                continue
-            # If the target file does not exist, copy it.  
-            else:
-                copy_file(source, target)
-                msg = "Created target file \"{}\".".format(rel_target)
-                if verbose > 1: print(msg)
-                results.append(msg)
-                info['files']['created'] += 1
-                continue
+            if pool is None:
+              report('files', sync_file(source, target, rel_source), rel_target)
+              continue
+            # Hand the file to a worker once the in-flight limits allow it.
+            size = os.path.getsize(source)
+            drain(max_inflight_bytes - size, workers * 4 - 1)
+            future = pool.submit(sync_file, source, target, rel_source)
+            pending[future] = (size, rel_target)
+            inflight[0] += size
+    drain(-1, -1)
+    if tracker is not None: tracker.save()
     msg = "Copy dir results: " + str(info)
     if verbose > 0: 
       if verbose > 1: print('---')
       print(msg)
+    if progress is not None: return msg
     return '\n'.join(results)
   except Exception as err:
     raise Exception(f'''Error trying to copy "{src}" to "{tar}": {err}''')
+  finally:
+    if pool is not None: pool.shutdown(wait=True, cancel_futures=True)
 copydirif = copy_dir_if_changed
 dcopy = copy_dir_if_changed    
 
-def copy_file_if_changed(src, tar, create_dirs=False, meta=False, rstat=True, simple=False):
+def copy_file_if_changed(src, tar, create_dirs=False, meta=False, rstat=True, simple=False, strategy=None):
   '''
     ## Description
     Copy a file only if it has been changed.
@@ -1318,6 +2621,8 @@ def copy_file_if_changed(src, tar, create_dirs=False, meta=False, rstat=True, si
     - `meta`: copy meta data and permissions as well
     - `rstat`: if True, return status string; if False, return bool (True if copied, False otherwise)
     - `simple`: if True, return simple status string (e.g. "created", "identical", or "updated"); if False, return bool (True if copied, False otherwise)
+    - `strategy`: how to copy the file data (default = None, plain `shutil` copy); see 
+    `fs.copy_file_data()`.  If specified, the strategy used is included in the status string.
     
     ## Aliases
     `copy_file_if_changed`, `fcopyif`
@@ -1328,12 +2633,14 @@ def copy_file_if_changed(src, tar, create_dirs=False, meta=False, rstat=True, si
   try:
     dir = get_dir_name(tar)
     if create_dirs and not dir_exists(dir): create_dir(dir)
+    used = ''
     if not file_exists(tar):
-      if meta: shutil.copy(src, tar)
+      if strategy is not None: used = ' ({})'.format(_copy_with_strategy(src, tar, meta, strategy))
+      elif meta: shutil.copy(src, tar)
       else: shutil.copy2(src, tar)
       if rstat: 
         if simple: return("created")
-        else: return("Copied file \"{}\" to \"{}\".".format(src, tar))
+        else: return("Copied file \"{}\" to \"{}\"{}.".format(src, tar, used))
       else: return(True)
     elif files_are_identical(src, tar):
       if rstat:
@@ -1341,42 +2648,117 @@ def copy_file_if_changed(src, tar, create_dirs=False, meta=False, rstat=True, si
         else: return("Files \"{}\" and are \"{}\" identical.".format(src, tar))
       else: return(False)
     else:
-      if meta: shutil.copy(src, tar)
+      if strategy is not None: used = ' ({})'.format(_copy_with_strategy(src, tar, meta, strategy))
+      elif meta: shutil.copy(src, tar)
       else: shutil.copy2(src, tar)
       if rstat:
         if simple: return("updated") 
-        else: return("Updated file \"{}\" to \"{}\".".format(src, tar))
+        else: return("Updated file \"{}\" to \"{}\"{}.".format(src, tar, used))
       else: return(True)
   except Exception as err:
     raise Exception(f'''Error trying to copy "{src}" to "{tar}": {err}''')
 
 fcopyif = copy_file_if_changed
 
-def get_size(path):
+def get_size(path, rec=False, parallel=False, workers=None, breakdown=False):
   '''
     ## Description
-    Get size of path or file.
+    Get size of path or file.  With `rec=True`, total the sizes of everything below a directory 
+    (like `du`).
     
     ## Usage
     
     ```python
     size = fs.get_size(path)
+
+    usage = fs.get_size(path, rec=True, parallel=True, breakdown=True)
+    print(usage['apparent'], usage['blocks'], usage['files'])
+    print(tree.Tree(usage['tree'], name='Disk usage'))
     ```
 
     ## Arguments
     - `path`: file or directory path
+    - `rec`: if True, return the totals for the whole tree below `path` (default = False)
+    - `parallel`: scan directories concurrently on a thread pool (default = False)
+    - `workers`: number of threads when `parallel` is True (default = `os.cpu_count() * 4`, max 32)
+    - `breakdown`: also return the totals of every subdirectory (default = False)
     
     ## Aliases
     `get_size`, `size`
 
     ## Returns
-    Size as int.
+    Size as int; with `rec=True` a dict with:
+    - `apparent`: total file size in bytes
+    - `blocks`: space used on disk in bytes (allocated blocks; same as `apparent` where the 
+    platform does not report blocks)
+    - `files`: number of files (symbolic links count as files and are not followed)
+    - `dirs`: number of directories below `path`
+    - `dirs_breakdown` (if `breakdown`): dict of path relative to `path` ('.' for `path` itself) to 
+    a dict of the same four totals for that subtree
+    - `tree` (if `breakdown`): nested dict of directories labeled with their size, starting with 
+    `path` itself, suitable for `tree.Tree(data)`
+    
+    Hard linked files are counted once, in both `files` and the byte totals (in the first 
+    directory the walk reaches).  The space used by directory entries themselves is not included 
+    (`du` adds it).
   '''  
   try:
-    return(os.path.getsize(path))
+    if not rec: return(os.path.getsize(path))
+    return(_tree_size(path, workers if parallel else 1, breakdown))
   except Exception as err:
     raise Exception(f'''Could not get size of "{path}": {err}''')
 
+def _tree_size(path, workers, breakdown):
+  # Recursive totals behind get_size(rec=True).
+  seen = set()
+  def add(totals, st):
+    # Hard links share an inode; count the data once.
+    if st.st_nlink > 1 and st.st_ino:
+      key = (st.st_dev, st.st_ino)
+      if key in seen: return
+      seen.add(key)
+    totals['files'] += 1
+    totals['apparent'] += st.st_size
+    totals['blocks'] += st.st_blocks * 512 if hasattr(st, 'st_blocks') else st.st_size
+  if not os.path.isdir(path):
+    totals = {'apparent': 0, 'blocks': 0, 'files': 0, 'dirs': 0}
+    add(totals, os.lstat(path))
+    return(totals)
+  own = {}
+  parents = {}
+  for root, files, dirs in _walk_entries(path, workers, prefetch=True):
+    totals = {'apparent': 0, 'blocks': 0, 'files': 0, 'dirs': 0}
+    for entry in files + [d for d in dirs if d.is_symlink()]:
+      try: add(totals, entry.stat(follow_symlinks=False))
+      except OSError: pass
+    own[root] = totals
+    for d in dirs:
+      if not d.is_symlink(): parents[fix(d.path)] = root
+  # Roll each directory's totals up into its ancestors, deepest first.
+  for root in sorted(own, key=lambda d: d.count(os.sep), reverse=True):
+    parent = parents.get(root)
+    if parent is None or parent not in own: continue
+    for key in ('apparent', 'blocks', 'files'): own[parent][key] += own[root][key]
+    own[parent]['dirs'] += own[root]['dirs'] + 1
+  top = fix(path)
+  result = dict(own[top])
+  if breakdown:
+    result['dirs_breakdown'] = {os.path.relpath(root, top): totals for root, totals in own.items()}
+    labels = {root: f'{os.path.basename(root) or root} ({_human_size(totals["apparent"])})' for root, totals in own.items()}
+    nodes = {root: {} for root in own}
+    for root in sorted(own):
+      parent = parents.get(root)
+      if parent in nodes: nodes[parent][labels[root]] = nodes[root]
+    result['tree'] = {labels[top]: nodes[top]}
+  return(result)
+
+def _human_size(size):
+  # Short size label (e.g. "12.3 KB").
+  for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+    if size < 1024 or unit == 'TB': break
+    size /= 1024
+  return(f'{size} B' if unit == 'B' else f'{size:.1f} {unit}')
+
 size = get_size
 
 def last_modified(path):
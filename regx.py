@@ -14,6 +14,7 @@ val = regx.s(val, r'^\s*(\d{3})(\d{3})(\d{4})\s*$', r'\1-\2-\3', '=gm')
 '''
 
 import re
+from rex import pattern_cache
 
 class Regx():
     def __init__(self): 
@@ -84,19 +85,8 @@ class Regx():
         self.result = False
         
         # Parse options and set self.flags.
-        for c in self.opt:
-            if c == 'i':
-                self.flags |= re.IGNORECASE
-                continue
-            if c == 'm':
-                self.flags |= re.MULTILINE
-                continue
-            if c == 's':
-                self.flags |= re.DOTALL
-                continue
-            if c == 'g':
-                continue
-            raise Exception(f'Invalid option "{c}".')
+        self.flags = pattern_cache.flags(opt, 'g')
+        regex = pattern_cache.get(pattern, self.flags)
         
         # If a global search is indicated do re.findall().  This function returns all non-overlapping 
         # matches of pattern in the source string as a list of strings.  If the match expressions 
@@ -113,7 +103,7 @@ class Regx():
             self.groups = []
             self.result = False
             match_object_index = 0
-            for match_object in re.finditer(pattern, var, flags=self.flags):
+            for match_object in regex.finditer(var):
                 groups_list = []
                 if match_object_index == 0:
                     for i in range(1, match_object.re.groups+1):
@@ -183,7 +173,7 @@ class Regx():
 
             self.group = []
             self.result = False
-            match_object = re.search(pattern, var, flags=self.flags)
+            match_object = regex.search(var)
             if match_object:
                 for i in range(1, match_object.re.groups+1):
                     self.group.append(match_object.group(i))
@@ -292,7 +282,8 @@ class Regx():
         if 'i' in opt: self.flags |= re.IGNORECASE
         if 'm' in opt: self.flags |= re.MULTILINE
         if 's' in opt: self.flags |= re.DOTALL
-        m = re.search(find, var, flags=self.flags)
+        regex = pattern_cache.get(find, self.flags)
+        m = regex.search(var)
         self.result = False
         if m is not None:
             self.result = True
@@ -306,14 +297,14 @@ class Regx():
                         self.group.append(m.group(i))
                 return(replace(self.group))
             if 'g' in opt:
-                self.new = re.sub(find, replace_wrapper, var, flags=self.flags)
+                self.new = regex.sub(replace_wrapper, var)
             else:
-                self.new = re.sub(find, replace_wrapper, var, count=1, flags=self.flags)
+                self.new = regex.sub(replace_wrapper, var, count=1)
         else:
             if 'g' in opt:
-                self.new = re.sub(find, replace, var, flags=self.flags)
+                self.new = regex.sub(replace, var)
             else:
-                self.new = re.sub(find, replace, var, count=1, flags=self.flags)
+                self.new = regex.sub(replace, var, count=1)
         if '=' in opt:
             return(self.new)
         else:
@@ -356,7 +347,7 @@ class Regx():
         if 'i' in opt: self.flags |= re.IGNORECASE
         if 'm' in opt: self.flags |= re.MULTILINE
         if 's' in opt: self.flags |= re.DOTALL
-        lst = re.split(pattern, var, flags=self.flags)
+        lst = pattern_cache.get(pattern, self.flags).split(var)
         return(lst)    
 
     def trim(self, var, opt='=s'):
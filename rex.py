@@ -15,8 +15,141 @@ val = rex.s(val, r'^\s*(\d{3})(\d{3})(\d{4})\s*$', r'\1-\2-\3', '=gm')
 '''
 
 import re
+import threading
+from collections import OrderedDict
 
-VERSION = '1.001'
+VERSION = '1.002'
+
+# Map of option characters to native `re` flags.  Option characters not in this map (e.g. 'g' or 
+# '=') are handled by the individual methods.  
+OPT_FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL}
+
+class RexPatternCache():
+    r"""
+    Module level LRU cache of compiled regular expression patterns keyed on (pattern, flags).  It 
+    is shared by `Rex` and `Regx` objects so that a pattern compiled by one call is reused by all 
+    subsequent calls, regardless of which object made them.  
+
+    The native `re` module keeps its own cache, but it is small.  Loops that cycle through a few 
+    hundred distinct patterns overflow it and force recompiles on every call.  
+
+    ## Usage
+
+    ```python
+    import rex
+    # Grow the cache and pre-warm it with the patterns used by a hot loop.
+    rex.pattern_cache.resize(1024)
+    rex.pattern_cache.warm([r'^\s*#', r'(\d+)\s*ms$'], 'i')
+    ...
+    print(rex.pattern_cache.info())
+    ```
+
+    ## Arguments
+    - `size`: Maximum number of compiled patterns held (default = 512).  A size of 0 disables 
+    caching altogether.  
+    """
+    def __init__(self, size=512):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.patterns = OrderedDict()
+        self.opts = {}
+        self.lock = threading.Lock()
+
+    def get(self, pattern, flags=0):
+        r'''
+            Get the compiled pattern for (`pattern`, `flags`), compiling and caching it on a miss.
+
+            ## Arguments
+            - `pattern`: Regular expression pattern (str, bytes or compiled pattern).
+            - `flags`: Integer flag mask as used by the native `re` module.
+
+            ## Returns
+            Compiled pattern object.
+        '''
+        key = (pattern, flags)
+        with self.lock:
+            compiled = self.patterns.get(key)
+            if compiled is not None:
+                self.hits += 1
+                self.patterns.move_to_end(key)
+                return compiled
+            self.misses += 1
+        compiled = re.compile(pattern, flags)
+        if self.size > 0:
+            with self.lock:
+                self.patterns[key] = compiled
+                while len(self.patterns) > self.size:
+                    self.patterns.popitem(last=False)
+        return compiled
+
+    def flags(self, opt, valid=''):
+        r'''
+            Parse option string `opt` and return the integer flag mask used by the native `re` 
+            module.  Parsed option strings are memoized so repeated calls cost one dict lookup.
+
+            ## Arguments
+            - `opt`: Option string e.g. 'gi'.
+            - `valid`: Additional option characters that are accepted but do not map to a flag 
+            (e.g. 'g' or '=').
+
+            ## Returns
+            Integer flag mask, raises Exception if `opt` contains an invalid option.
+        '''
+        key = (opt, valid)
+        flags = self.opts.get(key)
+        if flags is None:
+            flags = 0
+            for c in opt.lower():
+                if c in OPT_FLAGS: flags |= OPT_FLAGS[c]; continue
+                if c in valid: continue
+                raise Exception(f'Invalid option "{c}".')
+            self.opts[key] = flags
+        return flags
+
+    def warm(self, patterns, opt=''):
+        r'''
+            Pre-compile `patterns` so that the first call in a hot loop does not pay for compiling.  
+
+            ## Arguments
+            - `patterns`: Single pattern or iterable of patterns.
+            - `opt`: Option string applied to every pattern (e.g. 'i', 'ms').
+
+            ## Returns
+            Number of patterns now cached.
+        '''
+        if type(patterns) in (str, bytes): patterns = [patterns]
+        flags = self.flags(opt, 'g=')
+        for pattern in patterns:
+            self.get(pattern, flags)
+        return len(self.patterns)
+
+    def resize(self, size):
+        r'''
+            Set the maximum number of cached patterns, evicting least recently used patterns if 
+            the cache is now over capacity.
+        '''
+        with self.lock:
+            self.size = size
+            while len(self.patterns) > max(size, 0):
+                self.patterns.popitem(last=False)
+
+    def clear(self):
+        r'''
+            Empty the cache and reset the hit and miss counters.
+        '''
+        with self.lock:
+            self.patterns.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        r'''
+            Return cache statistics as a dict with keys `hits`, `misses`, `size` and `count`.
+        '''
+        return {'hits': self.hits, 'misses': self.misses, 'size': self.size, 'count': len(self.patterns)}
+
+pattern_cache = RexPatternCache()
 
 class Rex():
     r"""
@@ -59,8 +192,22 @@ class Rex():
         self.result = False
         self.opt = []
         self.matrix = []
+        self.pending = None
         self.i = 0
 
+    def _fill(self, index=-1):
+        r'''
+            Pull group sets from a lazy match (see the `lazy` argument of `m()`) into `rex.matrix` 
+            until group set `index` is available or the matches are exhausted.  A negative `index` 
+            pulls all remaining group sets.  
+        '''
+        while self.pending is not None and (index < 0 or len(self.matrix) <= index):
+            match = next(self.pending, None)
+            if match is None: 
+                self.pending = None
+                break
+            self.matrix.append([match.group(0), *match.groups()])
+
     def d(self, i, j=None):
         r'''
             Access group `dollar` sign data (equivalently `data`, shortcut `d`).  The designation 
@@ -94,7 +241,8 @@ class Rex():
             possible to match an empty string "".  This is not the same thing as `None`.  
 
             The `rex.dollar()` method call is a wrapper interface to the `rex.matrix` data hash.  You 
-            can access or edit `rex.matrix` directly if the need arises.
+            can access or edit `rex.matrix` directly if the need arises.  If `m()` was called with 
+            `lazy=True`, `dollar()` pulls group sets into `rex.matrix` as they are accessed.
 
             ## Usage
             
@@ -117,6 +265,7 @@ class Rex():
             ```
 
         '''
+        if self.pending is not None: self._fill(self.i if j is None else i)
         try:
             if j is None: return self.matrix[self.i][i]
             return self.matrix[i][j]
@@ -134,8 +283,9 @@ class Rex():
 
     def sets(self):
         r'''
-            Returns the number of group sets.     
+            Returns the number of group sets.  For lazy matches this pulls all remaining group sets.
         '''
+        if self.pending is not None: self._fill()
         return len(self.matrix)
 
     def cnt(self, i=None):
@@ -143,13 +293,14 @@ class Rex():
             Return the count (or size) of a group set data object.  `rex.cnt()` returns the size of 
             the `rex.matrix[self.i]`.  `rex.cnt(0)` returns the size of `rex.matrix[0]`.  
         '''
+        if self.pending is not None: self._fill(self.i if i is None else i)
         try:
             if i is None: return len(self.matrix[self.i])
             return len(self.matrix[i])
         except:
             return 0
 
-    def m(self, var, pattern, opt=''):
+    def m(self, var, pattern, opt='', lazy=False):
         r'''
             Regular expression match (`m` short form, `match` long form).
             
@@ -171,6 +322,10 @@ class Rex():
             `i` = case insensitive
             `m` = multi-line 
             `s` = single line (. can match anything, including "\n")
+            - `lazy`: If True and the `g` option is specified, only the first group set is stored 
+            in `rex.matrix` when `m()` returns.  The remaining group sets are added on demand as 
+            `d()`, `next()`, `cnt()` or `sets()` reach them.  Use `iter()` to walk group sets 
+            without storing them at all.
             
             ## Returns
             True if a match was found, False otherwise.  Additional information stored in data object.
@@ -187,27 +342,26 @@ class Rex():
         self.result = False           # Set to True if match found, False otherwise.  
         self.i = 0                    # Iterator index value.
         self.matrix = []              # Match group matrix.
+        self.pending = None           # Match iterator for lazy global matches.
         
         # Parse options and set self.flags.
         self.opt = list(opt.lower())
-        for c in self.opt:
-            if c == 'i': self.flags |= re.IGNORECASE; continue
-            if c == 'm': self.flags |= re.MULTILINE; continue
-            if c == 's': self.flags |= re.DOTALL; continue
-            if c == 'g': continue
-            raise Exception(f'Invalid option "{c}".')
+        self.flags = pattern_cache.flags(opt, 'g')
+        regex = pattern_cache.get(pattern, self.flags)
         
         # Enter this branch if the 'g' flag option (global match) is specified.  This can result in 
         # more than one group set.   
-        if 'g' in self.opt:
+        if 'g' in self.opt and lazy:
+            self.pending = regex.finditer(var)
+            self._fill(0)
+            self.result = len(self.matrix) > 0
+
+        elif 'g' in self.opt:
             self.matrix = []
             self.result = False
             index = 0
-            for match in re.finditer(pattern, var, flags=self.flags):
-                dollar = []
-                for i in range(0, match.re.groups+1):
-                    dollar.append(match.group(i))
-                self.matrix.append(dollar)
+            for match in regex.finditer(var):
+                self.matrix.append([match.group(0), *match.groups()])
                 self.result = True
                 index += 1
 
@@ -216,12 +370,9 @@ class Rex():
         else:
             self.matrix = []
             self.result = False
-            match = re.search(pattern, var, flags=self.flags)
+            match = regex.search(var)
             if match:
-                dollar = []
-                for i in range(0, match.re.groups+1):
-                    dollar.append(match.group(i))
-                self.matrix.append(dollar)
+                self.matrix.append([match.group(0), *match.groups()])
                 self.result = True
 
         # Return True if match was found, False otherwise.
@@ -301,15 +452,11 @@ class Rex():
         self.result = False           # Set to True if match found, False otherwise.  
         self.i = 0                    # Iterator index value.
         self.matrix = []              # Match group matrix.
+        self.pending = None           # Match iterator for lazy global matches.
         
         # Parse options and set self.flags.
-        for c in self.opt:
-            if c == 'i': self.flags |= re.IGNORECASE; continue
-            if c == 'm': self.flags |= re.MULTILINE; continue
-            if c == 's': self.flags |= re.DOTALL; continue
-            if c == 'g': continue
-            if c == '=': continue
-            raise Exception(f'Invalid option "{c}".')
+        self.flags = pattern_cache.flags(opt, 'g=')
+        regex = pattern_cache.get(find, self.flags)
         
         # The replace value can be a function, in which case it will be "wrapped" with a decorator
         # function called replace_wrapper().  The function of replace_wrapper() is to get the 
@@ -317,36 +464,31 @@ class Rex():
         if replace is not str and callable(replace):
             self.result = False
             def replace_wrapper(m):
-                dollar = []
-                for i in range(0, m.re.groups + 1):
-                    dollar.append(m.group(i))
-                    self.result = True
+                dollar = [m.group(0), *m.groups()]
+                self.result = True
                 self.matrix = []
                 self.matrix.append(dollar)
                 return(replace(dollar))
             # For subs with the 'g' flag option, we do an unbounded re.sub().
             if 'g' in opt:
-                self.new = re.sub(find, replace_wrapper, var, flags=self.flags)
+                self.new = regex.sub(replace_wrapper, var)
             # For bound subs (those without 'g' specified) we set count = 1.  
             else:
-                self.new = re.sub(find, replace_wrapper, var, count=1, flags=self.flags)
+                self.new = regex.sub(replace_wrapper, var, count=1)
         # This branch is entered if the replace argument is not a function callable.  
         else:
             # Do an initial search to set self.matrix[0].  
             self.matrix = []
-            m = re.search(find, var, flags=self.flags)
+            m = regex.search(var)
             self.result = False
             if m is not None:
-                dollar = []
-                for i in range(0, m.re.groups+1): 
-                    dollar.append(m.group(i))
-                self.matrix.append(dollar)
+                self.matrix.append([m.group(0), *m.groups()])
                 self.result = True
             # Do the regular expression substitution.
             if 'g' in opt:
-                self.new = re.sub(find, replace, var, flags=self.flags)
+                self.new = regex.sub(replace, var)
             else:
-                self.new = re.sub(find, replace, var, count=1, flags=self.flags)
+                self.new = regex.sub(replace, var, count=1)
         
         # The return value of s() is self.new if the '=' option was specified, or self.result 
         # otherwise.  
@@ -357,6 +499,200 @@ class Rex():
 
     sub = s        
 
+    def iter(self, var, pattern, opt=''):
+        r'''
+            Generator yielding the group set of each non-overlapping match as a list ($0, $1, $2, 
+            etc.).  Nothing is stored in `rex.matrix`, so memory use stays flat no matter how many 
+            matches there are.
+            
+            ## Usage
+            
+            ```python
+            rex = Rex()
+            for dollar in rex.iter(log_text, r'^ERROR\s+(\S+)', 'm'):
+                print(dollar[1])
+            ```
+
+            ## Arguments
+            - `var`: Source string variable.
+            - `pattern`: Regular expression pattern.
+            - `opt`: Optional flags `i`, `m` and `s` (`g` is implied).
+            
+            ## Returns
+            Generator object yielding group set lists.
+        '''
+        regex = pattern_cache.get(pattern, pattern_cache.flags(opt, 'g'))
+        for match in regex.finditer(var):
+            yield [match.group(0), *match.groups()]
+
+    def _chunks(self, source, chunk_lines=1, encoding='utf-8'):
+        r'''
+            Generator yielding (line number, text) chunks of `chunk_lines` whole lines from 
+            `source`, a file path or an iterable of lines.  Chunks always end on a line boundary.
+        '''
+        if chunk_lines < 1: raise Exception(f'Invalid chunk_lines value {chunk_lines}; must be 1 or more.')
+        if type(source) is str:
+            with open(source, 'r', encoding=encoding, errors='ignore') as f:
+                yield from self._chunks(f, chunk_lines)
+            return
+        number = 1
+        lines = []
+        for line in source:
+            lines.append(line)
+            if len(lines) == chunk_lines:
+                yield number, ''.join(lines)
+                number += chunk_lines
+                lines = []
+        if len(lines) > 0:
+            yield number, ''.join(lines)
+
+    def m_stream(self, source, pattern, opt='', chunk_lines=1, encoding='utf-8'):
+        r'''
+            Streaming regular expression match over a file or an iterable of lines.  The source 
+            is read `chunk_lines` lines at a time and each chunk is matched as `m()` would match 
+            a string, so memory use is bounded by the chunk size.  With the default of one line 
+            per chunk, this works like `grep`.  
+
+            Chunks always start and end on line boundaries, so `^` and `$` with the `m` option 
+            match at line starts and ends exactly as they would on the whole text.  A match can 
+            not span two chunks.  
+            
+            ## Usage
+            
+            ```python
+            rex = Rex()
+            for number, line, dollar in rex.m_stream('server.log', r'\bERROR\s+(\w+)'):
+                print(f'{number}: {dollar[1]}')
+            print(f'{rex.count} matches in {rex.chunks} lines.')
+            ```
+
+            ## Arguments
+            - `source`: File path (str) or iterable of lines (e.g. `fs.read_file(path, to_iter=True)`).
+            - `pattern`: Regular expression pattern.
+            - `opt`: Optional flags
+            `g` = global (every match in a chunk, otherwise only the first)
+            `i` = case insensitive
+            `m` = multi-line 
+            `s` = single line (. can match anything, including "\n")
+            - `chunk_lines`: Number of lines per chunk (default = 1).
+            - `encoding`: Encoding used if `source` is a file path.
+            
+            ## Returns
+            Generator yielding (line number, chunk text, group set list) for each match.  The line 
+            number is that of the first line of the chunk.  Counters updated as the source is read:
+            - `rex.count`: Number of matches.
+            - `rex.chunks`: Number of chunks read.
+            - `rex.matched`: Number of chunks with at least one match.
+        '''
+        self.flags = pattern_cache.flags(opt, 'g')
+        regex = pattern_cache.get(pattern, self.flags)
+        is_global = 'g' in opt.lower()
+        self.count = 0
+        self.chunks = 0
+        self.matched = 0
+        for number, text in self._chunks(source, chunk_lines, encoding):
+            self.chunks += 1
+            if is_global:
+                found = False
+                for match in regex.finditer(text):
+                    found = True
+                    self.count += 1
+                    yield number, text, [match.group(0), *match.groups()]
+                if found: self.matched += 1
+            else:
+                match = regex.search(text)
+                if match is not None:
+                    self.count += 1
+                    self.matched += 1
+                    yield number, text, [match.group(0), *match.groups()]
+
+    def s_stream(self, source, find, replace, opt='', chunk_lines=1, encoding='utf-8'):
+        r'''
+            Streaming regular expression substitution over a file or an iterable of lines.  Works 
+            chunk by chunk like `m_stream()`; each chunk is substituted as `s()` would substitute 
+            a string (so without the `g` option, the first match in each chunk is replaced, like 
+            `sed`).  
+            
+            ## Usage
+            
+            ```python
+            rex = Rex()
+            with open('phones-new.txt', 'w') as f:
+                for text in rex.s_stream('phones.txt', r'^(\d{3})(\d{3})(\d{4})$', r'\1-\2-\3', 'm'):
+                    f.write(text)
+            ```
+
+            ## Arguments
+            - `source`: File path (str) or iterable of lines (e.g. `fs.read_file(path, to_iter=True)`).
+            - `find`: Regular expression pattern.
+            - `replace`: Replace with string or function.  A function is passed the group set list 
+            and `rex.matrix` is updated for each call, as with `s()`.
+            - `opt`: Optional flags `g`, `i`, `m` and `s` (see `m_stream()`).
+            - `chunk_lines`: Number of lines per chunk (default = 1).
+            - `encoding`: Encoding used if `source` is a file path.
+            
+            ## Returns
+            Generator yielding the (possibly modified) text of each chunk.  Counters updated as the 
+            source is read:
+            - `rex.count`: Number of substitutions.
+            - `rex.chunks`: Number of chunks read.
+            - `rex.matched`: Number of chunks with at least one substitution.
+        '''
+        self.flags = pattern_cache.flags(opt, 'g=')
+        regex = pattern_cache.get(find, self.flags)
+        count = 0 if 'g' in opt.lower() else 1
+        self.i = 0
+        self.matrix = []
+        self.pending = None
+        self.count = 0
+        self.chunks = 0
+        self.matched = 0
+        if callable(replace):
+            def replace_wrapper(m):
+                dollar = [m.group(0), *m.groups()]
+                self.matrix = [dollar]
+                return replace(dollar)
+            repl = replace_wrapper
+        else:
+            repl = replace
+        for number, text in self._chunks(source, chunk_lines, encoding):
+            self.chunks += 1
+            text, n = regex.subn(repl, text, count=count)
+            if n > 0:
+                self.count += n
+                self.matched += 1
+            yield text
+
+    def s_file(self, source, target, find, replace, opt='', chunk_lines=1, encoding='utf-8'):
+        r'''
+            Streaming regular expression substitution from `source` to `target`.  Output is 
+            written chunk by chunk as it is produced (see `s_stream()`), so the file is never held 
+            in memory.  `source` and `target` must not be the same file.
+            
+            ## Usage
+            
+            ```python
+            rex = Rex()
+            cnt = rex.s_file('big.log', 'big-redacted.log', r'\b\d{3}-\d{2}-\d{4}\b', 'XXX-XX-XXXX', 'g')
+            ```
+
+            ## Arguments
+            - `source`: File path (str) or iterable of lines.
+            - `target`: File path (str) or writable stream object.
+            - `find`, `replace`, `opt`, `chunk_lines`, `encoding`: See `s_stream()`.
+            
+            ## Returns
+            Number of substitutions made.  Counters `rex.count`, `rex.chunks` and `rex.matched` are 
+            also set.
+        '''
+        if type(target) is str:
+            with open(target, 'w', encoding=encoding, errors='ignore') as f:
+                return self.s_file(source, f, find, replace, opt, chunk_lines, encoding)
+        write = target.write
+        for text in self.s_stream(source, find, replace, opt, chunk_lines, encoding):
+            write(text)
+        return self.count
+
     def split(self, var, pattern, opt='', cnt=0):
         r'''
             Regular expression split.
@@ -391,7 +727,7 @@ class Rex():
         if 'i' in opt: self.flags |= re.IGNORECASE
         if 'm' in opt: self.flags |= re.MULTILINE
         if 's' in opt: self.flags |= re.DOTALL
-        lst = re.split(pattern, var, flags=self.flags, maxsplit=cnt)
+        lst = pattern_cache.get(pattern, self.flags).split(var, maxsplit=cnt)
         return(lst)    
 
     def trim(self, var, opt='=s'):
@@ -466,4 +802,308 @@ class Rex():
             ## Returns
             Escaped string.
         '''            
-        return re.escape(val)
\ No newline at end of file
+        return re.escape(val)
+
+    @staticmethod
+    def compile(pattern, opt=''):
+        r'''
+            Compile a pattern and its options once, returning a reusable `RexPattern` object with 
+            bound `m()`, `s()` and `split()` methods.  Use this in hot loops where the same 
+            expression is applied over and over.
+            
+            ## Usage
+            
+            ```python
+            comment = Rex.compile(r'^\s*#\s*(.*?)\s*$', 'i')
+            for line in lines:
+                if comment.m(line): print(comment.d(1))
+            ```
+
+            ## Arguments
+            - `pattern`: Regular expression pattern.
+            - `opt`: Optional flags (same as `m()` and `s()`).
+            
+            ## Returns
+            `RexPattern` object.
+        '''
+        return RexPattern(pattern, opt)
+
+    @staticmethod
+    def compile_set(patterns, opt='', ordered=False):
+        r'''
+            Compile many patterns into a single `RexPatternSet` that tests a string against all 
+            of them in one regular expression pass.  Use this for skip, ignore and omit lists.
+            
+            ## Usage
+            
+            ```python
+            ignore = Rex.compile_set([r'^\.', r'\.bak$', r'~$'], 'i')
+            files = [f for f in files if not ignore.m(f)]
+            ```
+
+            ## Arguments
+            - `patterns`: Single pattern, list of patterns, or dict of name -> pattern.
+            - `opt`: Optional flags `i`, `m` and `s` applied to every pattern.
+            - `ordered`: If True, report the first pattern in list order that matches anywhere in 
+            the string (rule tables); otherwise the leftmost match (default = False).
+            
+            ## Returns
+            `RexPatternSet` object.
+        '''
+        return RexPatternSet(patterns, opt, ordered)
+
+class RexPattern():
+    r"""
+    Precompiled `Rex` pattern.  Options are parsed and the pattern is compiled once when the object 
+    is created, so `m()`, `s()` and `split()` go straight to the compiled pattern.  Group data is 
+    accessed exactly as with `Rex` (`d()`, `next()`, `sets()`, `cnt()` and `matrix`).
+
+    ## Usage
+
+    ```python
+    from rex import Rex
+    phone = Rex.compile(r'^\s*(\d{3})(\d{3})(\d{4})\s*$', '=gm')
+    val = phone.s(val, r'\1-\2-\3')
+    ```
+
+    ## Arguments
+    - `pattern`: Regular expression pattern.
+    - `opt`: Optional flags `g`, `i`, `m`, `s` and `=` (see `Rex.m()` and `Rex.s()`).
+    """
+    def __init__(self, pattern, opt=''):
+        self.pattern = pattern
+        self.opt = list(opt.lower())
+        self.flags = pattern_cache.flags(opt, 'g=')
+        self.regex = pattern_cache.get(pattern, self.flags)
+        self.is_global = 'g' in opt
+        self.return_new = '=' in opt
+        self.old = None
+        self.new = None
+        self.result = False
+        self.matrix = []
+        self.pending = None
+        self.i = 0
+
+    _fill = Rex._fill
+    d = Rex.d
+    data = Rex.d
+    dollar = Rex.d
+    next = Rex.next
+    sets = Rex.sets
+    cnt = Rex.cnt
+
+    def m(self, var, lazy=False):
+        r'''
+            Regular expression match.  See `Rex.m()`.
+
+            ## Arguments
+            - `var`: Source string variable.
+            - `lazy`: If True, group sets of a global match are stored on demand (see `Rex.m()`).
+
+            ## Returns
+            True if a match was found, False otherwise.
+        '''
+        self.old = var
+        self.new = None
+        self.i = 0
+        self.pending = None
+        if self.is_global and lazy:
+            self.matrix = []
+            self.pending = self.regex.finditer(var)
+            self._fill(0)
+        elif self.is_global:
+            self.matrix = [[match.group(0), *match.groups()] for match in self.regex.finditer(var)]
+        else:
+            match = self.regex.search(var)
+            self.matrix = [] if match is None else [[match.group(0), *match.groups()]]
+        self.result = len(self.matrix) > 0
+        return self.result
+
+    match = m
+
+    def s(self, var, replace):
+        r'''
+            Regular expression substitution.  See `Rex.s()`.
+
+            ## Arguments
+            - `var`: Source string variable.
+            - `replace`: Replace with string or function (passed the group set list).
+
+            ## Returns
+            Modified string if the pattern was compiled with the `=` option, otherwise True if a 
+            substitution was made and False if not.
+        '''
+        self.old = var
+        self.i = 0
+        self.matrix = []
+        self.pending = None
+        self.result = False
+        count = 0 if self.is_global else 1
+        if callable(replace):
+            def replace_wrapper(m):
+                dollar = [m.group(0), *m.groups()]
+                self.result = True
+                self.matrix = [dollar]
+                return replace(dollar)
+            self.new = self.regex.sub(replace_wrapper, var, count=count)
+        else:
+            m = self.regex.search(var)
+            if m is not None:
+                self.matrix.append([m.group(0), *m.groups()])
+                self.result = True
+                self.new = self.regex.sub(replace, var, count=count)
+            else:
+                self.new = var
+        if self.return_new: return self.new
+        return self.result
+
+    sub = s
+
+    def iter(self, var):
+        r'''
+            Generator yielding the group set of each non-overlapping match.  See `Rex.iter()`.
+        '''
+        for match in self.regex.finditer(var):
+            yield [match.group(0), *match.groups()]
+
+    def split(self, var, cnt=0):
+        r'''
+            Regular expression split.  See `Rex.split()`.
+
+            ## Arguments
+            - `var`: Source string variable.
+            - `cnt`: Maximum number of splits (default = 0, no limit).
+
+            ## Returns
+            List of values split on the pattern.
+        '''
+        return self.regex.split(var, maxsplit=cnt)
+
+class RexPatternSet():
+    r"""
+    A set of patterns combined into one alternation, each alternative wrapped in its own named 
+    group.  `m()` tests a string against every pattern in a single regular expression pass and 
+    records which pattern matched.  
+
+    Patterns that cannot be combined (e.g. ones using numbered backreferences, which would be 
+    renumbered by the wrapping groups) are matched one at a time after the combined pass.  
+
+    ## Usage
+
+    ```python
+    from rex import Rex
+    skip = Rex.compile_set({'hidden': r'^\.', 'backup': r'\.bak$'})
+    if skip.m('.gitignore'): print(f'Skipped ({skip.name}).')
+    ```
+
+    ## Arguments
+    - `patterns`: Single pattern, list of patterns, or dict of name -> pattern.  For a list, the 
+    pattern name is its index.  
+    - `opt`: Optional flags `i`, `m` and `s` applied to every pattern.
+    - `ordered`: If True, `m()` reports the first pattern in list order that matches anywhere in 
+    the string, as testing the patterns one by one would.  Each alternative is then a lookahead 
+    from the start of the string, so the set is still tested in one pass.
+    """
+    def __init__(self, patterns, opt='', ordered=False):
+        if patterns is None: patterns = []
+        if type(patterns) in (str, bytes): patterns = [patterns]
+        if type(patterns) is dict:
+            self.names = list(patterns.keys())
+            self.patterns = list(patterns.values())
+        else:
+            self.patterns = list(patterns)
+            self.names = list(range(len(self.patterns)))
+        self.flags = pattern_cache.flags(opt, 'g')
+        self.ordered = ordered
+        self.groups = {}
+        self.separate = []
+        alternatives = []
+        for index, pattern in enumerate(self.patterns):
+            if type(pattern) is not str or re.search(r'\\[1-9]|\(\?P=', pattern):
+                self.separate.append((index, pattern_cache.get(pattern, self.flags)))
+                continue
+            group = f'_rex{index}'
+            self.groups[group] = index
+            if ordered: alternatives.append(f'(?=[\\s\\S]*?(?P<{group}>{pattern}))')
+            else: alternatives.append(f'(?P<{group}>{pattern})')
+        self.regex = None
+        if len(alternatives) > 0:
+            try:
+                self.regex = re.compile('|'.join(alternatives), self.flags)
+            except re.error:
+                # Fall back to matching each pattern separately.  Compiling them individually also
+                # surfaces the offending pattern in any exception raised.
+                self.groups = {}
+                self.separate = [(i, pattern_cache.get(p, self.flags)) for i, p in enumerate(self.patterns)]
+        self.clear()
+
+    def clear(self):
+        r'''
+            Reset match results.
+        '''
+        self.result = False
+        self.index = None
+        self.name = None
+        self.pattern = None
+        self.matched = None
+
+    def m(self, var):
+        r'''
+            Test `var` against all patterns in the set.
+
+            ## Arguments
+            - `var`: Source string variable.
+
+            ## Returns
+            True if any pattern matched, False otherwise.  Additional information:
+            - `index`: Index of the matching pattern.  When several patterns match, the one 
+            matching leftmost in `var` (first in list order on a tie) is reported, or with 
+            `ordered` the first in list order.
+            - `name`: Name of the matching pattern (equals `index` unless a dict was passed).
+            - `pattern`: Matching pattern.
+            - `matched`: Matched text.
+        '''
+        self.clear()
+        if self.ordered: return self._m_ordered(var)
+        # Keep the leftmost match as (start, index, text); a lower index wins at the same start.
+        found = None
+        if self.regex is not None:
+            match = self.regex.search(var)
+            if match is not None:
+                group = match.lastgroup
+                found = (match.start(), self.groups[group], match.group(group))
+        for index, regex in self.separate:
+            match = regex.search(var)
+            if match is not None and (found is None or (match.start(), index) < found[:2]):
+                found = (match.start(), index, match.group(0))
+        if found is not None: return self._found(found[1], found[2])
+        return False
+
+    match = m
+
+    def _m_ordered(self, var):
+        found = None
+        if self.regex is not None:
+            match = self.regex.match(var)
+            if match is not None:
+                group = match.lastgroup
+                found = (self.groups[group], match.group(group))
+        for index, regex in self.separate:
+            # Only patterns listed before the combined match can take precedence.
+            if found is not None and index > found[0]: break
+            match = regex.search(var)
+            if match is not None:
+                return self._found(index, match.group(0))
+        if found is not None: return self._found(*found)
+        return False
+
+    def _found(self, index, matched):
+        self.result = True
+        self.index = index
+        self.name = self.names[index]
+        self.pattern = self.patterns[index]
+        self.matched = matched
+        return True
+
+    def __len__(self):
+        return len(self.patterns)
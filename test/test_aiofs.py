@@ -0,0 +1,91 @@
+import fs
+import aiofs
+
+import unittest
+import asyncio
+import tempfile
+import os
+
+class TestAiofs(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.top = os.path.join(self.temp.name, 'top')
+        for i in range(50):
+            path = os.path.join(self.top, f'sub{i % 5}', f'file{i:02d}.txt')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f: f.write(f'file {i}\n')
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_001_wrappers(self):
+        async def main():
+            path = os.path.join(self.temp.name, 'out.txt')
+            await aiofs.write_file(path, (f'{i}\n' for i in range(10)))
+            lines = await aiofs.read_file(path)
+            copy = os.path.join(self.temp.name, 'copy.txt')
+            await aiofs.copy_file(path, copy)
+            same = await aiofs.files_are_identical(path, copy)
+            st = await aiofs.stat(copy)
+            sizes = await asyncio.gather(*(aiofs.get_size(p) for p in (path, copy)))
+            dirs = await aiofs.get_dirs(self.top)
+            with self.assertRaises(Exception): await aiofs.read_file(os.path.join(self.temp.name, 'missing'))
+            return lines, same, st.st_size, sizes, len(dirs)
+        self.assertEqual(asyncio.run(main()), ([f'{i}\n' for i in range(10)], True, 20, [20, 20], 5))
+        self.assertIs(fs.aio, aiofs)
+        self.assertIn('fs.read_file', aiofs.read_file.__doc__)
+
+    def test_002_get_files(self):
+        async def collect(**kwargs):
+            return [f async for f in aiofs.get_files(self.top, **kwargs)]
+        expected = sorted(fs.get_files(self.top))
+        self.assertEqual(sorted(asyncio.run(collect(batch=7))), expected)
+        self.assertEqual(sorted(asyncio.run(collect(regx=r'file0\d', parallel=True))), [f for f in expected if 'file0' in f])
+        self.assertEqual(sorted(i.path for i in asyncio.run(collect(stat=True))), expected)
+        with self.assertRaises(Exception): asyncio.run(collect(regx='(', batch=1))
+        # Stopping early and nesting other calls works even with a single worker thread.
+        async def first_sizes():
+            sizes = []
+            async for f in aiofs.get_files(self.top, batch=1):
+                sizes.append(await aiofs.get_size(f))
+                if len(sizes) == 3: break
+            return sizes
+        aiofs.set_concurrency(1)
+        try:
+            self.assertEqual(len(asyncio.run(first_sizes())), 3)
+        finally:
+            aiofs.set_concurrency(8)
+        with self.assertRaises(Exception): aiofs.set_concurrency(0)
+
+    def test_003_get_files_closed_loop(self):
+        # A walk blocked on a full queue ends once its event loop is closed, even if the 
+        # generator was never finalized, and leaves no pending task or unraisable error behind.
+        import gc, sys, threading, warnings
+        unraisable = []
+        hook = sys.unraisablehook
+        sys.unraisablehook = unraisable.append
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                loop = asyncio.new_event_loop()
+                gen = aiofs.get_files(self.top, batch=1)
+                self.assertTrue(loop.run_until_complete(gen.__anext__()))
+                # Let the walk fill the queue and block on the next batch.
+                loop.run_until_complete(asyncio.sleep(0.2))
+                walkers = [t for t in threading.enumerate() if t.name == 'aiofs-get-files']
+                self.assertEqual(len(walkers), 1)
+                loop.close()
+                walkers[0].join(timeout=5)
+                self.assertFalse(walkers[0].is_alive())
+                # Finalizing the generator later on another loop is clean too.
+                asyncio.run(gen.aclose())
+                del gen, loop
+                gc.collect()
+        finally:
+            sys.unraisablehook = hook
+        self.assertEqual([u.exc_value for u in unraisable], [])
+        self.assertEqual([str(w.message) for w in caught], [])
+
+if __name__ == '__main__': # pragma: no cover
+    unittest.main()
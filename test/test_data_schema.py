@@ -2,12 +2,18 @@ import fs
 from data.schema import DataManager
 import yaml
 import ru
+import os
+import copy
 
 import unittest
 
 dir = fs.get_dir_name(fs.get_abs_path(__file__))
 DataManager.coverage_testing = True
 
+def worker_pid(value, info):
+    # Validation function recording the process that validated the node.
+    return os.getpid()
+
 class TestRex(unittest.TestCase):
 
     def test_001_example(self):
@@ -170,6 +176,164 @@ class TestRex(unittest.TestCase):
         self.assertTrue(tar_data_yml_file_content1 == self.exp_data_yml_file_content)
 
 
+    def test_006_compiled_plan(self):
+        schema = yaml.load(fs.read_file(fs.join_names(dir, 'data-schema', 'demo3-schema.yml'), True), Loader=yaml.FullLoader)
+        dm = DataManager(schema, fs.join_names(dir, 'data-schema', 'demo3-schema.py'))
+        self.assertEqual(sorted(dm.plan), ['Color', 'Integer', 'Root'])
+        self.assertEqual(dm.plan['Integer'].cast, int)
+        self.assertEqual(len(dm.plan['Color'].checks), 3)
+        dm.validate({'Integer': '27', 'Color': 'RED'})
+        with self.assertRaises(Exception) as err: dm.validate({'Integer': 31, 'Color': 'RED'})
+        self.assertIn('Int object "Root["Integer"]" = 31 must be less than or equal to 30.0.', str(err.exception))
+        with self.assertRaises(Exception) as err: dm.validate({'Integer': 25, 'Color': 'RED', 'Colour': 'RED'})
+        self.assertIn('Invalid entry "Colour" found at node Root. Must be one of: "Integer" or "Color". Did you mean "Color"?', str(err.exception))
+        # Edited rules, including in place edits of 'in' lists and 'keys' entries, are picked up 
+        # by the next validation.
+        schema['Integer']['max-value'] = 40
+        dm.validate({'Integer': 31, 'Color': 'RED'})
+        schema['Integer']['validation-func'] = lambda value, info: value + 1
+        self.assertEqual(dm.validate({'Integer': 21, 'Color': 'RED'})['Integer'], 22)
+        schema['Integer']['validation-func'] = lambda value, info: value + 2
+        self.assertEqual(dm.validate({'Integer': 21, 'Color': 'RED'})['Integer'], 23)
+        del schema['Integer']['validation-func']
+        with self.assertRaises(Exception): dm.validate({'Integer': 31, 'Color': 'RED', 'Note': 25})
+        schema['Root']['keys'].append({'name': 'Note', 'rule': 'Integer'})
+        dm.validate({'Integer': 31, 'Color': 'RED', 'Note': 25})
+        schema['Root']['keys'][2]['required'] = True
+        with self.assertRaises(Exception) as err: dm.validate({'Integer': 31, 'Color': 'RED'})
+        self.assertIn('Required key "Note"', str(err.exception))
+        del schema['Root']['keys'][2]
+        dm.validate({'Integer': 31, 'Color': 'RED'})
+        schema['Color']['in'].remove('red')
+        with self.assertRaises(Exception) as err: dm.validate({'Integer': 31, 'Color': 'RED'})
+        self.assertIn('not in ["blue", "green"]', str(err.exception))
+
+    def test_007_key_dispatch(self):
+        schema = {
+            'Root': {'class': 'dict', 'keys': [
+                {'name': 'id', 'rule': 'Int', 'required': True},
+                {'name': r'^x_', 'regx': True, 'rule': 'Str'},
+                {'name': 'x_count', 'rule': 'Int'},
+                {'name': r'_id$', 'regx': True, 'rule': 'Int'},
+                {'name': 'name', 'rule': 'Str'},
+            ]},
+            'Int': {'class': 'int'},
+            'Str': {'class': 'str'},
+        }
+        dm = DataManager(schema, root_rule_name='Root')
+        plan = dm.plan['Root']
+        self.assertEqual(sorted(plan.key_index), ['id', 'name', 'x_count'])
+        self.assertEqual([spec.name for index, spec in plan.key_regx_specs], [r'^x_', r'_id$'])
+        # The first matching spec in the keys list wins, literal or regx.
+        self.assertEqual(plan.find_key('id').name, 'id')
+        self.assertEqual(plan.find_key('x_count').name, r'^x_')
+        self.assertEqual(plan.find_key('user_id').name, r'_id$')
+        self.assertEqual(plan.find_key('x_id').name, r'^x_')
+        self.assertIsNone(plan.find_key('nmae'))
+        data = {'id': '1', 'x_count': 2, 'user_id': '3', 'name': 'Bob'}
+        dm.validate(data)
+        self.assertEqual(data, {'id': 1, 'x_count': '2', 'user_id': 3, 'name': 'Bob'})
+        with self.assertRaises(Exception) as err: dm.validate({'id': 1, 'nmae': 'Bob'})
+        self.assertIn('Invalid entry "nmae" found at node Root.', str(err.exception))
+        self.assertIn('Did you mean "name"?', str(err.exception))
+
+    def test_008_node_paths(self):
+        seen = []
+        def check_item(value, info):
+            seen.append((info['node'], info['nodes'], info['rule'], info['parent_class']))
+            info['checked'] = True
+            seen.append(sorted(info))
+            return value
+        schema = {
+            'Root': {'class': 'dict', 'keys': [{'name': 'items', 'rule': 'Items'}]},
+            'Items': {'class': 'list', 'rule': 'Item'},
+            'Item': {'class': 'dict', 'keys': [{'name': 'size', 'rule': 'Size'}]},
+            'Size': {'class': 'int', 'max-value': 10, 'validation-func': check_item},
+        }
+        dm = DataManager(schema, root_rule_name='Root')
+        dm.validate({'items': [{'size': 1}, {'size': 2}]})
+        self.assertEqual(seen[0], ('Root["items"][0]["size"]', ['items', 0, 'size'], 'Size', 'dict'))
+        self.assertEqual(seen[1], sorted(['object', 'data', 'rule', 'node', 'nodes', 'depth', 'parent', 'parent_class', 'checked']))
+        self.assertEqual(seen[2][0], 'Root["items"][1]["size"]')
+        with self.assertRaises(Exception) as err: dm.validate({'items': [{'size': 1}, {'size': 11}]})
+        self.assertIn('Int object "Root["items"][1]["size"]" = 11 must be less than or equal to 10.0.', str(err.exception))
+        with self.assertRaises(Exception) as err: dm.validate({'items': [{'size': 1}, {'sise': 1}]})
+        self.assertIn('Invalid entry "sise" found at node Root["items"][1].', str(err.exception))
+
+    def test_009_collect_errors(self):
+        schema = {
+            'Root': {'class': 'dict', 'keys': [{'name': 'items', 'rule': 'Items'}, {'name': 'owner', 'rule': 'Name', 'required': True}]},
+            'Items': {'class': 'list', 'rule': 'Item', 'max-count': 3},
+            'Item': {'class': 'dict', 'keys': [{'name': 'size', 'rule': 'Size'}, {'name': 'name', 'rule': 'Name'}]},
+            'Size': {'class': 'int', 'max-value': 10},
+            'Name': {'class': 'str'},
+        }
+        dm = DataManager(schema, root_rule_name='Root')
+        data = {'items': [{'size': 11}, {'size': 'x', 'sise': 1}, {'size': '3', 'name': None}, {'size': 1}]}
+        errors = dm.validate(data, collect_errors=True)
+        self.assertIs(errors, dm.errors)
+        self.assertEqual([(node, rule) for node, rule, message in errors], [
+            ('Root["items"]', 'Items'),
+            ('Root["items"][0]["size"]', 'Size'),
+            ('Root["items"][1]', 'Item'),
+            ('Root["items"][1]["size"]', 'Size'),
+            ('Root["items"][2]["name"]', 'Name'),
+            ('Root', 'Root'),
+        ])
+        self.assertEqual(errors[0].message, 'List object "Root["items"]" has 4 elements. Maximum of 3 allowed.')
+        self.assertIn('Invalid entry "sise" found at node Root["items"][1].', errors[2].message)
+        self.assertEqual(errors[5].message, 'Required key "owner" at node Root not defined.')
+        # Valid nodes are still cast.
+        self.assertEqual(data['items'][2]['size'], 3)
+        # The same first error is raised without collect_errors.
+        with self.assertRaises(Exception) as err: dm.validate(data)
+        self.assertEqual(str(err.exception), errors[0].message)
+        self.assertIsNone(dm.errors)
+        errors = dm.validate(data, collect_errors=True, max_errors=2)
+        self.assertEqual([node for node, rule, message in errors], ['Root["items"]', 'Root["items"][0]["size"]'])
+        self.assertEqual(dm.validate({'owner': 'Bob'}, collect_errors=True), [])
+        errors = dm.validate(['a'], collect_errors=True)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(tuple(errors[0])[:2], ('Root', 'Root'))
+
+    def test_010_parallel_validation(self):
+        schema = {
+            'Root': {'class': 'list', 'rule': 'Row'},
+            'Row': {'class': 'dict', 'keys': [{'name': 'id', 'rule': 'Id', 'required': True}, {'name': 'name', 'rule': 'Name'}, {'name': 'pid', 'rule': 'Pid'}]},
+            'Id': {'class': 'int', 'max-value': 1000},
+            'Name': {'class': 'str', 'validation-func': 'upper'},
+            'Pid': {'class': 'int', 'validation-func': worker_pid, 'default': 0},
+            'upper': {'class': 'func', 'code': 'return value.upper()'},
+        }
+        rows = [{'id': str(i), 'name': f'row{i}', 'pid': None} for i in range(60)]
+        dm = DataManager(copy.deepcopy(schema), root_rule_name='Root')
+        dm.parallel_min_items = 10
+        data = dm.validate(copy.deepcopy(rows), parallel=True, workers=2)
+        self.assertIsNone(dm.pool)
+        self.assertEqual([row['id'] for row in data], list(range(60)))
+        self.assertEqual(data[7]['name'], 'ROW7')
+        pids = set(row['pid'] for row in data)
+        self.assertNotIn(os.getpid(), pids)
+        # Errors are merged in list order, the same as serial validation.
+        bad = copy.deepcopy(rows)
+        bad[3]['id'] = 2000
+        bad[41]['id'] = 'x'
+        del bad[52]['id']
+        serial = dm.validate(copy.deepcopy(bad), collect_errors=True)
+        errors = dm.validate(copy.deepcopy(bad), collect_errors=True, parallel=True, workers=2)
+        self.assertEqual([(node, rule) for node, rule, message in errors], [('Root[3]["id"]', 'Id'), ('Root[41]["id"]', 'Id'), ('Root[52]', 'Row')])
+        self.assertEqual(errors, serial)
+        self.assertEqual(len(dm.validate(copy.deepcopy(bad), collect_errors=True, max_errors=2, parallel=True, workers=2)), 2)
+        with self.assertRaises(Exception) as err: dm.validate(copy.deepcopy(bad), parallel=True, workers=2)
+        self.assertEqual(str(err.exception), serial[0].message)
+        # Lambdas cannot be sent to worker processes, so validation stays serial.
+        schema['Pid']['validation-func'] = lambda value, info: os.getpid()
+        dm = DataManager(schema, root_rule_name='Root')
+        dm.parallel_min_items = 10
+        data = dm.validate(copy.deepcopy(rows), parallel=True, workers=2)
+        self.assertEqual(set(row['pid'] for row in data), {os.getpid()})
+        self.assertEqual(data[7]['name'], 'ROW7')
+
 
 if __name__ == '__main__': # pragma: no cover
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,403 @@
+import fs
+import tree
+
+import unittest
+import unittest.mock
+import tempfile
+import os
+
+class TestFs(unittest.TestCase):
+
+    def setUp(self):
+        # Build a small tree:
+        #   top/a.txt, top/b.py, top/sub1/c.txt, top/sub1/deep/d.txt, top/sub2/e.py, top/.git/f.txt
+        self.temp = tempfile.TemporaryDirectory()
+        self.top = os.path.join(self.temp.name, 'top')
+        for rel, content in (('a.txt', 'a'), ('b.py', 'bb'), ('sub1/c.txt', 'ccc'), ('sub1/deep/d.txt', 'dddd'), 
+                             ('sub2/e.py', 'eeeee'), ('.git/f.txt', 'f')):
+            path = os.path.join(self.top, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f: f.write(content)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def rel(self, files):
+        return sorted(fs.unix(os.path.relpath(f, self.top)) for f in files)
+
+    def test_001_get_files_parallel(self):
+        expected = ['.git/f.txt', 'a.txt', 'b.py', 'sub1/c.txt', 'sub1/deep/d.txt', 'sub2/e.py']
+        self.assertEqual(self.rel(fs.get_files(self.top)), expected)
+        self.assertEqual(self.rel(fs.get_files(self.top, parallel=True, workers=4)), expected)
+        self.assertEqual(self.rel(fs.get_files(self.top, r'\.py$', parallel=True)), ['b.py', 'sub2/e.py'])
+        self.assertEqual(self.rel(fs.get_files(self.top, rec=False, parallel=True)), ['a.txt', 'b.py'])
+        self.assertEqual(self.rel(fs.get_files(self.top, max_depth=1, parallel=True)), expected[:4] + ['sub2/e.py'])
+        pruned = fs.get_files(self.top, parallel=True, prune=lambda d: os.path.basename(d) in ('.git', 'deep'))
+        self.assertEqual(self.rel(pruned), ['a.txt', 'b.py', 'sub1/c.txt', 'sub2/e.py'])
+        # Ordered walks are deterministic: sorted names, files before subdirectories.
+        ordered = [fs.unix(os.path.relpath(f, self.top)) for f in fs.get_files(self.top, parallel=True, ordered=True)]
+        self.assertEqual(ordered, ['a.txt', 'b.py', '.git/f.txt', 'sub1/c.txt', 'sub1/deep/d.txt', 'sub2/e.py'])
+        self.assertEqual(list(fs.get_files(self.top, r'^a', parallel=True, func=fs.get_file_name)), ['a.txt'])
+        with self.assertRaises(Exception): list(fs.get_files(os.path.join(self.top, 'missing'), parallel=True))
+
+    def test_002_get_files_stat(self):
+        infos = list(fs.get_files(self.top, r'\.py$', stat=True))
+        self.assertEqual(sorted(info.name for info in infos), ['b.py', 'e.py'])
+        for info in infos:
+            self.assertIsInstance(info, fs.FileInfo)
+            self.assertEqual(info.size, fs.get_size(info.path))
+            self.assertEqual(info.mtime, fs.last_modified(info.path))
+            self.assertEqual(info.inode, os.stat(info.path).st_ino)
+            self.assertFalse(info.is_symlink)
+            self.assertEqual(os.fspath(info), info.path)
+        with self.assertRaises(AttributeError): infos[0].extra = 1
+        # Records carry the same paths as the default string form.
+        self.assertEqual(sorted(i.path for i in fs.get_files(self.top, stat=True, parallel=True)), sorted(fs.get_files(self.top)))
+        dirs = list(fs.get_dirs(self.top, r'^sub', stat=True))
+        self.assertEqual(sorted(d.path for d in dirs), sorted(fs.get_dirs(self.top, r'^sub')))
+        if hasattr(os, 'symlink'):
+            os.symlink(os.path.join(self.top, 'missing.txt'), os.path.join(self.top, 'dangling.txt'))
+            info = list(fs.get_files(self.top, r'^dangling', stat=True))[0]
+            self.assertTrue(info.is_symlink)
+
+    def test_003_copy_dir_manifest(self):
+        tar = os.path.join(self.temp.name, 'copy')
+        manifest_file = os.path.join(self.temp.name, '.copy.manifest.json')
+        fs.copy_dir_if_changed(self.top, tar, manifest='trust')
+        self.assertTrue(os.path.exists(manifest_file))
+        self.assertTrue(fs.files_are_identical(os.path.join(self.top, 'sub1/deep/d.txt'), os.path.join(tar, 'sub1/deep/d.txt')))
+        self.assertEqual(fs.copy_dir_if_changed(self.top, tar, manifest='trust').count('No change'), 6)
+        # Overwrite a target with same-size content and restore its mtime: trust mode believes the 
+        # metadata, verify mode rehashes and repairs it.
+        target = os.path.join(tar, 'b.py')
+        st = os.stat(target)
+        with open(target, 'w') as f: f.write('XX')
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertIn('No change to target file "copy/b.py"', fs.copy_dir_if_changed(self.top, tar, manifest='trust').replace(os.sep, '/'))
+        self.assertIn('Updated target file "copy/b.py"', fs.copy_dir_if_changed(self.top, tar, manifest='verify').replace(os.sep, '/'))
+        with open(target) as f: self.assertEqual(f.read(), 'bb')
+        # Verify mode never reuses a recorded target hash, even right after its own run.
+        self.assertEqual(fs.copy_dir_if_changed(self.top, tar, manifest='verify').count('No change'), 6)
+        st = os.stat(target)
+        with open(target, 'w') as f: f.write('YY')
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertIn('Updated target file "copy/b.py"', fs.copy_dir_if_changed(self.top, tar, manifest='verify').replace(os.sep, '/'))
+        with open(target) as f: self.assertEqual(f.read(), 'bb')
+        # A changed source is always detected.
+        with open(os.path.join(self.top, 'a.txt'), 'w') as f: f.write('A')
+        self.assertIn('Updated target file "copy/a.txt"', fs.copy_dir_if_changed(self.top, tar, manifest='trust').replace(os.sep, '/'))
+        # Corrupt manifests are ignored; custom manifest locations work.
+        with open(manifest_file, 'w') as f: f.write('{not json')
+        self.assertEqual(fs.copy_dir_if_changed(self.top, tar, manifest='trust').count('No change'), 6)
+        other = os.path.join(self.temp.name, 'other.json')
+        fs.copy_dir_if_changed(self.top, tar, manifest='verify', manifest_file=other)
+        self.assertTrue(os.path.exists(other))
+        with self.assertRaises(Exception): fs.copy_dir_if_changed(self.top, tar, manifest='sometimes')
+        self.assertEqual(fs.hash_file(os.path.join(self.top, 'b.py')), fs.hash_file(target))
+
+    def test_004_copy_dir_concurrent(self):
+        serial = os.path.join(self.temp.name, 'serial')
+        concurrent = os.path.join(self.temp.name, 'concurrent')
+        expected = fs.copy_dir_if_changed(self.top, serial, omit=r'^\.git$')
+        events = []
+        msg = fs.copy_dir_if_changed(self.top, concurrent, omit=r'^\.git$', workers=4, max_inflight_bytes=4, 
+                                     progress=lambda kind, status, rel, info: events.append((kind, status, fs.unix(rel))))
+        self.assertEqual(len(events), len(expected.split('\n')))
+        self.assertIn(('files', 'created', 'concurrent/sub1/deep/d.txt'), events)
+        self.assertIn(('dirs', 'omitted', '.git'), events)
+        self.assertIn("'files': {'omitted': 1, 'created': 5, 'updated': 0, 'identical': 0}", msg)
+        for rel in ('a.txt', 'b.py', 'sub1/c.txt', 'sub1/deep/d.txt', 'sub2/e.py'):
+            self.assertTrue(fs.files_are_identical(os.path.join(self.top, rel), os.path.join(concurrent, rel)))
+        self.assertFalse(os.path.exists(os.path.join(concurrent, '.git')))
+        # Without a callback the concurrent engine returns the same messages as the serial one.
+        with open(os.path.join(self.top, 'a.txt'), 'w') as f: f.write('A')
+        serial_msgs = fs.copy_dir_if_changed(self.top, serial, omit=r'^\.git$').split('\n')
+        concurrent_msgs = fs.copy_dir_if_changed(self.top, concurrent, omit=r'^\.git$', workers=3).split('\n')
+        self.assertEqual(sorted(m.replace('concurrent', 'serial') for m in concurrent_msgs), sorted(serial_msgs))
+        self.assertIn('Updated target file "serial/a.txt"', '\n'.join(serial_msgs).replace(os.sep, '/'))
+
+    def test_005_write_file_if_changed(self):
+        path = os.path.join(self.temp.name, 'gen', 'out.txt')
+        self.assertEqual(fs.write_file_if_changed(path, 'one\ntwo\n', simple=True), 'created')
+        self.assertEqual(fs.write_file_if_changed(path, ['one\n', 'two\n'], simple=True), 'identical')
+        self.assertEqual(fs.write_file_if_changed(path, 'one\ntwo\n', simple=True, in_memory=False), 'identical')
+        self.assertEqual(fs.write_file_if_changed(path, 'one\nTWO\n', simple=True), 'updated')
+        self.assertEqual(fs.write_file_if_changed(path, 'one\nTWO\nthree\n', name='out'), 'Updated file "out".')
+        self.assertEqual(fs.reads(path), 'one\nTWO\nthree\n')
+        # Nothing but the written file is left behind.
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['out.txt'])
+        with self.assertRaises(Exception): fs.write_file_if_changed(path, 123)
+        items = [(os.path.join(self.temp.name, 'gen', 'out.txt'), 'one\nTWO\nthree\n'), 
+                 (os.path.join(self.temp.name, 'gen', 'sub', 'new.txt'), 'new'), 
+                 (os.path.join(self.temp.name, 'gen', 'sub', 'other.txt'), 'other')]
+        self.assertEqual(fs.write_files_if_changed(items, simple=True), ['identical', 'created', 'created'])
+        self.assertEqual(fs.write_files_if_changed(dict(items[1:]), simple=True), ['identical', 'identical'])
+        with self.assertRaises(Exception): fs.write_files_if_changed([(os.path.join(self.temp.name, 'none', 'x.txt'), 'x')], create_dir=False)
+
+    def test_006_file_hash_cache(self):
+        cache_file = os.path.join(self.temp.name, 'hashes.json')
+        cache = fs.FileHashCache(cache_file, max_entries=3)
+        a, c = os.path.join(self.top, 'a.txt'), os.path.join(self.top, 'sub1', 'c.txt')
+        copy = os.path.join(self.temp.name, 'a-copy.txt')
+        fs.copy_file(a, copy)
+        self.assertTrue(fs.files_are_identical(a, copy, cache=cache))
+        # Files of different sizes are not hashed.
+        self.assertFalse(fs.files_are_identical(a, c, cache=cache))
+        self.assertEqual(cache.misses, 2)
+        self.assertTrue(fs.files_are_identical(a, copy, cache=cache))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        # A change in content (and so stat) is detected.
+        with open(copy, 'w') as f: f.write('a   \n\n')
+        self.assertFalse(fs.files_are_identical(a, copy, cache=cache))
+        self.assertTrue(fs.files_are_identical(a, copy, rstrip=True, cache=cache))
+        self.assertEqual(fs.files_are_identical(a, copy, rstrip=True), True)
+        # Bounded size, invalidation and persistence.
+        cache.digest(os.path.join(self.top, 'b.py'))
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.invalidate(copy), 1)
+        self.assertEqual(cache.invalidate(self.top), 2)
+        cache.digest(a)
+        cache.save()
+        loaded = fs.FileHashCache(cache_file)
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded.digest(a), fs.hash_file(a))
+        self.assertEqual(loaded.hits, 1)
+        self.assertIs(fs.FileHashCache.open(cache_file), fs.FileHashCache.open(cache_file))
+        self.assertTrue(fs.files_are_identical(a, a, cache=cache_file))
+        self.assertEqual(loaded.invalidate(), 1)
+        # The exit hook does not keep caches alive.
+        import gc, weakref
+        ref = weakref.ref(loaded)
+        del loaded
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertIn(cache, fs.FileHashCache.live)
+
+    def test_007_read_file_modes(self):
+        path = os.path.join(self.temp.name, 'log.txt')
+        text = ''.join(f'{i:04d} line\n' for i in range(1000))
+        fs.write_file(path, text)
+        self.assertEqual(fs.read_file(path, to_string=True), text)
+        self.assertEqual(len(fs.read_file(path)), 1000)
+        with fs.read_file(path, to_mmap=True) as buf:
+            self.assertEqual(len(buf), len(text))
+            self.assertEqual(buf[:10], b'0000 line\n')
+            self.assertEqual(buf.find(b'0999'), 9990)
+        chunks = list(fs.read_file(path, to_chunks=4096))
+        self.assertEqual([len(c) for c in chunks], [4096, 4096, 1808])
+        self.assertEqual(''.join(chunks), text)
+        empty = os.path.join(self.temp.name, 'empty.txt')
+        fs.write_file(empty, '')
+        with fs.read_file(empty, to_mmap=True) as buf:
+            self.assertEqual(buf, b'')
+            self.assertEqual(buf.find(b'x'), -1)
+        fs.read_file(empty, to_mmap=True).close()
+        self.assertEqual(list(fs.read_file(empty, to_chunks=10)), [])
+        with self.assertRaises(Exception): fs.read_file(path, to_chunks=0)
+        with self.assertRaises(Exception): fs.read_file(os.path.join(self.temp.name, 'missing'), to_mmap=True)
+
+    def test_008_write_file_streams(self):
+        path = os.path.join(self.temp.name, 'report.txt')
+        fs.write_file(path, (f'row {i}\n' for i in range(1000)), buffer_size=256)
+        self.assertEqual(len(fs.read_file(path)), 1000)
+        fs.write_file(path, ['tail ', b'bytes\n'], append=True, fsync=True)
+        self.assertEqual(fs.read_file(path)[-1], 'tail bytes\n')
+        fs.write_file(path, iter(['more\n']), append=True, atomic=True)
+        self.assertEqual(fs.read_file(path)[-2:], ['tail bytes\n', 'more\n'])
+        self.assertEqual(len(fs.read_file(path)), 1002)
+        fs.write_file(path, 'new\n', atomic=True, fsync=True)
+        self.assertEqual(fs.reads(path), 'new\n')
+        # A failing generator leaves the original file intact when writing atomically.
+        def broken():
+            yield 'partial\n'
+            raise ValueError('boom')
+        with self.assertRaises(Exception): fs.write_file(path, broken(), atomic=True)
+        self.assertEqual(fs.reads(path), 'new\n')
+        self.assertEqual(sorted(os.listdir(self.temp.name)), ['report.txt', 'top'])
+        with self.assertRaises(Exception): fs.write_file(path, 123)
+        with self.assertRaises(Exception): fs.write_file(path, [1, 2])
+        fs.write_file(path, 'h\u00e9llo', encoding='utf-16')
+        self.assertEqual(fs.reads(path, encoding='utf-16'), 'h\u00e9llo')
+        # Concurrent atomic writers of the same file each use their own temp file.
+        from concurrent.futures import ThreadPoolExecutor
+        texts = [str(i) * 20000 for i in range(8)]
+        with ThreadPoolExecutor(8) as pool: list(pool.map(lambda text: fs.write_file(path, text, atomic=True), texts * 4))
+        self.assertIn(fs.reads(path), texts)
+        self.assertEqual(sorted(os.listdir(self.temp.name)), ['report.txt', 'top'])
+        if os.name == 'posix':
+            # New files get the mode the current umask gives any new file.
+            new = os.path.join(self.temp.name, 'new.txt')
+            umask = os.umask(0o027)
+            try: fs.write_file(new, 'x', atomic=True)
+            finally: os.umask(umask)
+            self.assertEqual(os.stat(new).st_mode & 0o777, 0o640)
+
+    def test_009_dir_snapshot(self):
+        snap_file = os.path.join(self.temp.name, 'top.snapshot.json')
+        path = lambda rel: os.path.join(self.top, *rel.split('/'))
+        changes = fs.get_changes(self.top, snap_file)
+        self.assertEqual(self.rel(changes['added']), ['.git/f.txt', 'a.txt', 'b.py', 'sub1/c.txt', 'sub1/deep/d.txt', 'sub2/e.py'])
+        self.assertEqual(fs.get_changes(self.top, snap_file), {'added': set(), 'removed': set(), 'modified': set()})
+        # Modify in place, add, remove, and replace a whole directory.
+        with open(path('sub1/deep/d.txt'), 'a') as f: f.write('more')
+        with open(path('sub2/new.txt'), 'w') as f: f.write('new')
+        os.remove(path('b.py'))
+        fs.delete_dir(path('.git'))
+        changes = fs.get_changes(self.top, snap_file)
+        self.assertEqual(self.rel(changes['added']), ['sub2/new.txt'])
+        self.assertEqual(self.rel(changes['removed']), ['.git/f.txt', 'b.py'])
+        self.assertEqual(self.rel(changes['modified']), ['sub1/deep/d.txt'])
+        # Trusting directory mtimes skips in-place edits but still sees new entries.
+        snap = fs.DirSnapshot(self.top, snap_file)
+        with open(path('a.txt'), 'a') as f: f.write('changed')
+        self.assertEqual(snap.update(trust_dirs=True)['modified'], set())
+        self.assertEqual(self.rel(snap.update()['modified']), ['a.txt'])
+        self.assertEqual(len(snap.files()), 5)
+        pruned = fs.DirSnapshot(self.top, prune=lambda d: d.endswith('sub1'))
+        self.assertEqual(self.rel(pruned.update()['added']), ['a.txt', 'sub2/e.py', 'sub2/new.txt'])
+        with self.assertRaises(Exception): fs.get_changes(path('missing'), snap_file)
+        # Unreadable entries are skipped instead of failing the update.
+        snap = fs.DirSnapshot(self.top)
+        snap.update()
+        os.symlink('loop', path('sub2/loop'))
+        with open(path('sub1/later.txt'), 'w') as f: f.write('x')
+        scandir = os.scandir
+        def denied(p):
+            if os.path.basename(p) == 'sub1': raise PermissionError(13, 'Permission denied', p)
+            return scandir(p)
+        with unittest.mock.patch('os.scandir', denied): changes = snap.update()
+        self.assertEqual(self.rel(changes['added']), ['sub2/loop'])
+        self.assertEqual(changes['removed'] | changes['modified'], set())
+        # Once readable again the directory is rescanned.
+        self.assertEqual(self.rel(snap.update()['added']), ['sub1/later.txt'])
+
+    def test_010_batch_paths(self):
+        paths = [os.path.join(self.top, 'sub1', 'c.TXT'), 'rel/x.tar.gz', 'noext', os.path.join('..', 'up', '.hidden')]
+        self.assertEqual(fs.get_file_names(paths), [fs.get_file_name(p) for p in paths])
+        self.assertEqual(fs.get_root_names(iter(paths)), [fs.get_root_name(p) for p in paths])
+        self.assertEqual(fs.get_exts(paths), ['txt', 'gz', '', 'hidden'])
+        self.assertEqual(fs.get_dir_names(paths), [fs.get_dir_name(p) for p in paths])
+        self.assertEqual(fs.get_dir_names(paths, count=2), [fs.get_dir_name(p, count=2) for p in paths])
+        self.assertEqual(fs.get_rel_paths(paths, self.top), [fs.get_rel_path(p, self.top) for p in paths])
+        self.assertEqual(fs.get_rel_paths(paths), [fs.get_rel_path(p) for p in paths])
+        self.assertEqual(fs.fix_path_names(paths + ['a\\b/c']), [fs.fix_path_name(p) for p in paths + ['a\\b/c']])
+        cols = fs.split_paths(paths)
+        self.assertEqual(cols['root'], fs.get_root_names(paths))
+        self.assertEqual([len(v) for v in cols.values()], [4] * 5)
+        with self.assertRaises(Exception): fs.get_exts(paths + [None])
+
+    def test_011_copy_strategies(self):
+        src = os.path.join(self.temp.name, 'sparse.img')
+        with open(src, 'wb') as f:
+            f.write(b'head')
+            f.seek(8 << 20)
+            f.write(b'middle')
+            f.truncate(16 << 20)
+        expected = fs.hash_file(src)
+        for strategy in ('auto', 'reflink', 'sparse', 'copy_file_range', 'copyfile', ['reflink', 'copyfile']):
+            tar = os.path.join(self.temp.name, 'copy.img')
+            used = fs.copy_file_data(src, tar, strategy)
+            self.assertIn(used, fs.COPY_STRATEGIES)
+            if type(strategy) == str and strategy != 'auto': self.assertIn(used, (strategy, 'copyfile'))
+            self.assertEqual(os.path.getsize(tar), 16 << 20)
+            self.assertEqual(fs.hash_file(tar), expected)
+            if used == 'sparse': self.assertLess(os.stat(tar).st_blocks * 512, 16 << 20)
+            os.remove(tar)
+        # A dense file never uses the sparse strategy.
+        self.assertEqual(fs.copy_file_data(os.path.join(self.top, 'a.txt'), tar, 'sparse'), 'copyfile')
+        msg = fs.copy_file(os.path.join(self.top, 'b.py'), os.path.join(self.temp.name, 'new', 'b.py'), create_dirs=True, strategy='auto')
+        self.assertRegex(msg, r'\((reflink|sparse|copy_file_range|copyfile)\)\.$')
+        self.assertEqual(fs.reads(os.path.join(self.temp.name, 'new', 'b.py')), 'bb')
+        self.assertEqual(os.stat(os.path.join(self.temp.name, 'new', 'b.py')).st_mtime_ns, os.stat(os.path.join(self.top, 'b.py')).st_mtime_ns)
+        self.assertEqual(fs.copy_file_if_changed(os.path.join(self.top, 'b.py'), os.path.join(self.temp.name, 'new', 'b.py'), strategy='auto', simple=True), 'identical')
+        self.assertIn('Copied file', fs.copy_file_if_changed(os.path.join(self.top, 'a.txt'), os.path.join(self.temp.name, 'new', 'a.txt'), strategy='auto'))
+        with self.assertRaises(Exception): fs.copy_file_data(src, tar, 'teleport')
+        with self.assertRaises(Exception): fs.copy_file_data(src, src)
+        self.assertEqual(fs.hash_file(src), expected)
+
+    def test_012_delete_dir_engine(self):
+        old = os.path.join(self.top, 'sub1', 'deep', 'd.txt')
+        past = os.stat(old).st_mtime - 40 * 86400
+        os.utime(old, (past, past))
+        os.utime(os.path.join(self.top, 'b.py'), (past, past))
+        # Dry run: nothing is touched, removable files and emptied directories are listed.
+        info = fs.delete_dir(self.top, older_than=30, dry_run=True)
+        self.assertEqual((info['files'], info['dirs'], info['bytes'], info['kept']), (2, 1, 6, 4))
+        self.assertEqual(self.rel(info['paths']), ['b.py', 'sub1/deep', 'sub1/deep/d.txt'])
+        self.assertTrue(os.path.exists(old))
+        info = fs.delete_dir(self.top, older_than=30, parallel=True, workers=4)
+        self.assertEqual({k: info[k] for k in ('files', 'dirs', 'bytes', 'errors')}, {'files': 2, 'dirs': 1, 'bytes': 6, 'errors': 0})
+        self.assertEqual(self.rel(fs.get_files(self.top)), ['.git/f.txt', 'a.txt', 'sub1/c.txt', 'sub2/e.py'])
+        self.assertFalse(os.path.exists(os.path.join(self.top, 'sub1', 'deep')))
+        # Name filter with the root kept, then everything in parallel.
+        info = fs.delete_dir(self.top, regx=r'\.txt$', keep_root=True)
+        self.assertEqual((info['files'], info['dirs'], info['kept']), (3, 2, 1))
+        self.assertEqual(self.rel(fs.get_files(self.top)), ['sub2/e.py'])
+        if hasattr(os, 'symlink'):
+            target = os.path.join(self.temp.name, 'outside')
+            os.makedirs(target)
+            fs.write_file(os.path.join(target, 'keep.txt'), 'keep')
+            os.symlink(target, os.path.join(self.top, 'link'))
+        info = fs.delete_dir(self.top, parallel=True)
+        self.assertFalse(os.path.exists(self.top))
+        if hasattr(os, 'symlink'): self.assertTrue(os.path.exists(os.path.join(self.temp.name, 'outside', 'keep.txt')))
+        with self.assertRaises(Exception): fs.delete_dir(self.top, parallel=True)
+        with self.assertRaises(Exception): fs.delete_dir(self.top)
+
+    def test_013_get_size_tree(self):
+        self.assertEqual(fs.get_size(os.path.join(self.top, 'b.py')), 2)
+        usage = fs.get_size(self.top, rec=True)
+        self.assertEqual({k: usage[k] for k in ('apparent', 'files', 'dirs')}, {'apparent': 16, 'files': 6, 'dirs': 4})
+        self.assertGreaterEqual(usage['blocks'], 0)
+        if hasattr(os, 'link'):
+            os.link(os.path.join(self.top, 'sub2', 'e.py'), os.path.join(self.top, 'sub1', 'e-link.py'))
+        usage = fs.get_size(self.top, rec=True, parallel=True, workers=4, breakdown=True)
+        self.assertEqual(usage['apparent'], 16)
+        self.assertEqual(usage['dirs_breakdown']['.']['apparent'], 16)
+        self.assertEqual(usage['dirs_breakdown'][os.path.join('sub1', 'deep')], {'apparent': 4, 'blocks': usage['dirs_breakdown'][os.path.join('sub1', 'deep')]['blocks'], 'files': 1, 'dirs': 0})
+        self.assertEqual(usage['dirs_breakdown']['sub1']['dirs'], 1)
+        # The linked data counts once, in whichever directory the walk reached first.
+        self.assertEqual(usage['dirs_breakdown']['sub1']['apparent'] + usage['dirs_breakdown']['sub2']['apparent'], 12)
+        # The link is not counted as a second file either.
+        self.assertEqual(usage['files'], 6)
+        self.assertEqual(list(usage['tree']), ['top (16 B)'])
+        top = usage['tree']['top (16 B)']
+        self.assertEqual(sorted(label.split(' ')[0] for label in top), ['.git', 'sub1', 'sub2'])
+        self.assertIn('.git (1 B)', top)
+        sub1 = [label for label in top if label.startswith('sub1')][0]
+        self.assertEqual(list(top[sub1]), ['deep (4 B)'])
+        text = str(tree.Tree(usage['tree'], name='Disk usage'))
+        self.assertIn('Disk usage', text.split('\n')[0])
+        self.assertIn('top (16 B)', text)
+        self.assertIn('deep (4 B)', text)
+        self.assertEqual(fs.get_size(os.path.join(self.top, 'a.txt'), rec=True)['files'], 1)
+        with self.assertRaises(Exception): fs.get_size(os.path.join(self.top, 'missing'), rec=True)
+
+    def test_014_walk_bounded(self):
+        wide = os.path.join(self.temp.name, 'wide')
+        for i in range(150):
+            os.makedirs(os.path.join(wide, f'd{i:03d}', 'n'))
+            with open(os.path.join(wide, f'd{i:03d}', 'n', 'f.txt'), 'w') as f: f.write('x')
+        expected = [f'd{i:03d}/n/f.txt' for i in range(150)]
+        # No more than workers * 4 directory scans are queued or running at a time.
+        scan_dir = fs._scan_dir
+        started = []
+        def counting_scan_dir(*args):
+            started.append(args[0])
+            return scan_dir(*args)
+        fs._scan_dir = counting_scan_dir
+        try:
+            for ordered in (True, False):
+                started.clear()
+                walked = 0
+                for root, files, dirs in fs._walk_entries(wide, 2, ordered):
+                    walked += 1
+                    self.assertLessEqual(len(started) - walked, 8)
+                self.assertEqual(walked, 301)
+                found = [fs.unix(os.path.relpath(file, wide)) for file in fs.get_files(wide, parallel=True, workers=2, ordered=ordered)]
+                self.assertEqual(found if ordered else sorted(found), expected)
+        finally:
+            fs._scan_dir = scan_dir
+
+if __name__ == '__main__': # pragma: no cover
+    unittest.main()
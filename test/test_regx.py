@@ -1,7 +1,12 @@
-from rex import Rex
+from rex import Rex, RexPatternCache
+import rex as rex_module
+from regx import Regx
 
 import unittest
 import re
+import io
+import os
+import tempfile
 
 str0 = '''
 This is a test.
@@ -276,5 +281,216 @@ class TestRex(unittest.TestCase):
             new = rex.new
         self.assertNotEqual(new, expected)
 
+    def test_017_pattern_cache(self):
+        cache = RexPatternCache(size=2)
+        p0 = cache.get(r'a+')
+        self.assertIs(cache.get(r'a+'), p0)
+        self.assertEqual(cache.info(), {'hits': 1, 'misses': 1, 'size': 2, 'count': 1})
+        # Same pattern with different flags is a separate entry.
+        cache.get(r'a+', re.I)
+        self.assertEqual(cache.info()['misses'], 2)
+        # Third distinct key evicts the least recently used entry (r'a+', 0).
+        cache.get(r'b+')
+        self.assertEqual(cache.info()['count'], 2)
+        cache.get(r'a+')
+        self.assertEqual(cache.info()['misses'], 4)
+        cache.resize(1)
+        self.assertEqual(cache.info()['count'], 1)
+        self.assertEqual(cache.warm([r'c+', r'd+'], 'i'), 1)
+        cache.resize(8)
+        self.assertEqual(cache.warm([r'c+', r'd+'], 'gi'), 2)
+        self.assertEqual(cache.flags('gim', 'g'), re.I | re.M)
+        with self.assertRaises(Exception): cache.flags('x')
+        cache.clear()
+        self.assertEqual(cache.info(), {'hits': 0, 'misses': 0, 'size': 8, 'count': 0})
+        # Zero size disables caching.
+        cache.resize(0)
+        cache.get(r'a+')
+        self.assertEqual(cache.info()['count'], 0)
+
+    def test_018_shared_pattern_cache(self):
+        rex_module.pattern_cache.clear()
+        rex = Rex()
+        regx = Regx()
+        self.assertTrue(rex.m('Spain', r'(ai)', 'i'))
+        self.assertTrue(regx.m('Spain', r'(ai)', 'i'))
+        self.assertEqual(regx.group, ['ai'])
+        self.assertEqual(rex_module.pattern_cache.info()['misses'], 1)
+        self.assertEqual(rex_module.pattern_cache.info()['hits'], 1)
+        self.assertEqual(regx.s('a-b-c', r'-', '+', 'g='), 'a+b+c')
+        self.assertEqual(regx.split('a, b,c', r'\s*,\s*'), ['a', 'b', 'c'])
+        self.assertEqual(rex.split('a, b,c', r'\s*,\s*'), ['a', 'b', 'c'])
+        with self.assertRaises(Exception): regx.m('Spain', r'ai', 'x')
+
+    def test_019_compiled_pattern(self):
+        s0 = 'My favorite color is blue.  My favorite number is 7.'
+        pattern = Rex.compile(r'(favorite\s+(\w+)\s+is\s+(\w+))', 'g')
+        self.assertTrue(pattern.m(s0))
+        self.assertEqual(pattern.sets(), 2)
+        self.assertEqual(pattern.cnt(), 4)
+        self.assertEqual(pattern.d(2), 'color')
+        pattern.next()
+        self.assertEqual(pattern.d(3), '7')
+        self.assertEqual(pattern.d(0, 3), 'blue')
+        self.assertFalse(pattern.m('nothing here'))
+        self.assertIsNone(pattern.d(0))
+        # Single (non-global) match.
+        pattern = Rex().compile(r'(S\w+n)')
+        self.assertTrue(pattern.m("The rain in Spain"))
+        self.assertEqual(pattern.matrix, [['Spain', 'Spain']])
+        with self.assertRaises(Exception): Rex.compile(r'x', 'x')
+
+    def test_020_compiled_pattern_sub_split(self):
+        phone = Rex.compile(r'^\s*(\d{3})(\d{3})(\d{4})\s*$', '=gm')
+        self.assertEqual(phone.s('5551234567\n 5559876543', r'\1-\2-\3'), '555-123-4567\n555-987-6543')
+        self.assertEqual(phone.d(1), '555')
+        digits = Rex.compile(r'(\d+)', 'i')
+        self.assertTrue(digits.s('a1b22', '#'))
+        self.assertEqual(digits.new, 'a#b22')
+        self.assertFalse(digits.s('abc', '#'))
+        self.assertEqual(digits.new, 'abc')
+        double = Rex.compile(r'(\d+)', 'g=')
+        self.assertEqual(double.s('a1b22', lambda d: str(int(d[1]) * 2)), 'a2b44')
+        self.assertEqual(double.d(1), '22')
+        self.assertEqual(Rex.compile(r'\s*,\s*').split('1, 2 ,3', 1), ['1', '2 ,3'])
+
+    def test_021_lazy_global_match(self):
+        rex = Rex()
+        s0 = 'a1 b2 c3 d4'
+        self.assertTrue(rex.m(s0, r'(\w)(\d)', 'g', lazy=True))
+        self.assertEqual(len(rex.matrix), 1)
+        self.assertEqual(rex.d(1), 'a')
+        rex.next()
+        self.assertEqual(rex.d(2), '2')
+        self.assertEqual(len(rex.matrix), 2)
+        self.assertEqual(rex.d(2, 1), 'c')
+        self.assertEqual(rex.cnt(), 3)
+        self.assertEqual(rex.sets(), 4)
+        self.assertIsNone(rex.pending)
+        self.assertIsNone(rex.d(4, 0))
+        # Iterating with d()/next() works the same as the eager form.
+        rex.m(s0, r'(\w)(\d)', 'g', lazy=True)
+        found = []
+        while rex.d(0) is not None:
+            found.append(rex.d(1))
+            rex.next()
+        self.assertEqual(found, ['a', 'b', 'c', 'd'])
+        self.assertFalse(rex.m(s0, r'xxx', 'g', lazy=True))
+        self.assertEqual(rex.sets(), 0)
+        # A later non-lazy call discards pending matches.
+        rex.m(s0, r'(\w)(\d)', 'g', lazy=True)
+        rex.s(s0, r'(\d)', '#', 'g')
+        self.assertEqual(rex.sets(), 1)
+        pattern = Rex.compile(r'(\w)(\d)', 'g')
+        self.assertTrue(pattern.m(s0, lazy=True))
+        self.assertEqual(len(pattern.matrix), 1)
+        self.assertEqual(pattern.d(3, 1), 'd')
+        self.assertEqual(pattern.sets(), 4)
+
+    def test_022_iter(self):
+        rex = Rex()
+        s0 = 'a1 b2\nc3 d4'
+        self.assertEqual([d[1] for d in rex.iter(s0, r'^(\w)\d', 'm')], ['a', 'c'])
+        self.assertEqual(rex.matrix, [])
+        self.assertEqual(list(rex.iter(s0, r'xxx')), [])
+        pattern = Rex.compile(r'(\w)(\d)')
+        self.assertEqual(list(pattern.iter('a1 b2')), [['a1', 'a', '1'], ['b2', 'b', '2']])
+
+    def test_023_pattern_set(self):
+        skip = Rex.compile_set([r'^\.', r'\.bak$', r'^(\w)\1'])
+        self.assertEqual(len(skip), 3)
+        self.assertTrue(skip.m('.gitignore'))
+        self.assertEqual(skip.index, 0)
+        self.assertEqual(skip.matched, '.')
+        self.assertTrue(skip.m('notes.BAK'.lower()))
+        self.assertEqual(skip.name, 1)
+        self.assertEqual(skip.pattern, r'\.bak$')
+        # Backreference patterns are matched separately.
+        self.assertTrue(skip.m('aardvark.txt'))
+        self.assertEqual(skip.index, 2)
+        self.assertFalse(skip.m('readme.txt'))
+        self.assertIsNone(skip.index)
+        # Leftmost match wins, list order breaks ties.
+        both = Rex.compile_set({'ext': r'\.py$', 'any': r'py', 'dot': r'\.'}, 'i')
+        self.assertTrue(both.m('test.PY.txt'))
+        self.assertEqual(both.name, 'dot')
+        self.assertTrue(both.m('.py'))
+        self.assertEqual(both.name, 'ext')
+        # Separately matched backreference patterns compete on position too.
+        backref = Rex.compile_set([r'z', r'(\w)\1'])
+        self.assertTrue(backref.m('aaz'))
+        self.assertEqual(backref.index, 1)
+        self.assertEqual(backref.matched, 'aa')
+        self.assertTrue(backref.m('zaa'))
+        self.assertEqual(backref.index, 0)
+        tie = Rex.compile_set([r'(\w)\1', r'\w'])
+        self.assertTrue(tie.m('bb'))
+        self.assertEqual(tie.index, 0)
+        # Patterns with groups of their own still report the right pattern.
+        grouped = Rex.compile_set([r'(a)(b)', r'(?P<x>c)(d)'])
+        self.assertTrue(grouped.m('xcd'))
+        self.assertEqual(grouped.index, 1)
+        self.assertFalse(Rex.compile_set(None).m('abc'))
+        self.assertFalse(Rex.compile_set([]).m('abc'))
+        self.assertTrue(Rex.compile_set('b').m('abc'))
+        with self.assertRaises(Exception): Rex.compile_set([r'a', r'(b'])
+
+    def test_024_stream_match(self):
+        rex = Rex()
+        lines = ['ERROR disk\n', 'INFO ok\n', 'ERROR net ERROR cpu\n', 'info done']
+        found = list(rex.m_stream(lines, r'ERROR\s+(\w+)'))
+        self.assertEqual([(n, d[1]) for n, text, d in found], [(1, 'disk'), (3, 'net')])
+        self.assertEqual((rex.count, rex.chunks, rex.matched), (2, 4, 2))
+        found = list(rex.m_stream(lines, r'error\s+(\w+)', 'gi'))
+        self.assertEqual([d[1] for n, text, d in found], ['disk', 'net', 'cpu'])
+        self.assertEqual((rex.count, rex.chunks, rex.matched), (3, 4, 2))
+        # Chunks are cut on line boundaries so 'm' anchors still match line starts.
+        found = list(rex.m_stream(lines, r'^(\w+)', 'gm', chunk_lines=3))
+        self.assertEqual([(n, d[1]) for n, text, d in found], [(1, 'ERROR'), (1, 'INFO'), (1, 'ERROR'), (4, 'info')])
+        self.assertEqual(rex.chunks, 2)
+        with self.assertRaises(Exception): list(rex.m_stream(lines, r'x', chunk_lines=0))
+
+    def test_025_stream_sub(self):
+        rex = Rex()
+        lines = ['5551234567\n', 'no phone\n', '5559876543 and 5550001111\n']
+        out = ''.join(rex.s_stream(lines, r'(\d{3})(\d{3})(\d{4})', r'\1-\2-\3'))
+        self.assertEqual(out, '555-123-4567\nno phone\n555-987-6543 and 5550001111\n')
+        self.assertEqual((rex.count, rex.chunks, rex.matched), (2, 3, 2))
+        out = ''.join(rex.s_stream(lines, r'(\d{3})\d{7}', lambda d: d[1] + '-XXX', 'g'))
+        self.assertEqual(out, '555-XXX\nno phone\n555-XXX and 555-XXX\n')
+        self.assertEqual(rex.d(0), '5550001111')
+        self.assertEqual(rex.count, 3)
+        with tempfile.TemporaryDirectory() as dir:
+            source = os.path.join(dir, 'source.txt')
+            target = os.path.join(dir, 'target.txt')
+            with open(source, 'w') as f: f.writelines(lines)
+            self.assertEqual(rex.s_file(source, target, r'^(\d+)', '#', 'm'), 2)
+            with open(target) as f: self.assertEqual(f.read(), '#\nno phone\n# and 5550001111\n')
+            stream = io.StringIO()
+            self.assertEqual(rex.s_file(source, stream, r'\d+', '#', 'g', chunk_lines=2), 3)
+            self.assertEqual(stream.getvalue(), '#\nno phone\n# and #\n')
+            self.assertEqual(rex.chunks, 2)
+
+    def test_026_ordered_pattern_set(self):
+        # With ordered, list order wins over position in the string.
+        rules = Rex.compile_set([r'^x_', r'_id$', r'id'], ordered=True)
+        self.assertTrue(rules.m('user_id'))
+        self.assertEqual((rules.index, rules.matched), (1, '_id'))
+        self.assertTrue(rules.m('x_id'))
+        self.assertEqual(rules.index, 0)
+        self.assertTrue(rules.m('idle'))
+        self.assertEqual(rules.index, 2)
+        self.assertFalse(rules.m('name'))
+        self.assertFalse(rules.m('a\nx_b'))
+        self.assertTrue(Rex.compile_set([r'^x_'], 'm', ordered=True).m('a\nx_b'))
+        # Separate (backreference) patterns keep their place in the order.
+        rules = Rex.compile_set([r'z$', r'(\w)\1', r'a'], ordered=True)
+        self.assertTrue(rules.m('aab'))
+        self.assertEqual(rules.index, 1)
+        self.assertTrue(rules.m('abz'))
+        self.assertEqual(rules.index, 0)
+        self.assertTrue(rules.m('abc'))
+        self.assertEqual(rules.index, 2)
+
 if __name__ == '__main__': # pragma: no cover
     unittest.main()
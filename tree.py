@@ -48,7 +48,7 @@ class StyleBasicASCII():
 
 class Tree():
 
-    def __init__(self, data=None, skip=None, regx=True, ign_case=False, style=None):
+    def __init__(self, data=None, skip=None, regx=True, ign_case=False, style=None, name='Top'):
         r'''
         Display a document tree.  
 
@@ -65,6 +65,7 @@ class Tree():
         - `regx`: If True, `skip` items are treated as regular expressions (default=True).
         - `ign_case`: If True, `skip` ignores case.
         - `style`: `StyleBasicUnicode` or `StyleBasicASCII` (default=`StyleBasicUnicode`).
+        - `name`: Root label when `data` is a dictionary (default='Top').
         '''
         me = self 
         me.style = style if style is not None else StyleBasicUnicode
@@ -72,7 +73,7 @@ class Tree():
         if data is not None:
             t = type(data)
             if t == dict:
-                self.from_dict(data, skip, regx, ign_case, style)
+                self.from_dict(data, name, skip, regx, ign_case, style)
             elif t == str:
                 self.from_path(data, skip, regx, ign_case, style)
 
@@ -85,6 +86,10 @@ class Tree():
         me.tree = []
         if me.skip is None: me.skip = []
         if type(me.skip) is str: me.skip = [me.skip]
+        # Regular expression skip items are combined so each name is tested in one pass.
+        me.skip_set = None
+        if me.regx and len(me.skip) > 0:
+            me.skip_set = Rex.compile_set([skip.lower() if me.ign_case else skip for skip in me.skip])
 
     def from_path(self, dir, skip=None, regx=True, ign_case=False, style=None):
         me = self
@@ -101,7 +106,6 @@ class Tree():
         me = self
 
         # Initialize variables.
-        rex = Rex()
         dirs = []
         files = []
 
@@ -123,10 +127,7 @@ class Tree():
                 if len(me.skip) > 0:
                     # Skip elements are regular expressions if `regx` is True ...
                     if me.regx:
-                        omit = False
-                        for skip in me.skip:
-                            if me.ign_case: skip = skip.lower()
-                            if rex.m(name, skip): omit = True
+                        omit = me.skip_set.m(name)
                         # If subfolder or file is not omitted, push onto `lst`.
                         if not omit: lst.append(path)
                     # ... otherwise skip elements are literals.  
@@ -164,7 +165,6 @@ class Tree():
         me = self
 
         # Initialize variables.
-        rex = Rex()
         dirs = []
         files = []
 
@@ -192,10 +192,7 @@ class Tree():
                 if len(me.skip) > 0:
                     # Skip elements are regular expressions if `regx` is True ...
                     if me.regx:
-                        omit = False
-                        for skip in me.skip:
-                            if me.ign_case: skip = skip.lower()
-                            if rex.m(name, skip): omit = True
+                        omit = me.skip_set.m(name)
                         # If subfolder or file is not omitted, push onto `lst`.
                         if not omit: lst.append(path)
                     # ... otherwise skip elements are literals.  